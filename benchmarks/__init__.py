@@ -0,0 +1,7 @@
+"""수집기 오프라인 벤치마크.
+
+녹화해 둔 피드와 기사 HTML을 로컬 HTTP 서버로 재생하고, Supabase 대신
+프로세스 내 가짜 ``articles`` 테이블에 저장하면서 처리량과 단계별 지연을
+측정합니다. ``python -m benchmarks --entries 10000`` 처럼 실행합니다.
+명령행 시작 시간은 ``python -m benchmarks.startup`` 으로 예산과 비교합니다.
+"""
@@ -0,0 +1,262 @@
+"""PostgREST ``articles`` 테이블 API를 흉내 내는 프로세스 내 가짜 Supabase 클라이언트.
+
+수집기가 실제로 쓰는 쿼리 빌더 메서드(select/in_/eq/gt/is_/order/limit,
+insert/upsert/update)와 ``update_articles`` 함수 호출(rpc)만 구현합니다. ``execute()`` 한 번이 DB 왕복 한 번이며,
+``latency`` 초만큼 기다려 네트워크 지연을 흉내 내고 작업 종류별로 횟수를 셉니다.
+"""
+import threading
+import time
+from collections import Counter
+
+
+class FakeAPIError(Exception):
+    """PostgREST가 오류 응답을 돌려준 경우에 해당합니다."""
+
+    def __init__(self, message, code=None):
+        super().__init__(message)
+        self.code = code
+
+
+class FakeResponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+def _matches(row, filters):
+    return all(predicate(row.get(column)) for column, predicate in filters)
+
+
+def _parse_or_condition(condition):
+    # "full_content.is.null" / "full_content.eq." 형태의 PostgREST or 조건
+    column, op, value = condition.split('.', 2)
+    if op == 'is' and value == 'null':
+        return column, lambda current: current is None
+    if op == 'eq':
+        return column, lambda current: current is not None and str(current) == value
+    if op == 'neq':
+        return column, lambda current: current is None or str(current) != value
+    raise FakeAPIError(f"지원하지 않는 or 조건: {condition}")
+
+
+class FakeQuery:
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self.op = None
+        self.columns = None
+        self.count = None
+        self.payload = None
+        self.on_conflict = None
+        self.ignore_duplicates = False
+        self.filters = []
+        self.or_groups = []
+        self.order_by = []
+        self.row_limit = None
+
+    # --- 작업 ---
+    def select(self, columns='*', count=None):
+        self.op = 'select'
+        self.columns = None if columns.strip() == '*' else [c.strip() for c in columns.split(',')]
+        self.count = count
+        return self
+
+    def insert(self, rows):
+        self.op = 'insert'
+        self.payload = rows
+        return self
+
+    def upsert(self, rows, on_conflict='', ignore_duplicates=False):
+        self.op = 'upsert'
+        self.payload = rows
+        self.on_conflict = on_conflict or self.db.primary_key
+        self.ignore_duplicates = ignore_duplicates
+        return self
+
+    def update(self, values):
+        self.op = 'update'
+        self.payload = values
+        return self
+
+    # --- 필터 ---
+    def eq(self, column, value):
+        self.filters.append((column, lambda current: current == value))
+        return self
+
+    def neq(self, column, value):
+        self.filters.append((column, lambda current: current != value))
+        return self
+
+    def in_(self, column, values):
+        values = set(values)
+        self.filters.append((column, lambda current: current in values))
+        return self
+
+    def gt(self, column, value):
+        self.filters.append((column, lambda current: current is not None and current > value))
+        return self
+
+    def gte(self, column, value):
+        self.filters.append((column, lambda current: current is not None and current >= value))
+        return self
+
+    def lt(self, column, value):
+        self.filters.append((column, lambda current: current is not None and current < value))
+        return self
+
+    def is_(self, column, value):
+        if value not in ('null', None):
+            raise FakeAPIError(f"지원하지 않는 is 값: {value}")
+        self.filters.append((column, lambda current: current is None))
+        return self
+
+    def or_(self, conditions):
+        self.or_groups.append([_parse_or_condition(condition) for condition in conditions.split(',')])
+        return self
+
+    def order(self, column, desc=False):
+        self.order_by.append((column, desc))
+        return self
+
+    def limit(self, size):
+        self.row_limit = size
+        return self
+
+    # --- 실행 ---
+    def execute(self):
+        if self.op is None:
+            raise FakeAPIError("작업(select/insert/upsert/update)이 지정되지 않았습니다.")
+        self.db.record(self.op)
+        with self.db.lock:
+            return getattr(self, f"_execute_{self.op}")(self.db.tables.setdefault(self.table, {}))
+
+    def _selected(self, rows):
+        return [
+            row for row in rows.values()
+            if _matches(row, self.filters)
+            and all(any(predicate(row.get(column)) for column, predicate in group) for group in self.or_groups)
+        ]
+
+    def _execute_select(self, rows):
+        matched = self._selected(rows)
+        # 뒤쪽 정렬 키부터 안정 정렬을 반복해 여러 키 정렬을 만듭니다. (NULL은 마지막)
+        for column, desc in reversed(self.order_by):
+            matched.sort(key=lambda row: (row.get(column) is None, row.get(column) or ''), reverse=desc)
+        total = len(matched)
+        if self.row_limit is not None:
+            matched = matched[:self.row_limit]
+        if self.columns is not None:
+            matched = [{column: row.get(column) for column in self.columns} for row in matched]
+        else:
+            matched = [dict(row) for row in matched]
+        return FakeResponse(matched, total if self.count else None)
+
+    def _rows_payload(self):
+        return self.payload if isinstance(self.payload, list) else [self.payload]
+
+    def _execute_insert(self, rows):
+        payload = self._rows_payload()
+        key = self.db.primary_key
+        # 한 요청은 하나의 트랜잭션이므로 중복이 하나라도 있으면 아무것도 넣지 않습니다.
+        for row in payload:
+            if row.get(key) in rows:
+                raise FakeAPIError(f'duplicate key value violates unique constraint "{self.table}_{key}_key"')
+        inserted = [self.db.store(rows, row) for row in payload]
+        return FakeResponse(inserted)
+
+    def _execute_upsert(self, rows):
+        payload = self._rows_payload()
+        if self.on_conflict != self.db.primary_key:
+            raise FakeAPIError(f"on_conflict 컬럼에 unique 제약이 없습니다: {self.on_conflict}")
+        if len({row.get(self.on_conflict) for row in payload}) != len(payload):
+            raise FakeAPIError("ON CONFLICT DO UPDATE command cannot affect row a second time")
+        written = []
+        for row in payload:
+            existing = rows.get(row.get(self.on_conflict))
+            if existing is None:
+                written.append(self.db.store(rows, row))
+            elif not self.ignore_duplicates:
+                # 전달한 컬럼만 갱신합니다.
+                existing.update(row)
+                written.append(dict(existing))
+        return FakeResponse(written)
+
+    def _execute_update(self, rows):
+        updated = []
+        for row in self._selected(rows):
+            row.update(self.payload)
+            updated.append(dict(row))
+        return FakeResponse(updated)
+
+
+class FakeRpc:
+    def __init__(self, db, name, params):
+        self.db = db
+        self.name = name
+        self.params = params
+
+    def execute(self):
+        if self.name not in self.db.functions:
+            raise FakeAPIError(f"Could not find the function public.{self.name}", code='PGRST202')
+        self.db.record('rpc')
+        with self.db.lock:
+            return getattr(self, f"_{self.name}")(self.db.tables.setdefault('articles', {}))
+
+    def _update_articles(self, rows):
+        updated = []
+        for values in self.params['rows']:
+            existing = rows.get(values['link'])
+            if existing is None:
+                continue
+            existing.update({column: value for column, value in values.items()
+                             if column in ('full_content', 'source')})
+            updated.append({'link': values['link']})
+        return FakeResponse(updated)
+
+
+class FakeSupabase:
+    """``create_client()`` 결과 대신 넘길 수 있는 가짜 클라이언트.
+
+    ``primary_key`` 컬럼(기본 ``link``)에 unique 제약이 있는 것처럼 동작합니다.
+    ``round_trips`` 는 작업 종류별 ``execute()`` 횟수입니다. ``functions`` 는 만들어 둔 것으로
+    칠 DB 함수 이름입니다. (없는 함수를 부르면 PostgREST처럼 PGRST202 오류)
+    """
+
+    def __init__(self, latency=0.0, primary_key='link', functions=('update_articles',)):
+        self.latency = latency
+        self.primary_key = primary_key
+        self.functions = set(functions)
+        self.tables = {}
+        self.round_trips = Counter()
+        self.lock = threading.Lock()
+        self._next_id = 1
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params):
+        return FakeRpc(self, name, params)
+
+    def record(self, op):
+        with self.lock:
+            self.round_trips[op] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def store(self, rows, row):
+        stored = dict(row)
+        stored.setdefault('id', self._next_id)
+        self._next_id += 1
+        rows[stored[self.primary_key]] = stored
+        return dict(stored)
+
+    def seed(self, table, rows):
+        """벤치마크 시작 전 테이블에 행을 미리 넣습니다. (왕복 횟수에 포함되지 않음)"""
+        with self.lock:
+            target = self.tables.setdefault(table, {})
+            for row in rows:
+                self.store(target, row)
+
+    def rows(self, table='articles'):
+        with self.lock:
+            return [dict(row) for row in self.tables.get(table, {}).values()]
@@ -0,0 +1,252 @@
+"""오프라인 벤치마크 실행기.
+
+로컬 fixture 서버와 가짜 Supabase를 상대로 ``run_sources`` 를 그대로 실행하고
+처리량(articles/sec), 단계별 p50/p95, 최대 메모리(RSS), DB 왕복 횟수를
+보고합니다. 실제 사이트나 운영 DB에는 전혀 접근하지 않습니다.
+"""
+import argparse
+import contextlib
+import dataclasses
+import json
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.fake_supabase import FakeSupabase
+from benchmarks.server import FixtureServer, FixtureSite
+from news_collector.context import RunOptions
+from news_collector.extract import Extractor
+from news_collector.http_client import PooledSession
+from news_collector.metrics import RunMetrics
+from news_collector.runner import resolve_sources, run_sources
+from news_collector.sources import SOURCES
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    """이 프로세스의 최대 RSS(MB). 측정할 수 없으면 None."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 byte 단위입니다.
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def check_fixtures(names):
+    """fixture 기사에서 본문이 추출되는지, 빠른 경로와 전체 파싱 결과가 같은지 확인합니다."""
+    problems = []
+    for name in names:
+        source = SOURCES[name]
+        site = FixtureSite(source, entries=0)
+        fast = Extractor(source, fast=True).extract(site.article, name)
+        full = Extractor(source, fast=False).extract(site.article, name)
+        if not full:
+            problems.append(f"{name}: fixture 기사에서 본문을 찾지 못했습니다")
+        elif fast != full:
+            problems.append(f"{name}: 빠른 경로와 전체 파싱의 추출 결과가 다릅니다")
+    return problems
+
+
+def run_benchmark(names, entries=1000, fresh=30, page_kb=0, runs=1, http_delay=0.0,
+                  db_latency=0.02, per_host_concurrency=2, min_interval=0.0, fetch_workers=4,
+                  extract_processes=0, fast_extract=True, use_feed_cache=False, use_seen_index=False,
+                  use_checkpoints=False, use_neardup=False, use_html_cache=False, use_spool=False,
+                  adaptive_rate=False, server_max_rate=None, crawl_delay=None, stop_at_body_end=True,
+                  stream_feeds=True, batch_size=50, verbose=False):
+    """벤치마크를 ``runs`` 번 실행하고 실행마다의 보고서(dict) 리스트를 반환합니다.
+
+    여러 번 실행하면 가짜 DB와 상태 파일이 이어지므로, 두 번째 실행부터는
+    이미 저장된 기사를 건너뛰는 경로(중복 확인, 피드 캐시)를 측정하게 됩니다.
+    """
+    servers = [FixtureServer(FixtureSite(SOURCES[name], entries, fresh, page_kb), delay=http_delay,
+                             max_rate=server_max_rate, crawl_delay=crawl_delay).start()
+               for name in names]
+    registry = {
+        server.site.source.key: dataclasses.replace(server.site.source,
+                                                    feed_urls=server.site.feed_urls(server.base_url))
+        for server in servers
+    }
+    supabase = FakeSupabase(latency=db_latency)
+    reports = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="news-bench-") as state_dir:
+            for run in range(1, runs + 1):
+                metrics = RunMetrics()
+                session = PooledSession()
+                round_trips_before = dict(supabase.round_trips)
+                rows_before = len(supabase.rows())
+                requests_before = {server.site.source.key: dict(server.requests) for server in servers}
+
+                output = contextlib.nullcontext() if verbose else open(os.devnull, 'w', encoding='utf-8')
+                started = time.perf_counter()
+                with output as sink, contextlib.redirect_stdout(sink or sys.stdout):
+                    exit_code = run_sources(names, RunOptions(
+                        per_host_concurrency=per_host_concurrency, min_interval=min_interval,
+                        batch_size=batch_size,
+                        feed_state_path=os.path.join(state_dir, "feed_state.json"),
+                        use_feed_cache=use_feed_cache,
+                        seen_index_path=os.path.join(state_dir, "seen.sqlite3"),
+                        use_seen_index=use_seen_index,
+                        checkpoint_path=os.path.join(state_dir, "checkpoints.json"),
+                        use_checkpoints=use_checkpoints,
+                        neardup_index_path=os.path.join(state_dir, "neardup.sqlite3"),
+                        use_neardup=use_neardup,
+                        html_cache_dir=os.path.join(state_dir, "html"),
+                        use_html_cache=use_html_cache,
+                        spool_path=os.path.join(state_dir, "spool.sqlite3"),
+                        use_spool=use_spool,
+                        adaptive_rate=adaptive_rate,
+                        rate_state_path=os.path.join(state_dir, "rate_limits.json"),
+                        stop_at_body_end=stop_at_body_end, stream_feeds=stream_feeds,
+                        fast_extract=fast_extract, fetch_workers=fetch_workers,
+                        extract_processes=extract_processes,
+                    ), supabase=supabase, session=session, registry=registry, metrics=metrics)
+                elapsed = time.perf_counter() - started
+                session.close()
+
+                stages = metrics.stage_summary()
+                processed = stages.get("write", {}).get("count", 0)
+                round_trips = {op: count - round_trips_before.get(op, 0)
+                               for op, count in supabase.round_trips.items()}
+                http_requests = {}
+                for server in servers:
+                    before = requests_before[server.site.source.key]
+                    for kind, count in server.requests.items():
+                        http_requests[kind] = http_requests.get(kind, 0) + count - before.get(kind, 0)
+                reports.append({
+                    "run": run,
+                    "exit_code": exit_code,
+                    "sources": list(names),
+                    "entries_per_feed": entries,
+                    "fresh_per_feed": min(fresh, entries),
+                    "elapsed_s": elapsed,
+                    "articles": processed,
+                    "rows_inserted": len(supabase.rows()) - rows_before,
+                    "articles_per_sec": processed / elapsed if elapsed else 0.0,
+                    "stages": stages,
+                    "peak_rss_mb": peak_rss_mb(),
+                    "db_round_trips": dict(round_trips, total=sum(round_trips.values())),
+                    "http_requests": dict(http_requests, total=sum(http_requests.values())),
+                    # 수집기가 실제로 읽은 응답 본문 크기 (본문이 끝나 읽기를 멈춘 페이지는 읽은 만큼)
+                    "http_bytes_read": sum(source["http"]["bytes"]
+                                           for source in metrics.report()["sources"].values()),
+                })
+    finally:
+        for server in servers:
+            server.stop()
+    return reports
+
+
+def format_report(report):
+    lines = [
+        f"[실행 {report['run']}] 소스 {len(report['sources'])}개, 피드당 항목 {report['entries_per_feed']}개 "
+        f"(수집 범위 안 {report['fresh_per_feed']}개), 종료 코드 {report['exit_code']}",
+        f"  경과 {report['elapsed_s']:.2f}초, 처리 기사 {report['articles']}건 "
+        f"({report['articles_per_sec']:.1f} articles/sec), 새로 저장 {report['rows_inserted']}건",
+    ]
+    if report['peak_rss_mb'] is not None:
+        lines.append(f"  최대 RSS {report['peak_rss_mb']:.1f} MB")
+    lines.append("  DB 왕복 " + ", ".join(f"{op} {count}" for op, count in report['db_round_trips'].items()))
+    lines.append("  HTTP 요청 " + ", ".join(f"{kind} {count}" for kind, count in report['http_requests'].items())
+                 + f", 읽은 본문 {report['http_bytes_read'] / 1024:.1f} KB")
+    lines.append(f"  {'단계':<15} {'호출':>7} {'p50(ms)':>10} {'p95(ms)':>10} {'합계(s)':>9}")
+    for name, stage in report['stages'].items():
+        lines.append(f"  {name:<15} {stage['count']:>7} {stage['p50_ms']:>10.2f} "
+                     f"{stage['p95_ms']:>10.2f} {stage['total_s']:>9.2f}")
+    return '\n'.join(lines)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="benchmarks",
+                                     description="로컬 fixture 서버와 가짜 Supabase로 수집기 성능을 측정합니다")
+    parser.add_argument("--sources", default="all",
+                        help="'all' 또는 쉼표로 구분된 소스 이름 (기본값: all)")
+    parser.add_argument("--entries", type=int, default=1000,
+                        help="피드 하나에 넣을 항목 수 (기본값: 1000)")
+    parser.add_argument("--fresh", type=int, default=30,
+                        help="그중 수집 범위(1일) 안에 게시된 항목 수 (기본값: 30)")
+    parser.add_argument("--page-kb", type=int, default=0,
+                        help="기사 페이지를 이 크기(KB)까지 부풀립니다 (기본값: 0, fixture 그대로)")
+    parser.add_argument("--runs", type=int, default=1,
+                        help="같은 DB와 상태 파일로 반복 실행할 횟수 (기본값: 1)")
+    parser.add_argument("--http-delay-ms", type=float, default=0.0,
+                        help="fixture 서버 응답마다 더할 지연(ms) (기본값: 0)")
+    parser.add_argument("--db-latency-ms", type=float, default=20.0,
+                        help="가짜 Supabase 요청마다 더할 지연(ms) (기본값: 20)")
+    parser.add_argument("--per-host-concurrency", type=int, default=2,
+                        help="호스트별 동시 기사 다운로드 수 (기본값: 2)")
+    parser.add_argument("--min-interval", type=float, default=0.0,
+                        help="같은 호스트 요청 간 최소 간격(초) (기본값: 0)")
+    parser.add_argument("--fetch-workers", type=int, default=4,
+                        help="소스별 동시 다운로드 작업자 수 (기본값: 4)")
+    parser.add_argument("--extract-processes", type=int, default=0,
+                        help="본문 추출 프로세스 수 (기본값: 0)")
+    parser.add_argument("--batch-size", type=int, default=50,
+                        help="한 번의 upsert로 저장할 최대 행 수 (기본값: 50)")
+    parser.add_argument("--full-parse", action="store_true",
+                        help="lxml 빠른 경로 없이 전체를 html.parser로 파싱합니다")
+    parser.add_argument("--feed-cache", action="store_true",
+                        help="조건부 피드 요청(ETag)을 사용합니다")
+    parser.add_argument("--seen-index", action="store_true",
+                        help="로컬 링크 인덱스를 사용합니다")
+    parser.add_argument("--checkpoints", action="store_true",
+                        help="소스별 high-water mark 체크포인트를 사용합니다")
+    parser.add_argument("--neardup", action="store_true",
+                        help="유사 중복 확인(MinHash LSH)을 사용합니다")
+    parser.add_argument("--html-cache", action="store_true",
+                        help="기사 HTML 압축 캐시를 사용합니다")
+    parser.add_argument("--spool", action="store_true",
+                        help="저장 전 행을 write-ahead 스풀에 기록합니다")
+    parser.add_argument("--adaptive-rate", action="store_true",
+                        help="응답에 따라 호스트별 속도를 조절합니다 (--min-interval은 시작 간격)")
+    parser.add_argument("--server-max-rate", type=float,
+                        help="fixture 서버가 초당 허용하는 기사 요청 수, 넘으면 429 (기본값: 제한 없음)")
+    parser.add_argument("--crawl-delay", type=float,
+                        help="fixture 서버의 robots.txt에 적을 Crawl-delay(초)")
+    parser.add_argument("--read-whole-page", action="store_true",
+                        help="본문이 끝난 뒤에도 기사 페이지를 끝까지 내려받습니다")
+    parser.add_argument("--feedparser", action="store_true",
+                        help="스트리밍 파서 대신 feedparser로 피드 전체를 파싱합니다")
+    parser.add_argument("--json", metavar="PATH",
+                        help="보고서를 JSON으로도 저장합니다")
+    parser.add_argument("--verbose", action="store_true",
+                        help="수집기 출력을 숨기지 않습니다")
+    return parser
+
+
+def main(argv=None):
+    sys.stdout.reconfigure(encoding='utf-8')
+    args = build_parser().parse_args(argv)
+    try:
+        names = resolve_sources(args.sources)
+    except ValueError as e:
+        print(e)
+        return 2
+
+    for problem in check_fixtures(names):
+        print(f"경고: {problem}")
+
+    reports = run_benchmark(
+        names, entries=args.entries, fresh=args.fresh, page_kb=args.page_kb, runs=args.runs,
+        http_delay=args.http_delay_ms / 1000, db_latency=args.db_latency_ms / 1000,
+        per_host_concurrency=args.per_host_concurrency, min_interval=args.min_interval,
+        fetch_workers=args.fetch_workers, extract_processes=args.extract_processes,
+        fast_extract=not args.full_parse, use_feed_cache=args.feed_cache,
+        use_seen_index=args.seen_index, use_checkpoints=args.checkpoints,
+        use_neardup=args.neardup, use_html_cache=args.html_cache,
+        use_spool=args.spool, adaptive_rate=args.adaptive_rate,
+        server_max_rate=args.server_max_rate, crawl_delay=args.crawl_delay,
+        stop_at_body_end=not args.read_whole_page, stream_feeds=not args.feedparser,
+        batch_size=args.batch_size, verbose=args.verbose,
+    )
+    for report in reports:
+        print(format_report(report))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
+    return max(report["exit_code"] for report in reports)
@@ -0,0 +1,225 @@
+"""녹화해 둔 피드/기사 fixture를 소스마다 로컬 HTTP 서버로 재생합니다.
+
+소스마다 ``127.0.0.1`` 의 서로 다른 포트에 서버를 하나씩 띄우므로
+수집기의 호스트별 스케줄링이 실제와 같은 모양으로 동작합니다. 피드는
+``fixtures/<key>/feed.xml`` 과 ``item.xml`` 템플릿으로 원하는 항목 수만큼
+만들어 내고(예: 10,000개짜리 ``allArticle.xml``), 게시 시간은 소스마다 실제
+피드와 같은 형식으로 씁니다. 기사 요청에는 ``article.html`` 을 돌려줍니다.
+
+``crawl_delay`` 를 주면 ``robots.txt`` 로 Crawl-delay를 알리고, ``max_rate`` 를
+주면 초당 그보다 많은 기사 요청에 ``429`` 와 ``Retry-After`` 로 답합니다.
+"""
+import hashlib
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xml.sax.saxutils import escape
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+KST = timezone(timedelta(hours=9))
+EST = timezone(timedelta(hours=-5))
+
+
+def _rfc822(published):
+    return format_datetime(published)
+
+
+# 소스별 실제 피드의 게시 시간 표기
+DATE_RENDERERS = {
+    # iRobot News는 시간대 없는 한국 시간 ('%Y-%m-%d %H:%M:%S')
+    "irobotnews": lambda published: published.astimezone(KST).strftime('%Y-%m-%d %H:%M:%S'),
+    "aitimes": lambda published: format_datetime(published.astimezone(KST)),
+    "theverge": lambda published: published.astimezone(EST).isoformat(timespec='seconds'),
+}
+
+# 기사 페이지를 --page-kb 크기까지 부풀릴 때 본문 뒤에 덧붙이는 조각 (광고/추천 기사 영역 흉내)
+_PADDING_BLOCK = (
+    '<div class="related-articles"><ul>'
+    + ''.join(f'<li><a href="/news/articleView.html?idxno={i}">관련 기사 {i} Related story {i}</a></li>'
+              for i in range(10))
+    + '</ul><script>window.dataLayer=window.dataLayer||[];dataLayer.push({"event":"view"});</script></div>\n'
+)
+
+
+def _read_fixture(key, name):
+    with open(os.path.join(FIXTURES_DIR, key, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def pad_html(html, page_kb):
+    """``</body>`` 앞에 덧붙여 페이지를 대략 ``page_kb`` KB로 만듭니다."""
+    missing = page_kb * 1024 - len(html.encode('utf-8'))
+    if missing <= 0:
+        return html
+    padding = _PADDING_BLOCK * (missing // len(_PADDING_BLOCK.encode('utf-8')) + 1)
+    head, sep, tail = html.rpartition('</body>')
+    if not sep:
+        return html + padding
+    return head + padding + sep + tail
+
+
+class FixtureSite:
+    """한 소스의 피드와 기사 응답을 미리 만들어 둔 것."""
+
+    def __init__(self, source, entries=1000, fresh=30, page_kb=0, now=None):
+        self.source = source
+        self.entries = entries
+        self.fresh = min(fresh, entries)
+        self.now = now or datetime.now(timezone.utc)
+        self.feed_template = _read_fixture(source.key, 'feed.xml')
+        self.item_template = _read_fixture(source.key, 'item.xml')
+        self.article = pad_html(_read_fixture(source.key, 'article.html'), page_kb).encode('utf-8')
+        self.render_date = DATE_RENDERERS.get(source.key, _rfc822)
+        self.feeds = {}
+
+    def feed_path(self, index):
+        return f"/{self.source.key}/feed/{index}.xml"
+
+    def published(self, i):
+        # 앞쪽 ``fresh`` 개는 수집 범위(1일) 안에, 나머지는 그보다 오래된 기사입니다.
+        if i < self.fresh:
+            return self.now - timedelta(hours=20) * (i + 1) / (self.fresh + 1)
+        return self.now - timedelta(days=2, minutes=i)
+
+    def build(self, base_url):
+        """``base_url`` 을 가리키는 링크로 소스의 모든 피드를 만듭니다."""
+        name = escape(self.source.name)
+        for index in range(len(self.source.feed_urls)):
+            items = []
+            for i in range(self.entries):
+                article_id = f"{index}-{i}"
+                link = f"{base_url}/{self.source.key}/article/{article_id}.html"
+                title = f"{name} 벤치마크 기사 {article_id}"
+                items.append(self.item_template.format(
+                    title=title,
+                    link=escape(link),
+                    guid=escape(link),
+                    summary=f"{title} 요약",
+                    published=self.render_date(self.published(i)),
+                ))
+            body = self.feed_template.replace('{items}', ''.join(items)).encode('utf-8')
+            self.feeds[self.feed_path(index)] = (body, '"' + hashlib.sha256(body).hexdigest()[:16] + '"')
+
+    def feed_urls(self, base_url):
+        return tuple(base_url + self.feed_path(index) for index in range(len(self.source.feed_urls)))
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # 헤더와 본문을 따로 보낼 때 Nagle/지연 ACK 때문에 응답마다 수십 ms가 더해지지 않도록 합니다.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        if server.delay:
+            time.sleep(server.delay)
+        site = server.site
+        path = self.path.split('?', 1)[0]
+        if path in site.feeds:
+            body, etag = site.feeds[path]
+            if self.headers.get('If-None-Match') == etag:
+                server.count('not_modified', 0)
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            server.count('feed', len(body))
+            self._send(body, 'application/rss+xml; charset=utf-8', etag)
+        elif path == '/robots.txt' and server.crawl_delay:
+            body = f"User-agent: *\nCrawl-delay: {server.crawl_delay:g}\n".encode('utf-8')
+            server.count('robots', len(body))
+            self._send(body, 'text/plain; charset=utf-8')
+        elif path.startswith(f"/{site.source.key}/article/"):
+            if not server.admit():
+                server.count('throttled', 0)
+                self.send_response(429)
+                self.send_header('Retry-After', '1')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            server.count('article', len(site.article))
+            self._send(site.article, 'text/html; charset=utf-8')
+        else:
+            server.count('not_found', 0)
+            self.send_error(404)
+
+    def _send(self, body, content_type, etag=None):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # 수집기가 본문을 다 읽은 뒤 나머지를 받지 않고 연결을 닫은 경우
+            self.close_connection = True
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """``FixtureSite`` 하나를 서비스하는 스레드 HTTP 서버. ``delay`` 는 응답마다 더하는 지연(초).
+
+    ``max_rate`` 는 초당 허용하는 기사 요청 수(None이면 제한 없음), ``crawl_delay`` 는
+    ``robots.txt`` 로 알릴 Crawl-delay(초)입니다.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, site, delay=0.0, max_rate=None, crawl_delay=None):
+        super().__init__(('127.0.0.1', 0), _FixtureHandler)
+        self.site = site
+        self.delay = delay
+        self.max_rate = max_rate
+        self.crawl_delay = crawl_delay
+        self._window = (0, 0)
+        self.requests = {}
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, kind, size):
+        with self._lock:
+            self.requests[kind] = self.requests.get(kind, 0) + 1
+            self.bytes_sent += size
+
+    def handle_error(self, request, client_address):
+        # 수집기가 본문만 읽고 연결을 닫는 것은 정상 동작이므로 조용히 넘어갑니다.
+        if not isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            super().handle_error(request, client_address)
+
+    def admit(self):
+        """1초 창 안의 기사 요청 수가 ``max_rate`` 이하이면 True."""
+        if not self.max_rate:
+            return True
+        with self._lock:
+            second = int(time.monotonic())
+            window, count = self._window
+            count = count + 1 if window == second else 1
+            self._window = (second, count)
+            return count <= self.max_rate
+
+    def start(self):
+        self.site.build(self.base_url)
+        self._thread = threading.Thread(target=self.serve_forever, name=f"fixture-{self.site.source.key}",
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
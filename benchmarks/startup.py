@@ -0,0 +1,117 @@
+"""명령행 시작 시간 측정.
+
+``news_collector`` 를 새 프로세스에서 가져오는 데 걸리는 시간(``-X importtime``)과
+``run --dry-run`` 의 전체 실행 시간을 여러 번 재서 가장 빠른 값을 예산과
+비교합니다. 가져오기만으로 무거운 의존성(supabase, bs4 등)이 로드되면 실패로
+보고합니다. ``python -m benchmarks.startup`` 으로 실행합니다.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# 명령행 모듈을 가져오는 데 허용하는 시간(ms). requests(약 100ms)가 대부분입니다.
+DEFAULT_IMPORT_BUDGET_MS = 250
+DEFAULT_DRY_RUN_BUDGET_MS = 1500
+
+# 실제로 쓸 때까지 가져오지 않아야 하는 모듈
+LAZY_MODULES = ("supabase", "postgrest", "dotenv", "bs4", "soupsieve", "lxml", "dateutil", "feedparser")
+
+_CHECK_MODULES = (
+    "import json, sys, news_collector.cli\n"
+    "print(json.dumps(sorted(set(m.split('.')[0] for m in sys.modules) & set(sys.argv[1:]))))\n"
+)
+
+
+def _clean_env():
+    # 자격 증명 없이도 가져오기와 dry-run이 동작해야 합니다.
+    env = {key: value for key, value in os.environ.items() if not key.startswith("SUPABASE_")}
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.getcwd(), env.get("PYTHONPATH")]))
+    return env
+
+
+def import_time_ms(module="news_collector.cli"):
+    """새 프로세스에서 ``module`` 을 가져오는 데 걸린 누적 시간(ms)."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, env=_clean_env(), check=True)
+    for line in reversed(result.stderr.splitlines()):
+        # "import time:   self [us] | cumulative | imported package"
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1000
+    raise RuntimeError(f"-X importtime 출력에서 {module} 을 찾지 못했습니다")
+
+
+def eager_modules(module="news_collector.cli"):
+    """``module`` 을 가져올 때 함께 로드된 ``LAZY_MODULES`` 목록."""
+    script = _CHECK_MODULES.replace("news_collector.cli", module)
+    result = subprocess.run([sys.executable, "-c", script, *LAZY_MODULES],
+                            capture_output=True, text=True, env=_clean_env(), check=True)
+    return json.loads(result.stdout)
+
+
+def dry_run_ms(state_dir):
+    """``python -m news_collector run --dry-run`` 의 실행 시간(ms)과 종료 코드."""
+    command = [sys.executable, "-m", "news_collector", "run", "--sources", "all", "--dry-run",
+               "--feed-state", os.path.join(state_dir, "feed_state.json"),
+               "--checkpoints", os.path.join(state_dir, "checkpoints.json"),
+               "--seen-index", os.path.join(state_dir, "seen.sqlite3"),
+               "--spool", os.path.join(state_dir, "spool.sqlite3")]
+    started = time.perf_counter()
+    result = subprocess.run(command, capture_output=True, text=True, env=_clean_env())
+    return (time.perf_counter() - started) * 1000, result.returncode
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup",
+                                     description="명령행 시작 시간 측정")
+    parser.add_argument("--runs", type=int, default=5,
+                        help="반복 횟수, 가장 빠른 값을 사용합니다 (기본값: 5)")
+    parser.add_argument("--import-budget-ms", type=float, default=DEFAULT_IMPORT_BUDGET_MS,
+                        help=f"가져오기 시간 예산(ms) (기본값: {DEFAULT_IMPORT_BUDGET_MS})")
+    parser.add_argument("--dry-run-budget-ms", type=float, default=DEFAULT_DRY_RUN_BUDGET_MS,
+                        help=f"run --dry-run 시간 예산(ms) (기본값: {DEFAULT_DRY_RUN_BUDGET_MS})")
+    parser.add_argument("--json", metavar="PATH",
+                        help="결과를 JSON으로도 저장합니다")
+    return parser
+
+
+def main(argv=None):
+    sys.stdout.reconfigure(encoding='utf-8')
+    args = build_parser().parse_args(argv)
+    problems = []
+
+    eager = eager_modules()
+    if eager:
+        problems.append(f"가져오기만으로 로드된 모듈: {', '.join(eager)}")
+    import_ms = min(import_time_ms() for _ in range(args.runs))
+    if import_ms > args.import_budget_ms:
+        problems.append(f"가져오기 {import_ms:.1f}ms > 예산 {args.import_budget_ms:g}ms")
+    with tempfile.TemporaryDirectory(prefix="news-startup-") as state_dir:
+        dry_runs = [dry_run_ms(state_dir) for _ in range(args.runs)]
+        leftovers = os.listdir(state_dir)
+    dry_ms = min(elapsed for elapsed, _ in dry_runs)
+    exit_codes = sorted({code for _, code in dry_runs})
+    if exit_codes != [0]:
+        problems.append(f"run --dry-run 종료 코드 {exit_codes}")
+    if dry_ms > args.dry_run_budget_ms:
+        problems.append(f"run --dry-run {dry_ms:.1f}ms > 예산 {args.dry_run_budget_ms:g}ms")
+    if leftovers:
+        problems.append(f"run --dry-run 이 파일을 만들었습니다: {', '.join(leftovers)}")
+
+    print(f"import news_collector.cli  {import_ms:8.1f} ms (예산 {args.import_budget_ms:g})")
+    print(f"run --dry-run              {dry_ms:8.1f} ms (예산 {args.dry_run_budget_ms:g})")
+    for problem in problems:
+        print(f"실패: {problem}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"import_ms": import_ms, "dry_run_ms": dry_ms, "eager_modules": eager,
+                       "problems": problems}, f, ensure_ascii=False, indent=2)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,6 @@
+"""RSS 뉴스 수집기 패키지.
+
+여러 뉴스 소스의 RSS 피드를 읽어 기사 본문을 추출하고 Supabase의
+'articles' 테이블에 저장합니다. ``python -m news_collector run --sources all``
+으로 모든 소스를 하나의 프로세스에서 동시에 실행할 수 있습니다.
+"""
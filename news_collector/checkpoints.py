@@ -0,0 +1,171 @@
+"""소스별 high-water mark 체크포인트.
+
+고정된 24시간 범위 대신, 소스마다 저장까지 끝난 기사 중 가장 최근 게시
+시간(mark)과 그 근처에서 처리한 링크들을 기록해 둡니다. 다음 실행은
+``mark - overlap`` 이후의 항목만 보고, 그중 이미 처리한 링크는 건너뜁니다.
+실행이 며칠 빠져도 mark 이후의 기사는 잃지 않으며(최대 ``max_lookback``),
+체크포인트가 없는 소스는 기존처럼 최근 24시간을 처리합니다.
+
+FeedCache처럼 소스 처리가 끝나야(``finish``) 확정되고, writer가 모든 행을
+저장한 뒤 ``save`` 로 디스크에 씁니다. mark는 저장했거나(``record_write``) DB에 이미
+있음을 확인한(``confirm``) 기사까지만 옮깁니다. 그 밖의 처리 대상(저장 실패, 다른 작업자가
+lease를 잡은 링크, 유사 중복으로 건너뛴 기사, 내려받지 못해 저장하지 않은 기사)이 있으면
+mark를 그 기사 이전으로 묶어 두어 다음 실행에서 다시 처리합니다.
+"""
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+
+DEFAULT_CHECKPOINT_PATH = os.path.join('.cache', 'checkpoints.json')
+
+# mark 이전이라도 이 시간 안에 게시된 항목은 다시 확인합니다. (늦게 피드에 올라온 기사 대비)
+DEFAULT_OVERLAP = timedelta(hours=6)
+# 오래 멈춰 있었더라도 이보다 오래된 항목까지 거슬러 올라가지는 않습니다.
+DEFAULT_MAX_LOOKBACK = timedelta(days=7)
+# 체크포인트가 없을 때 처리할 범위 (기존 동작)
+DEFAULT_WINDOW = timedelta(days=1)
+
+
+def _parse_time(value):
+    return datetime.fromisoformat(value) if value else None
+
+
+class CheckpointWindow:
+    """한 소스의 이번 실행 처리 범위와 진행 상황."""
+
+    def __init__(self, cutoff, mark, known_links):
+        # 이 시각 이전에 게시된 항목은 건너뜁니다.
+        self.cutoff = cutoff
+        # 지난 실행까지의 high-water mark (없으면 None)
+        self.mark = mark
+        # mark 근처에서 이미 처리한 링크 -> 게시 시간
+        self.known_links = known_links
+        self.admitted = {}
+        # 저장했거나 DB에 이미 있음을 확인한 링크
+        self.confirmed = set()
+        self.finished = False
+
+    def is_old(self, published):
+        return published < self.cutoff
+
+    def is_known(self, link, published):
+        """mark 이전에 게시되었고 지난 실행에서 이미 처리한 링크면 True."""
+        return self.mark is not None and published <= self.mark and link in self.known_links
+
+    def admit(self, link, published):
+        self.admitted[link] = published
+
+
+class CheckpointStore:
+    """소스 key별 ``{'mark': ISO 시간, 'links': {link: ISO 시간}}`` 상태."""
+
+    def __init__(self, path=DEFAULT_CHECKPOINT_PATH, enabled=True, overlap=DEFAULT_OVERLAP,
+                 max_lookback=DEFAULT_MAX_LOOKBACK, window=DEFAULT_WINDOW, catch_up=None):
+        self.path = path
+        self.enabled = enabled
+        self.overlap = overlap
+        self.max_lookback = max_lookback
+        self.window = window
+        # 설정하면 체크포인트와 상관없이 최소한 이만큼 거슬러 올라가 다시 확인합니다. (장애 복구용)
+        self.catch_up = catch_up
+        self._state = {}
+        self._windows = {}
+        self._links = {}
+        self._lock = threading.Lock()
+        if enabled and path and os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self._state = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"체크포인트 파일을 읽지 못해 무시합니다 ({path}): {e}")
+
+    def begin(self, source_key, now):
+        """``source_key`` 의 이번 실행 처리 범위를 만듭니다."""
+        with self._lock:
+            state = self._state.get(source_key) if self.enabled else None
+        mark = _parse_time(state.get('mark')) if state else None
+        if mark is None:
+            cutoff = now - self.window
+            known_links = {}
+        else:
+            cutoff = max(mark - self.overlap, now - self.max_lookback)
+            known_links = {link: _parse_time(published) for link, published in state.get('links', {}).items()}
+        if self.catch_up is not None:
+            cutoff = min(cutoff, now - self.catch_up)
+        window = CheckpointWindow(cutoff, mark, known_links)
+        with self._lock:
+            self._windows[source_key] = window
+        return window
+
+    def admit(self, source_key, link, published):
+        """처리 대상이 된 항목을 기록합니다. 저장 결과는 ``record_write`` 로 받습니다."""
+        with self._lock:
+            self._windows[source_key].admit(link, published)
+            self._links[link] = source_key
+
+    def confirm(self, source_key, links):
+        """처리 대상 중 DB에 이미 저장되어 있음을 확인한 링크를 기록합니다."""
+        with self._lock:
+            self._windows[source_key].confirmed.update(links)
+
+    def record_write(self, row, result):
+        """``ArticleWriter`` 의 on_result 콜백으로 쓰입니다. 저장에 성공한 링크를 기억합니다."""
+        if not result.ok:
+            return
+        with self._lock:
+            source_key = self._links.get(row['link'])
+            if source_key is not None:
+                self._windows[source_key].confirmed.add(row['link'])
+
+    def finish(self, source_key):
+        """소스 처리가 끝까지 완료되었음을 기록합니다. 완료된 소스만 ``save`` 때 반영됩니다."""
+        with self._lock:
+            self._windows[source_key].finished = True
+
+    def _advance(self, window, state):
+        confirmed = {link: published for link, published in window.admitted.items()
+                     if link in window.confirmed}
+        unconfirmed = {link: published for link, published in window.admitted.items()
+                       if link not in window.confirmed}
+        mark = window.mark
+        if confirmed:
+            newest = max(confirmed.values())
+            mark = newest if mark is None else max(mark, newest)
+        if unconfirmed:
+            # 저장을 확인하지 못한 기사가 다음 실행에서 mark 이후 항목으로 다시 처리되도록 합니다.
+            oldest_unconfirmed = min(unconfirmed.values()) - timedelta(microseconds=1)
+            mark = oldest_unconfirmed if mark is None else min(mark, oldest_unconfirmed)
+        if mark is None:
+            return state
+
+        links = dict(window.known_links)
+        links.update(confirmed)
+        for link in unconfirmed:
+            links.pop(link, None)
+        floor = mark - self.overlap
+        return {
+            'mark': mark.isoformat(),
+            'links': {link: published.isoformat() for link, published in sorted(links.items())
+                      if published >= floor},
+            'updated_at': datetime.now(timezone.utc).isoformat(),
+        }
+
+    def save(self):
+        """완료된 소스의 mark를 갱신해 파일에 씁니다."""
+        if not (self.enabled and self.path):
+            return
+        with self._lock:
+            for source_key, window in self._windows.items():
+                if window.finished:
+                    advanced = self._advance(window, self._state.get(source_key))
+                    if advanced is not None:
+                        self._state[source_key] = advanced
+            state = dict(self._state)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
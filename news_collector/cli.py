@@ -0,0 +1,459 @@
+"""``python -m news_collector`` 명령행 인터페이스."""
+import argparse
+import sys
+from datetime import datetime, timedelta, timezone
+
+from news_collector.checkpoints import DEFAULT_CHECKPOINT_PATH, DEFAULT_OVERLAP
+from news_collector.context import RunOptions
+from news_collector.extract import DEFAULT_MAX_ARTICLE_BYTES
+from news_collector.feeds import DEFAULT_FEED_STATE_PATH
+from news_collector.htmlcache import DEFAULT_HTML_CACHE_DIR, DEFAULT_MAX_BYTES, DEFAULT_TTL, HtmlCache
+from news_collector.leases import (DEFAULT_LEASE_PATH, DEFAULT_LEASE_TTL, KIND_SOURCE, SUPABASE_SCHEMA,
+                                   default_run_id, open_lease_store)
+from news_collector.metrics import DEFAULT_PROMETHEUS_PATH, DEFAULT_REPORT_PATH
+from news_collector.neardup import DEFAULT_NEARDUP_INDEX_PATH, NearDuplicateIndex
+from news_collector.ratelimit import DEFAULT_RATE_STATE_PATH
+from news_collector.repair import DEFAULT_REPAIR_STATE_PATH, RepairOptions, reextract_articles, repair_articles
+from news_collector.runner import resolve_sources, run_sources
+from news_collector.seen import DEFAULT_SEEN_INDEX_PATH, SeenIndex
+from news_collector.spool import DEFAULT_SPOOL_PATH, WriteSpool
+from news_collector.writer import SUPABASE_SCHEMA as ARTICLES_SCHEMA
+from news_collector.writer import ArticleWriter
+
+
+def _process_count(value):
+    if value == "auto":
+        return None
+    count = int(value)
+    if count < 0:
+        raise argparse.ArgumentTypeError("0 이상이어야 합니다")
+    return count
+
+
+def _add_lease_arguments(parser):
+    parser.add_argument("--leases", choices=["sqlite", "supabase"],
+                        help="여러 작업자가 같은 --run-id로 실행될 때 lease 저장소로 작업을 나눕니다 "
+                             "(sqlite: 한 컴퓨터의 여러 프로세스, supabase: 여러 러너)")
+    parser.add_argument("--lease-path", default=DEFAULT_LEASE_PATH,
+                        help=f"sqlite lease 파일 (기본값: {DEFAULT_LEASE_PATH})")
+    parser.add_argument("--run-id",
+                        help="작업자들이 공유하는 실행 id (기본값: GitHub Actions의 실행 id와 재시도 번호)")
+    parser.add_argument("--worker-id",
+                        help="이 작업자의 이름, 작업자마다 달라야 합니다 (기본값: 호스트명-PID)")
+    parser.add_argument("--lease-ttl", type=float, default=DEFAULT_LEASE_TTL,
+                        help=f"연장되지 않은 lease가 만료되는 시간(초) (기본값: {DEFAULT_LEASE_TTL:g})")
+
+
+def _lease_options(args):
+    """``--leases`` 관련 인자를 ``RunOptions``/``RepairOptions`` 인자로 바꿉니다. run id가 없으면 ValueError."""
+    run_id = args.run_id or default_run_id()
+    if args.leases and not run_id:
+        raise ValueError("--leases에는 --run-id가 필요합니다 (GitHub Actions 밖에서 실행할 때)")
+    return dict(lease_backend=args.leases, lease_path=args.lease_path, run_id=run_id,
+                worker_id=args.worker_id, lease_ttl=args.lease_ttl)
+
+
+def _run_options(args, lease_options):
+    """``run`` 명령의 인자를 ``RunOptions`` 로 바꿉니다."""
+    return RunOptions(max_workers=args.workers,
+                      per_host_concurrency=args.per_host_concurrency,
+                      min_interval=args.min_interval,
+                      batch_size=args.batch_size,
+                      flush_interval=args.flush_interval,
+                      feed_state_path=args.feed_state,
+                      use_feed_cache=not args.no_feed_cache,
+                      seen_index_path=args.seen_index,
+                      use_seen_index=not args.no_seen_index,
+                      fast_extract=not args.full_parse,
+                      queue_size=args.queue_size,
+                      fetch_workers=args.fetch_workers,
+                      extract_processes=args.extract_processes,
+                      checkpoint_path=args.checkpoints,
+                      use_checkpoints=not args.no_checkpoints,
+                      overlap=timedelta(hours=args.overlap_hours),
+                      catch_up=timedelta(days=args.catch_up_days) if args.catch_up_days else None,
+                      neardup_index_path=args.neardup_index,
+                      use_neardup=not args.no_neardup,
+                      cluster_column=args.cluster_column,
+                      skip_near_duplicates=args.skip_near_duplicates,
+                      html_cache_dir=args.html_cache,
+                      use_html_cache=not args.no_html_cache,
+                      html_cache_ttl=timedelta(hours=args.html_cache_ttl_hours),
+                      html_cache_max_bytes=args.html_cache_max_mb * 1024 * 1024,
+                      spool_path=args.spool,
+                      use_spool=not args.no_spool,
+                      adaptive_rate=not args.no_adaptive_rate,
+                      rate_state_path=args.rate_state,
+                      max_article_bytes=args.max_article_kb * 1024,
+                      stop_at_body_end=not args.read_whole_page,
+                      stream_feeds=not args.feedparser,
+                      **lease_options,
+                      report_path=None if args.no_report else args.report,
+                      prometheus_path=None if args.no_report else args.prometheus_textfile,
+                      dry_run=args.dry_run)
+
+
+def _repair_options(args, lease_options):
+    """``repair`` 명령의 인자를 ``RepairOptions`` 로 바꿉니다."""
+    return RepairOptions(page_size=args.page_size,
+                         limit=args.limit,
+                         include_summary_only=args.include_summary_only,
+                         state_path=args.state,
+                         restart=args.restart,
+                         per_host_concurrency=args.per_host_concurrency,
+                         min_interval=args.min_interval,
+                         adaptive_rate=not args.no_adaptive_rate,
+                         rate_state_path=args.rate_state,
+                         batch_size=args.batch_size,
+                         fast_extract=not args.full_parse,
+                         seen_index_path=args.seen_index,
+                         html_cache_dir=args.html_cache,
+                         use_html_cache=not args.no_html_cache,
+                         **lease_options)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="news_collector", description="RSS 뉴스 수집기")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="뉴스 소스를 동시에 수집합니다")
+    run.add_argument("--sources", default="all",
+                     help="'all' 또는 쉼표로 구분된 소스 이름 (예: irobotnews,aitimes)")
+    run.add_argument("--workers", type=int, default=None,
+                     help="동시에 실행할 소스 수 (기본값: 소스 개수)")
+    run.add_argument("--per-host-concurrency", type=int, default=2,
+                     help="호스트별 동시 기사 다운로드 수 (기본값: 2)")
+    run.add_argument("--min-interval", type=float, default=1.0,
+                     help="같은 호스트에 대한 요청 시작 간 최소 간격(초), 적응형 속도 제한에서는 "
+                          "처음 보는 호스트의 시작 간격 (기본값: 1.0)")
+    run.add_argument("--feedparser", action="store_true",
+                     help="스트리밍 파서 대신 feedparser로 피드 전체를 파싱합니다")
+    run.add_argument("--max-article-kb", type=int, default=DEFAULT_MAX_ARTICLE_BYTES // 1024,
+                     help="기사 페이지에서 읽을 최대 크기(KB), 본문이 끝나기 전에 넘으면 실패로 봅니다 "
+                          f"(기본값: {DEFAULT_MAX_ARTICLE_BYTES // 1024}, 0이면 제한 없음)")
+    run.add_argument("--read-whole-page", action="store_true",
+                     help="본문 컨테이너가 닫힌 뒤에도 기사 페이지를 끝까지 내려받습니다")
+    run.add_argument("--rate-state", default=DEFAULT_RATE_STATE_PATH,
+                     help=f"호스트별로 학습한 요청 속도 상태 파일 (기본값: {DEFAULT_RATE_STATE_PATH})")
+    run.add_argument("--no-adaptive-rate", action="store_true",
+                     help="응답에 따라 속도를 조절하지 않고 --min-interval 간격을 고정으로 씁니다")
+    run.add_argument("--batch-size", type=int, default=50,
+                     help="한 번의 upsert로 저장할 최대 행 수 (기본값: 50)")
+    run.add_argument("--flush-interval", type=float, default=5.0,
+                     help="버퍼에 쌓인 행을 저장하는 주기(초) (기본값: 5.0)")
+    run.add_argument("--feed-state", default=DEFAULT_FEED_STATE_PATH,
+                     help=f"피드 ETag/Last-Modified 상태 파일 (기본값: {DEFAULT_FEED_STATE_PATH})")
+    run.add_argument("--no-feed-cache", action="store_true",
+                     help="조건부 요청을 쓰지 않고 모든 피드를 새로 처리합니다")
+    run.add_argument("--seen-index", default=DEFAULT_SEEN_INDEX_PATH,
+                     help=f"수집한 링크 인덱스(SQLite) 경로 (기본값: {DEFAULT_SEEN_INDEX_PATH})")
+    run.add_argument("--no-seen-index", action="store_true",
+                     help="로컬 링크 인덱스를 쓰지 않고 항상 Supabase에서 중복을 확인합니다")
+    run.add_argument("--full-parse", action="store_true",
+                     help="lxml 빠른 경로 없이 기사 전체를 html.parser로 파싱합니다")
+    run.add_argument("--queue-size", type=int, default=32,
+                     help="파이프라인 단계 사이 큐의 최대 크기 (기본값: 32)")
+    run.add_argument("--fetch-workers", type=int, default=4,
+                     help="소스별 동시 다운로드 작업자 수 (기본값: 4)")
+    run.add_argument("--extract-processes", type=_process_count, default=0,
+                     help="본문 추출을 실행할 프로세스 수, 'auto'는 CPU 코어 수 (기본값: 0, 같은 프로세스에서 추출)")
+    run.add_argument("--checkpoints", default=DEFAULT_CHECKPOINT_PATH,
+                     help=f"소스별 high-water mark 체크포인트 파일 (기본값: {DEFAULT_CHECKPOINT_PATH})")
+    run.add_argument("--no-checkpoints", action="store_true",
+                     help="체크포인트 없이 최근 24시간에 게시된 항목을 처리합니다")
+    run.add_argument("--overlap-hours", type=float, default=DEFAULT_OVERLAP.total_seconds() / 3600,
+                     help="체크포인트 이전으로 겹쳐서 다시 확인할 시간 "
+                          f"(기본값: {DEFAULT_OVERLAP.total_seconds() / 3600:g})")
+    run.add_argument("--catch-up-days", type=float, default=None,
+                     help="장애 복구용: 체크포인트와 상관없이 최근 N일의 항목을 다시 확인합니다")
+    run.add_argument("--neardup-index", default=DEFAULT_NEARDUP_INDEX_PATH,
+                     help=f"유사 중복 MinHash 색인(SQLite) 경로 (기본값: {DEFAULT_NEARDUP_INDEX_PATH})")
+    run.add_argument("--no-neardup", action="store_true",
+                     help="유사 중복 기사 확인을 하지 않습니다")
+    run.add_argument("--cluster-column", default=None,
+                     help="유사 중복 클러스터 id를 저장할 articles 컬럼 (예: cluster_id, 기본값: 저장하지 않음)")
+    run.add_argument("--skip-near-duplicates", action="store_true",
+                     help="이미 저장된 기사와 거의 같은 새 기사는 저장하지 않습니다")
+    run.add_argument("--html-cache", default=DEFAULT_HTML_CACHE_DIR,
+                     help=f"내려받은 기사 HTML 압축 캐시 디렉터리 (기본값: {DEFAULT_HTML_CACHE_DIR})")
+    run.add_argument("--no-html-cache", action="store_true",
+                     help="기사 HTML을 캐시에 보관하거나 캐시에서 읽지 않습니다")
+    run.add_argument("--html-cache-ttl-hours", type=float, default=DEFAULT_TTL.total_seconds() / 3600,
+                     help="이 시간 안에 받은 페이지는 다시 내려받지 않습니다 "
+                          f"(기본값: {DEFAULT_TTL.total_seconds() / 3600:g})")
+    run.add_argument("--html-cache-max-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                     help=f"HTML 캐시의 최대 크기(MB) (기본값: {DEFAULT_MAX_BYTES // (1024 * 1024)})")
+    run.add_argument("--spool", default=DEFAULT_SPOOL_PATH,
+                     help=f"저장 전 행을 기록하는 write-ahead 스풀 경로 (기본값: {DEFAULT_SPOOL_PATH})")
+    run.add_argument("--no-spool", action="store_true",
+                     help="스풀 없이 저장합니다 (저장에 실패한 행은 버려집니다)")
+    run.add_argument("--dry-run", action="store_true",
+                     help="네트워크와 Supabase에 접속하지 않고 소스 정의와 로컬 상태만 확인합니다")
+    run.add_argument("--report", default=DEFAULT_REPORT_PATH,
+                     help=f"단계별 시간과 건수를 담은 JSON 보고서 경로 (기본값: {DEFAULT_REPORT_PATH})")
+    run.add_argument("--prometheus-textfile", default=DEFAULT_PROMETHEUS_PATH,
+                     help=f"Prometheus textfile collector 형식 지표 경로 (기본값: {DEFAULT_PROMETHEUS_PATH})")
+    run.add_argument("--no-report", action="store_true",
+                     help="JSON 보고서와 Prometheus 지표를 저장하지 않습니다")
+
+    _add_lease_arguments(run)
+
+    seen = subparsers.add_parser("seen", help="로컬 링크 인덱스를 관리합니다")
+    seen.add_argument("action", choices=["rebuild", "compact", "stats"],
+                      help="rebuild: Supabase에서 다시 만들기, compact: 오래된 항목 정리, stats: 상태별 개수")
+    seen.add_argument("--path", default=DEFAULT_SEEN_INDEX_PATH,
+                      help=f"인덱스 파일 경로 (기본값: {DEFAULT_SEEN_INDEX_PATH})")
+    seen.add_argument("--page-size", type=int, default=1000,
+                      help="rebuild 시 한 번에 읽을 행 수 (기본값: 1000)")
+    seen.add_argument("--max-age-days", type=int, default=30,
+                      help="compact 시 남길 최대 기간(일) (기본값: 30)")
+
+    neardup = subparsers.add_parser("neardup", help="유사 중복 MinHash 색인을 관리합니다")
+    neardup.add_argument("action", choices=["seed", "compact", "stats"],
+                         help="seed: Supabase의 최근 기사로 채우기, compact: 오래된 시그니처 정리, stats: 개수")
+    neardup.add_argument("--path", default=DEFAULT_NEARDUP_INDEX_PATH,
+                         help=f"색인 파일 경로 (기본값: {DEFAULT_NEARDUP_INDEX_PATH})")
+    neardup.add_argument("--limit", type=int, default=2000,
+                         help="seed 시 읽을 최근 기사 수 (기본값: 2000)")
+
+    repair = subparsers.add_parser("repair", help="본문이 비어 있는 기사를 다시 내려받아 채웁니다")
+    repair.add_argument("--sources", default="all",
+                        help="'all' 또는 쉼표로 구분된 소스 이름 (예: irobotnews,aitimes)")
+    repair.add_argument("--page-size", type=int, default=500,
+                        help="한 번에 읽고 복구할 행 수 (기본값: 500)")
+    repair.add_argument("--limit", type=int, default=None,
+                        help="이번 실행에서 훑을 최대 행 수 (기본값: 끝까지)")
+    repair.add_argument("--include-summary-only", action="store_true",
+                        help="본문이 요약과 같은 행도 복구합니다 (서버에서 거를 수 없어 테이블 전체를 훑습니다)")
+    repair.add_argument("--state", default=DEFAULT_REPAIR_STATE_PATH,
+                        help=f"진행 위치를 저장할 파일 (기본값: {DEFAULT_REPAIR_STATE_PATH})")
+    repair.add_argument("--restart", action="store_true",
+                        help="저장된 진행 위치를 무시하고 처음부터 다시 훑습니다")
+    repair.add_argument("--per-host-concurrency", type=int, default=2,
+                        help="호스트별 동시 기사 다운로드 수 (기본값: 2)")
+    repair.add_argument("--min-interval", type=float, default=1.0,
+                        help="같은 호스트에 대한 요청 시작 간 최소 간격(초), 적응형 속도 제한에서는 "
+                             "처음 보는 호스트의 시작 간격 (기본값: 1.0)")
+    repair.add_argument("--rate-state", default=DEFAULT_RATE_STATE_PATH,
+                        help=f"호스트별로 학습한 요청 속도 상태 파일 (기본값: {DEFAULT_RATE_STATE_PATH})")
+    repair.add_argument("--no-adaptive-rate", action="store_true",
+                        help="응답에 따라 속도를 조절하지 않고 --min-interval 간격을 고정으로 씁니다")
+    repair.add_argument("--batch-size", type=int, default=50,
+                        help="한 번의 upsert로 저장할 최대 행 수 (기본값: 50)")
+    repair.add_argument("--seen-index", default=DEFAULT_SEEN_INDEX_PATH,
+                        help=f"복구한 링크를 기록할 인덱스 경로 (기본값: {DEFAULT_SEEN_INDEX_PATH})")
+    repair.add_argument("--html-cache", default=DEFAULT_HTML_CACHE_DIR,
+                        help=f"기사 HTML 압축 캐시 디렉터리 (기본값: {DEFAULT_HTML_CACHE_DIR})")
+    repair.add_argument("--no-html-cache", action="store_true",
+                        help="기사 HTML을 캐시에 보관하거나 캐시에서 읽지 않습니다")
+    repair.add_argument("--full-parse", action="store_true",
+                        help="lxml 빠른 경로 없이 기사 전체를 html.parser로 파싱합니다")
+
+    _add_lease_arguments(repair)
+
+    reextract = subparsers.add_parser("reextract", help="캐시된 기사 HTML에서 본문을 다시 추출해 저장합니다")
+    reextract.add_argument("--sources", "--source", dest="sources", required=True,
+                           help="'all' 또는 쉼표로 구분된 소스 이름 (예: venturebeat)")
+    reextract.add_argument("--since-days", type=float, default=None,
+                           help="최근 N일 안에 받은 페이지만 처리합니다 (기본값: 전체)")
+    reextract.add_argument("--extract-processes", type=_process_count, default=0,
+                           help="본문 추출을 실행할 프로세스 수, 'auto'는 CPU 코어 수 (기본값: 0)")
+    reextract.add_argument("--batch-size", type=int, default=50,
+                           help="한 번의 upsert로 저장할 최대 행 수 (기본값: 50)")
+    reextract.add_argument("--dry-run", action="store_true",
+                           help="추출 결과만 세고 저장하지 않습니다")
+    reextract.add_argument("--html-cache", default=DEFAULT_HTML_CACHE_DIR,
+                           help=f"기사 HTML 압축 캐시 디렉터리 (기본값: {DEFAULT_HTML_CACHE_DIR})")
+    reextract.add_argument("--seen-index", default=DEFAULT_SEEN_INDEX_PATH,
+                           help=f"갱신한 링크를 기록할 인덱스 경로 (기본값: {DEFAULT_SEEN_INDEX_PATH})")
+    reextract.add_argument("--full-parse", action="store_true",
+                           help="lxml 빠른 경로 없이 기사 전체를 html.parser로 파싱합니다")
+    reextract.add_argument("--skip-truncated", action="store_true",
+                           help="본문 뒤를 읽지 않고 캐시된 페이지를 다시 내려받지 않고 건너뜁니다")
+    reextract.add_argument("--min-interval", type=float, default=1.0,
+                           help="페이지를 다시 내려받을 때 같은 호스트 요청 간 최소 간격(초) (기본값: 1.0)")
+
+    spool = subparsers.add_parser("spool", help="저장하지 못한 행이 남은 write-ahead 스풀을 관리합니다")
+    spool.add_argument("action", choices=["replay", "revive", "stats"],
+                       help="replay: 남은 행을 지금 저장, revive: 포기한(dead) 행을 다시 보낼 대상으로, "
+                            "stats: 상태별 개수")
+    spool.add_argument("--path", default=DEFAULT_SPOOL_PATH,
+                       help=f"스풀 파일 경로 (기본값: {DEFAULT_SPOOL_PATH})")
+    spool.add_argument("--seen-index", default=DEFAULT_SEEN_INDEX_PATH,
+                       help=f"저장한 링크를 기록할 인덱스 경로 (기본값: {DEFAULT_SEEN_INDEX_PATH})")
+    spool.add_argument("--batch-size", type=int, default=50,
+                       help="한 번의 upsert로 저장할 최대 행 수 (기본값: 50)")
+
+    html_cache = subparsers.add_parser("html-cache", help="기사 HTML 캐시를 관리합니다")
+    html_cache.add_argument("action", choices=["compact", "stats"],
+                            help="compact: 크기 한도를 넘는 항목과 남은 임시 파일 정리, stats: 개수와 크기")
+    html_cache.add_argument("--path", default=DEFAULT_HTML_CACHE_DIR,
+                            help=f"캐시 디렉터리 (기본값: {DEFAULT_HTML_CACHE_DIR})")
+    html_cache.add_argument("--max-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                            help=f"compact 시 남길 최대 크기(MB) (기본값: {DEFAULT_MAX_BYTES // (1024 * 1024)})")
+
+    subparsers.add_parser("schema", help="Supabase에 만들 articles 일괄 update 함수 SQL을 출력합니다")
+
+    leases = subparsers.add_parser("leases", help="여러 작업자가 쓰는 lease 테이블을 관리합니다")
+    leases.add_argument("action", choices=["status", "schema"],
+                        help="status: --run-id의 소스별 lease 상태, schema: Supabase에 만들 테이블과 함수 SQL")
+    leases.add_argument("--leases", choices=["sqlite", "supabase"], default="sqlite",
+                        help="lease 저장소 (기본값: sqlite)")
+    leases.add_argument("--lease-path", default=DEFAULT_LEASE_PATH,
+                        help=f"sqlite lease 파일 (기본값: {DEFAULT_LEASE_PATH})")
+    leases.add_argument("--run-id",
+                        help="상태를 볼 실행 id (기본값: GitHub Actions의 실행 id와 재시도 번호)")
+    return parser
+
+
+def main(argv=None):
+    sys.stdout.reconfigure(encoding='utf-8')
+    args = build_parser().parse_args(argv)
+
+    if args.command == "run":
+        try:
+            names = resolve_sources(args.sources)
+        except ValueError as e:
+            print(e)
+            return 2
+        try:
+            lease_options = _lease_options(args)
+        except ValueError as e:
+            print(e)
+            return 2
+        return run_sources(names, _run_options(args, lease_options))
+
+    if args.command == "seen":
+        return manage_seen_index(args)
+    if args.command == "neardup":
+        return manage_neardup_index(args)
+    if args.command == "repair":
+        try:
+            names = resolve_sources(args.sources)
+        except ValueError as e:
+            print(e)
+            return 2
+        try:
+            lease_options = _lease_options(args)
+        except ValueError as e:
+            print(e)
+            return 2
+        return repair_articles(names, _repair_options(args, lease_options))
+    if args.command == "reextract":
+        try:
+            names = resolve_sources(args.sources)
+        except ValueError as e:
+            print(e)
+            return 2
+        since = None
+        if args.since_days is not None:
+            since = datetime.now(timezone.utc) - timedelta(days=args.since_days)
+        return reextract_articles(names, since=since, extract_processes=args.extract_processes,
+                                  fast_extract=not args.full_parse, batch_size=args.batch_size,
+                                  dry_run=args.dry_run, html_cache_dir=args.html_cache,
+                                  seen_index_path=args.seen_index, refetch_truncated=not args.skip_truncated,
+                                  min_interval=args.min_interval)
+    if args.command == "html-cache":
+        return manage_html_cache(args)
+    if args.command == "spool":
+        return manage_spool(args)
+    if args.command == "leases":
+        return manage_leases(args)
+    if args.command == "schema":
+        print(ARTICLES_SCHEMA)
+        return 0
+    return 2
+
+
+def manage_seen_index(args):
+    index = SeenIndex(args.path)
+    try:
+        if args.action == "rebuild":
+            from news_collector.clients import get_supabase
+            total = index.rebuild(get_supabase(), page_size=args.page_size)
+            print(f"{total}개 링크로 인덱스를 다시 만들었습니다: {args.path}")
+        elif args.action == "compact":
+            deleted = index.compact(max_age_days=args.max_age_days)
+            print(f"{deleted}개 항목을 정리했습니다: {args.path}")
+        for status, count in sorted(index.counts().items()):
+            print(f"  {status}: {count}")
+    finally:
+        index.close()
+    return 0
+
+
+def manage_neardup_index(args):
+    index = NearDuplicateIndex(args.path)
+    try:
+        if args.action == "seed":
+            from news_collector.clients import get_supabase
+            total = index.seed(get_supabase(), limit=args.limit)
+            print(f"최근 기사 {total}개로 색인을 채웠습니다: {args.path}")
+        elif args.action == "compact":
+            deleted = index.compact()
+            print(f"{deleted}개 시그니처를 정리했습니다: {args.path}")
+        for name, count in index.stats().items():
+            print(f"  {name}: {count}")
+    finally:
+        index.close()
+    return 0
+
+
+def manage_html_cache(args):
+    cache = HtmlCache(args.path, max_bytes=args.max_mb * 1024 * 1024)
+    try:
+        if args.action == "compact":
+            evicted, removed = cache.compact()
+            print(f"{evicted}개 페이지와 {removed}개 파일을 정리했습니다: {args.path}")
+        for name, count in cache.stats().items():
+            print(f"  {name}: {count}")
+    finally:
+        cache.close()
+    return 0
+
+
+def manage_spool(args):
+    spool = WriteSpool(args.path)
+    exit_code = 0
+    try:
+        if args.action == "replay":
+            from news_collector.clients import get_supabase
+            seen = SeenIndex(args.seen_index)
+            writer = ArticleWriter(get_supabase(), batch_size=args.batch_size, flush_interval=0,
+                                   on_result=seen.record_write, spool=spool)
+            try:
+                replayed, failed = spool.replay(writer)
+            finally:
+                seen.close()
+            print(f"{replayed - failed}건을 저장했고 {failed}건은 스풀에 남았습니다: {args.path}")
+            exit_code = 1 if failed else 0
+        elif args.action == "revive":
+            revived = spool.revive()
+            print(f"{revived}건을 다시 보낼 대상으로 되돌렸습니다: {args.path}")
+        for status, count in sorted(spool.counts().items()):
+            print(f"  {status}: {count}")
+    finally:
+        spool.close()
+    return exit_code
+
+
+def manage_leases(args):
+    if args.action == "schema":
+        print(SUPABASE_SCHEMA)
+        return 0
+    run_id = args.run_id or default_run_id()
+    if not run_id:
+        print("--run-id가 필요합니다")
+        return 2
+    store = open_lease_store(args.leases, args.lease_path)
+    try:
+        statuses = store.statuses(f"{run_id}:{KIND_SOURCE}:")
+    finally:
+        store.close()
+    if not statuses:
+        print(f"run {run_id}의 소스 lease가 없습니다")
+    now = datetime.now(timezone.utc)
+    for key, (owner, status, expires_at) in sorted(statuses.items()):
+        expiry = f", {(expires_at - now).total_seconds():.0f}초 후 만료" if status == "held" else ""
+        print(f"  {key.rsplit(':', 1)[1]}: {status} ({owner}{expiry})")
+    return 0
@@ -0,0 +1,44 @@
+"""모든 소스가 공유하는 Supabase 클라이언트와 HTTP 세션.
+
+가져오기(import)만으로는 .env를 읽거나 클라이언트를 만들지 않습니다. ``supabase``
+패키지는 가져오는 데만 수백 ms가 걸리므로 ``get_supabase`` 를 처음 부를 때
+가져오고, 자격 증명이 없어도 이 모듈을 가져오는 코드(``--dry-run``, 벤치마크,
+다른 명령)는 그대로 동작합니다.
+"""
+import os
+import threading
+
+from news_collector.http_client import PooledSession
+
+# 공유 세션에 붙는 User-Agent (피드와 기사 요청 모두 이 세션 헤더를 사용)
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+_lock = threading.Lock()
+_supabase = None
+_session = None
+
+
+def get_supabase():
+    """프로세스 전체에서 하나만 만들어지는 Supabase 클라이언트를 반환합니다."""
+    global _supabase
+    with _lock:
+        if _supabase is None:
+            from dotenv import load_dotenv
+            from supabase import create_client
+
+            # .env 파일에서 환경 변수 로드
+            load_dotenv()
+            url: str = os.environ.get("SUPABASE_URL")
+            key: str = os.environ.get("SUPABASE_KEY")
+            _supabase = create_client(url, key)
+        return _supabase
+
+
+def get_session() -> PooledSession:
+    """모든 소스가 같이 쓰는 커넥션 풀 기반 HTTP 세션을 반환합니다."""
+    global _session
+    with _lock:
+        if _session is None:
+            _session = PooledSession()
+            _session.headers['User-Agent'] = DEFAULT_USER_AGENT
+        return _session
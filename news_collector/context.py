@@ -0,0 +1,109 @@
+"""한 번의 실행 동안 모든 소스가 공유하는 설정과 구성요소."""
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Optional
+
+from news_collector.checkpoints import DEFAULT_CHECKPOINT_PATH, DEFAULT_OVERLAP, CheckpointStore
+from news_collector.extract import DEFAULT_MAX_ARTICLE_BYTES, ExtractionPool
+from news_collector.feeds import DEFAULT_FEED_STATE_PATH, FeedCache
+from news_collector.htmlcache import DEFAULT_HTML_CACHE_DIR, DEFAULT_MAX_BYTES, DEFAULT_TTL, HtmlCache
+from news_collector.http_client import PooledSession
+from news_collector.leases import DEFAULT_LEASE_PATH, DEFAULT_LEASE_TTL, LeaseCoordinator
+from news_collector.metrics import RunMetrics
+from news_collector.neardup import DEFAULT_NEARDUP_INDEX_PATH, NearDuplicateIndex
+from news_collector.ratelimit import DEFAULT_RATE_STATE_PATH, AdaptiveRateLimiter
+from news_collector.scheduler import FetchScheduler
+from news_collector.seen import DEFAULT_SEEN_INDEX_PATH, SeenIndex
+from news_collector.spool import DEFAULT_SPOOL_PATH
+from news_collector.writer import ArticleWriter
+
+
+@dataclass
+class RunOptions:
+    """``run_sources`` 한 번의 설정. CLI 인자와 벤치마크 설정이 이 값으로 바뀝니다."""
+    # 동시에 수집할 소스 수 (None이면 소스 개수, lease를 쓰면 DEFAULT_LEASE_SLOTS)
+    max_workers: Optional[int] = None
+    # 호스트별 동시 기사 다운로드 수와 요청 간 최소 간격(초). 적응형 속도 제한에서는 시작 속도로만 쓰입니다.
+    per_host_concurrency: int = 2
+    min_interval: float = 1.0
+    # True면 호스트별 요청 속도를 응답에 따라 조절하고 학습한 속도를 rate_state_path에 저장합니다.
+    adaptive_rate: bool = True
+    rate_state_path: str = DEFAULT_RATE_STATE_PATH
+    # 한 번의 upsert로 저장할 최대 행 수와 버퍼를 비우는 주기(초)
+    batch_size: int = 50
+    flush_interval: float = 5.0
+    # 피드 ETag/Last-Modified 상태
+    feed_state_path: str = DEFAULT_FEED_STATE_PATH
+    use_feed_cache: bool = True
+    # 로컬 링크 인덱스
+    seen_index_path: str = DEFAULT_SEEN_INDEX_PATH
+    use_seen_index: bool = True
+    # False면 lxml 빠른 경로 없이 항상 문서 전체를 html.parser로 파싱합니다.
+    fast_extract: bool = True
+    # False면 스트리밍 파서 대신 feedparser로 피드 전체를 파싱합니다. 스트리밍 파서는 최신순
+    # 피드(newest_first)에서 처리 범위보다 오래된 항목이 이어지면 나머지를 읽지 않습니다.
+    stream_feeds: bool = True
+    # 기사 페이지에서 읽을 최대 바이트 수(0이면 제한 없음)와 본문이 끝나면 읽기를 멈출지 여부
+    max_article_bytes: int = DEFAULT_MAX_ARTICLE_BYTES
+    stop_at_body_end: bool = True
+    # 파이프라인 단계 사이 큐의 최대 크기와 소스별 다운로드 작업자 수
+    queue_size: int = 32
+    fetch_workers: int = 4
+    # 0이 아니면 본문 추출을 그만큼의 프로세스에서 실행합니다. (None이면 CPU 코어 수)
+    extract_processes: Optional[int] = 0
+    # 소스마다 지난 실행에서 저장한 가장 최근 기사 이후(overlap 만큼 겹쳐서)만 처리합니다.
+    # catch_up을 주면 체크포인트와 상관없이 그만큼 거슬러 올라가 다시 확인합니다.
+    checkpoint_path: str = DEFAULT_CHECKPOINT_PATH
+    use_checkpoints: bool = True
+    overlap: timedelta = DEFAULT_OVERLAP
+    catch_up: Optional[timedelta] = None
+    # 새 기사를 MinHash LSH 색인으로 다른 소스의 기사와 비교해 유사 중복을 표시합니다.
+    neardup_index_path: str = DEFAULT_NEARDUP_INDEX_PATH
+    use_neardup: bool = True
+    # 설정하면 유사 중복 클러스터 id를 이 컬럼에 저장합니다. (예: 'cluster_id')
+    cluster_column: Optional[str] = None
+    # True면 이미 저장된 기사와 거의 같은 새 기사는 저장하지 않습니다.
+    skip_near_duplicates: bool = False
+    # 내려받은 기사 HTML을 압축해 보관하고, ttl 안에 받은 페이지는 다시 내려받지 않습니다.
+    html_cache_dir: str = DEFAULT_HTML_CACHE_DIR
+    use_html_cache: bool = True
+    html_cache_ttl: timedelta = DEFAULT_TTL
+    html_cache_max_bytes: int = DEFAULT_MAX_BYTES
+    # 저장할 행을 보내기 전에 스풀에 기록하고, 지난 실행에서 저장하지 못한 행을 먼저 다시 저장합니다.
+    spool_path: str = DEFAULT_SPOOL_PATH
+    use_spool: bool = True
+    # 'sqlite' 또는 'supabase'면 같은 run_id로 실행된 작업자들이 소스와 새 링크를 lease로 나눠 처리합니다.
+    lease_backend: Optional[str] = None
+    lease_path: str = DEFAULT_LEASE_PATH
+    run_id: Optional[str] = None
+    worker_id: Optional[str] = None
+    lease_ttl: float = DEFAULT_LEASE_TTL
+    # 실행 보고서(JSON)와 Prometheus textfile 경로 (None이면 저장하지 않음)
+    report_path: Optional[str] = None
+    prometheus_path: Optional[str] = None
+    # True면 네트워크나 Supabase에 접속하지 않고 처리할 내용만 출력합니다.
+    dry_run: bool = False
+
+
+@dataclass
+class RunContext:
+    supabase: object
+    session: PooledSession
+    scheduler: FetchScheduler
+    writer: ArticleWriter
+    feeds: FeedCache
+    seen: SeenIndex
+    checkpoints: CheckpointStore
+    neardup: NearDuplicateIndex
+    html_cache: HtmlCache
+    options: RunOptions = field(default_factory=RunOptions)
+    # 소스마다 동시에 보내는 추출 요청 수
+    extract_workers: int = 1
+    # 설정되면 본문 추출을 프로세스 풀에서 실행합니다.
+    extraction_pool: Optional[ExtractionPool] = None
+    # 설정되면 새로 내려받을 링크의 lease를 잡아 다른 작업자와 나눠 처리합니다.
+    leases: Optional[LeaseCoordinator] = None
+    # 설정되면 모든 응답을 호스트별 적응형 속도 제한에 반영합니다.
+    rate_limiter: Optional[AdaptiveRateLimiter] = None
+    # 단계별 소요 시간과 이벤트 수
+    metrics: RunMetrics = field(default_factory=RunMetrics)
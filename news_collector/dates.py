@@ -0,0 +1,110 @@
+"""피드 항목의 게시 시간을 UTC로 정규화합니다.
+
+소스마다 한 번 성공한 형식을 기억해 두었다가 다음 항목부터 그 형식을 먼저
+시도하므로, 대부분의 항목은 파서 한 번으로 끝납니다. 시도 순서는 기억한 형식,
+소스 정의의 ``date_formats`` (정의한 순서 그대로), 그다음 정의에 없는 것 중 빠른
+RFC 822/ISO 8601 파서, feedparser가 파싱한 ``published_parsed``, ``dateutil`` 입니다.
+
+저장할 때는 ``to_iso`` 로 ``2025-01-15T01:20:00+00:00`` 형태의 UTC ISO 8601
+문자열을 씁니다. 모든 값의 시간대가 같으므로 문자열 순서가 시간 순서와 같아
+``published_at`` 을 인덱스로 범위 조회할 수 있고, timestamptz로도 바로 바꿀 수 있습니다.
+"""
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+
+from news_collector.sources import DATEUTIL, FEED_PARSED, ISO8601, RFC822
+
+# 소스 정의에 없더라도 dateutil 전에 시도하는 빠른 파서
+_FAST_FORMATS = (RFC822, ISO8601)
+
+
+def _parse_rfc822(text):
+    # strptime('%z')와 달리 'GMT', 'EST' 같은 시간대 이름과 초가 없는 형식도 받습니다.
+    return parsedate_to_datetime(text)
+
+
+def _parse_iso8601(text):
+    # Python 3.11 이전의 fromisoformat은 'Z' 접미사를 받지 않습니다.
+    if text.endswith(('Z', 'z')):
+        text = text[:-1] + '+00:00'
+    return datetime.fromisoformat(text)
+
+
+def _parse_dateutil(text):
+    # 앞의 파서가 모두 실패할 때만 쓰이므로 처음 쓸 때 가져옵니다.
+    from dateutil import parser as dateutil_parser
+    return dateutil_parser.parse(text)
+
+
+class DateNormalizer:
+    """한 소스의 게시 시간 파서. 마지막으로 성공한 형식을 먼저 시도합니다.
+
+    ``naive_timezone`` 은 시간대 표기가 없는 날짜를 해석할 시간대입니다.
+    (None이면 실행 환경의 로컬 시간)
+    """
+
+    def __init__(self, date_formats=(), naive_timezone=None):
+        self.naive_timezone = naive_timezone
+        ordered = list(dict.fromkeys(date_formats))
+        ordered += [fmt for fmt in _FAST_FORMATS + (FEED_PARSED, DATEUTIL) if fmt not in ordered]
+        self.formats = tuple(ordered)
+        self.preferred = None
+
+    def _parse_with(self, date_format, entry, text):
+        if date_format == FEED_PARSED:
+            parsed = getattr(entry, 'published_parsed', None) or getattr(entry, 'updated_parsed', None)
+            # feedparser가 제공하는 UTC 시간을 직접 사용
+            return datetime(*parsed[:6], tzinfo=timezone.utc) if parsed else None
+        if not text:
+            return None
+        if date_format == RFC822:
+            parsed = _parse_rfc822(text)
+        elif date_format == ISO8601:
+            parsed = _parse_iso8601(text)
+        elif date_format == DATEUTIL:
+            parsed = _parse_dateutil(text)
+        else:
+            parsed = datetime.strptime(text, date_format)
+        if parsed.tzinfo is None:
+            if self.naive_timezone is None:
+                # astimezone()은 naive datetime을 로컬 시간으로 봅니다.
+                return parsed.astimezone(timezone.utc)
+            parsed = parsed.replace(tzinfo=self.naive_timezone)
+        return parsed.astimezone(timezone.utc)
+
+    def _try(self, date_format, entry, text):
+        try:
+            return self._parse_with(date_format, entry, text)
+        except (ValueError, TypeError, OverflowError, IndexError):
+            return None
+
+    def parse(self, entry):
+        """항목의 게시 시간을 UTC datetime으로 반환합니다. 모든 형식이 실패하면 None."""
+        text = getattr(entry, 'published', None) or getattr(entry, 'updated', None)
+        if isinstance(text, str):
+            text = text.strip()
+        preferred = self.preferred
+        if preferred is not None:
+            parsed = self._try(preferred, entry, text)
+            if parsed is not None:
+                return parsed
+        for date_format in self.formats:
+            if date_format == preferred:
+                continue
+            parsed = self._try(date_format, entry, text)
+            if parsed is not None:
+                self.preferred = date_format
+                return parsed
+        return None
+
+
+@lru_cache(maxsize=None)
+def get_date_normalizer(source):
+    """소스마다 하나의 ``DateNormalizer`` 를 반환합니다. (배운 형식이 실행 중 유지됨)"""
+    return DateNormalizer(source.date_formats, source.naive_timezone)
+
+
+def to_iso(published):
+    """UTC ISO 8601 문자열 (초 단위)."""
+    return published.astimezone(timezone.utc).isoformat(timespec='seconds')
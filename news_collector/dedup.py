@@ -0,0 +1,34 @@
+"""피드 단위의 일괄 중복 확인.
+
+기사마다 ``select ... eq('link', link)`` 를 보내는 대신, 피드에서 나온 후보
+링크를 모아 몇 개의 ``in_`` 쿼리로 한 번에 확인합니다.
+"""
+
+# PostgREST의 in_ 필터는 GET 쿼리 문자열에 들어가므로 URL 길이를 고려해 나눠서 보냅니다.
+DEDUP_CHUNK_SIZE = 50
+
+EXISTING_COLUMNS = 'link, full_content, source'
+
+
+def fetch_existing(supabase, links, columns=EXISTING_COLUMNS, chunk_size=DEDUP_CHUNK_SIZE, seen=None,
+                   repair_columns=()):
+    """이미 저장된 기사를 ``{link: row}`` 형태로 반환합니다.
+
+    ``seen`` (``SeenIndex``) 을 넘기면 조회된 행의 상태를 로컬 인덱스에도 기록합니다.
+    ``repair_columns`` 중 빈 컬럼이 있는 행은 완료로 기록하지 않습니다.
+    """
+    unique_links = list(dict.fromkeys(link for link in links if link))
+    existing = {}
+    for start in range(0, len(unique_links), chunk_size):
+        chunk = unique_links[start:start + chunk_size]
+        response = supabase.table('articles').select(columns).in_('link', chunk).execute()
+        for row in response.data:
+            existing[row['link']] = row
+    if seen is not None and 'full_content' in columns:
+        seen.mark_rows(existing.values(), repair_columns)
+    return existing
+
+
+def is_incomplete(row, required=('full_content',)):
+    """저장된 기사에 ``required`` 컬럼 중 비어 있는 값이 있으면 True."""
+    return any(not row.get(column) for column in required)
@@ -0,0 +1,316 @@
+"""``SourceDefinition`` 하나를 받아 피드 수집부터 저장까지 실행하는 공통 엔진.
+
+수집은 피드 → 필터 → 중복 확인 → 다운로드 → 본문 추출 → 유사 중복 확인 → 저장 단계로
+나뉘어 ``news_collector.pipeline`` 위에서 서로 겹쳐 실행됩니다.
+"""
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from news_collector.dates import get_date_normalizer, to_iso
+from news_collector.dedup import DEDUP_CHUNK_SIZE, fetch_existing, is_incomplete
+from news_collector.extract import get_extractor
+from news_collector.feedstream import iter_feed_entries
+from news_collector.neardup import article_text, signature
+from news_collector.pipeline import Stage, run_pipeline
+
+FEED_HEADERS = {
+    'Accept': 'application/rss+xml, application/xml, text/xml, */*',
+}
+
+# 최신순 피드에서 처리 범위보다 오래된 항목이 이만큼 이어지면 나머지는 읽지 않습니다.
+# (순서가 조금 어긋난 항목 몇 개 때문에 일찍 멈추지 않도록 여유를 둡니다)
+OLD_ENTRY_RUN = 10
+
+
+class SourceCollector:
+    """한 소스의 수집 단계를 모아 둔 객체. 각 메서드가 파이프라인의 한 단계입니다."""
+
+    def __init__(self, ctx, source):
+        self.ctx = ctx
+        self.source = source
+        self.extractor = get_extractor(source, fast=ctx.options.fast_extract)
+        self.dates = get_date_normalizer(source)
+        self.fetched_urls = []
+        self.now = datetime.now(timezone.utc)
+        self.metrics = ctx.metrics
+        # 지난 실행의 체크포인트로 정한 이번 실행의 처리 범위
+        self.window = ctx.checkpoints.begin(source.key, self.now)
+        # 이번 실행에서 처리 대상이 된 링크 -> 정규화한 게시 시간
+        self._candidate_links = {}
+        hooks = [ctx.metrics.response_hook(source.key)]
+        if ctx.rate_limiter is not None:
+            hooks.append(ctx.rate_limiter.response_hook)
+        self._response_hooks = {'response': hooks}
+
+    def stages(self):
+        ctx = self.ctx
+        return [
+            Stage("filter", self.filter_entry),
+            Stage("dedup", self.dedup, batch_size=DEDUP_CHUNK_SIZE),
+            Stage("fetch", self.download, workers=ctx.options.fetch_workers),
+            Stage("extract", self.extract, workers=ctx.extract_workers),
+            Stage("fingerprint", self.fingerprint),
+            Stage("write", self.write),
+        ]
+
+    def run(self):
+        run_pipeline(self.iter_entries(), self.stages(), queue_size=self.ctx.options.queue_size,
+                     observer=self.metrics.stage_observer(self.source.key))
+        # 모든 단계가 끝난 뒤에만 피드와 체크포인트를 처리 완료로 기록합니다.
+        # (둘 다 writer가 이 소스의 행을 모두 저장한 뒤 runner가 save 할 때 확정됩니다)
+        for feed_url in self.fetched_urls:
+            self.ctx.feeds.commit(feed_url, self.source.key)
+        self.ctx.checkpoints.finish(self.source.key)
+
+    def iter_entries(self):
+        """피드 단계: 바뀐 피드의 항목을 차례로 내보냅니다."""
+        for feed_url in self.source.feed_urls:
+            print(f"Fetching news from {feed_url}...")
+            with self._timed("feed_fetch"):
+                if self.ctx.rate_limiter is not None:
+                    content = self.ctx.rate_limiter.call(feed_url, self._fetch_feed)
+                else:
+                    content = self._fetch_feed(feed_url)
+            # 지난 실행 이후 바뀌지 않은 피드는 건너뜁니다.
+            if content is None:
+                self._count("feeds_unchanged")
+                continue
+            self.fetched_urls.append(feed_url)
+            self._count("feeds_fetched")
+            if not self.ctx.options.stream_feeds:
+                import feedparser
+                with self._timed("feed_parse"):
+                    entries = feedparser.parse(content).entries
+                self._count("entries", len(entries))
+                yield from entries
+                continue
+            yield from self._stream_entries(content)
+
+    def _fetch_feed(self, feed_url):
+        return self.ctx.feeds.fetch(self.ctx.session, feed_url, headers=FEED_HEADERS, hooks=self._response_hooks)
+
+    def _stream_entries(self, content):
+        """피드를 항목 단위로 읽어 내보냅니다. 최신순 피드는 오래된 항목이 이어지면 멈춥니다."""
+        entries = iter_feed_entries(content)
+        parse_seconds = 0.0
+        read = 0
+        old_run = 0
+        try:
+            while True:
+                # 다음 단계가 밀려 기다린 시간은 빼고 파싱에 쓴 시간만 모읍니다.
+                started = time.perf_counter()
+                entry = next(entries, None)
+                parse_seconds += time.perf_counter() - started
+                if entry is None:
+                    break
+                read += 1
+                if self.source.newest_first:
+                    with self._timed("date_parse"):
+                        published = self.dates.parse(entry)
+                    # 필터 단계가 다시 파싱하지 않도록 정규화한 값을 붙여 둡니다.
+                    entry.published_at = published
+                    old_run = old_run + 1 if published is not None and self.window.is_old(published) else 0
+                yield entry
+                if old_run >= OLD_ENTRY_RUN:
+                    print(f"Stopped reading feed after {OLD_ENTRY_RUN} consecutive old entries")
+                    self._count("feeds_stopped_early")
+                    break
+        finally:
+            entries.close()
+            self.metrics.observe(self.source.key, "feed_parse", parse_seconds)
+            self._count("entries", read)
+
+    def filter_entry(self, entry):
+        """필터 단계: 링크가 없거나, 체크포인트 범위 밖이거나, 이미 처리한 링크인 항목을 버립니다."""
+        title = getattr(entry, 'title', "No Title")
+        link = getattr(entry, 'link', None)
+        if not link:
+            print(f"Skipping entry without link: {title}")
+            self._count("skipped_no_link")
+            return None
+
+        published_time = getattr(entry, 'published_at', None)
+        if published_time is None:
+            with self._timed("date_parse"):
+                published_time = self.dates.parse(entry)
+        if published_time is None:
+            print(f"게시 시간 파싱 실패: {getattr(entry, 'published', 'No publish time')}")
+            self._count("skipped_bad_date")
+            return None
+
+        if self.window.is_old(published_time):
+            print(f"Skipping old article: {title}")
+            self._count("skipped_old")
+            return None
+        if self.window.is_known(link, published_time):
+            print(f"Already processed in a previous run: {title}")
+            self._count("skipped_checkpoint")
+            return None
+        # 여러 피드에 같은 기사가 있으면 한 번만 처리
+        if link in self._candidate_links:
+            self._count("skipped_duplicate_entry")
+            return None
+        self._candidate_links[link] = published_time
+        self.ctx.checkpoints.admit(self.source.key, link, published_time)
+        self.ctx.feeds.admit(self.source.key, link)
+        return [entry]
+
+    def dedup(self, entries):
+        """중복 확인 단계: 모인 항목을 로컬 인덱스와 한 번의 일괄 조회로 확인합니다.
+
+        ``(entry, 기존 행 또는 None)`` 을 내보냅니다.
+        """
+        # 로컬 인덱스에서 저장이 끝난 것으로 확인된 링크는 네트워크 요청 없이 건너뜁니다.
+        candidates = entries
+        entries = self.ctx.seen.drop_complete(entries, key=lambda entry: entry.link)
+        self._count("skipped_seen", len(candidates) - len(entries))
+        remaining = {entry.link for entry in entries}
+        self.ctx.checkpoints.confirm(self.source.key,
+                                     [entry.link for entry in candidates if entry.link not in remaining])
+        if entries:
+            with self._timed("dedup_query"):
+                existing = fetch_existing(self.ctx.supabase, [entry.link for entry in entries],
+                                          seen=self.ctx.seen, repair_columns=self.source.repair_columns)
+        else:
+            existing = {}
+
+        pending = []
+        for entry in entries:
+            row = existing.get(entry.link)
+            if row is None:
+                pending.append((entry, None))
+            elif self.source.repair_columns and is_incomplete(row, self.source.repair_columns):
+                print(f"Updating incomplete article: {entry.title}")
+                pending.append((entry, row))
+            else:
+                print(f"Already exists: {entry.title}")
+                self._count("skipped_existing")
+                self.ctx.checkpoints.confirm(self.source.key, [entry.link])
+        if pending and self.ctx.leases is not None:
+            # 다른 작업자가 이미 잡은 링크는 그 작업자가 내려받습니다.
+            claimed = self.ctx.leases.claim_links([entry.link for entry, _ in pending])
+            self._count("skipped_leased", len(pending) - len(claimed))
+            pending = [(entry, row) for entry, row in pending if entry.link in claimed]
+        return pending
+
+    def download(self, item):
+        """다운로드 단계: 본문이 필요한 기사만 호스트별 제한을 지키며 내려받습니다."""
+        entry, row = item
+        downloaded = None
+        if row is None or not row.get('full_content'):
+            downloaded = self.ctx.html_cache.get(entry.link)
+            if downloaded is not None:
+                self._count("html_cache_hit")
+            else:
+                downloaded = self.ctx.scheduler.submit(entry.link, self._download_article).result()
+                if downloaded is None:
+                    self._count("fetch_failed")
+                else:
+                    self.ctx.html_cache.put(entry.link, self.source.key, *downloaded)
+        return [(entry, row, downloaded)]
+
+    def _download_article(self, url):
+        # 스케줄러 대기 시간을 뺀 실제 다운로드 시간만 기록합니다.
+        with self._timed("article_fetch"):
+            downloaded = self.extractor.download(url, self.ctx.session, hooks=self._response_hooks,
+                                                 max_bytes=self.ctx.options.max_article_bytes,
+                                                 stop_early=self.ctx.options.stop_at_body_end)
+        if downloaded is not None:
+            self.metrics.add_http_bytes(self.source.key, len(downloaded[0]))
+        return downloaded
+
+    def extract(self, item):
+        """추출 단계: 내려받은 HTML에서 본문 텍스트를 뽑습니다."""
+        entry, row, downloaded = item
+        if self.ctx.extraction_pool is not None:
+            content = self.ctx.extraction_pool.extract_downloaded(self.source, downloaded, entry.link)
+        else:
+            content = self.extractor.extract_downloaded(downloaded, entry.link)
+        if downloaded is not None and content is None:
+            self._count("content_missing")
+        return [(entry, row, content)]
+
+    def fingerprint(self, item):
+        """유사 중복 확인 단계: 새 기사의 MinHash 시그니처로 다른 소스의 거의 같은 기사를 찾습니다.
+
+        ``(entry, row, content, cluster_id)`` 를 내보냅니다. (기존 기사 갱신이면 cluster_id는 None)
+        """
+        entry, row, content = item
+        if row is not None or not self.ctx.neardup.enabled:
+            return [(entry, row, content, None)]
+        title = getattr(entry, 'title', "No Title")
+        sig = signature(article_text(title, content or getattr(entry, 'summary', '')))
+        if sig is None:
+            return [(entry, row, content, None)]
+        with self._timed("neardup_lookup"):
+            cluster_id, match = self.ctx.neardup.assign(entry.link, sig, self.source.name)
+        if match is not None:
+            print(f"Near-duplicate of {match.link} ({match.similarity:.2f}): {title}")
+            self._count("near_duplicate")
+            if self.ctx.options.skip_near_duplicates:
+                self._count("skipped_near_duplicate")
+                self.ctx.neardup.skip(entry.link)
+                return None
+        return [(entry, row, content, cluster_id)]
+
+    def write(self, item):
+        """저장 단계: 새 기사는 전체 행을, 기존 기사는 비어 있던 컬럼만 writer에 넘깁니다."""
+        entry, row, content, cluster_id = item
+        source = self.source
+        title = getattr(entry, 'title', "No Title")
+        summary = getattr(entry, 'summary', "No Summary")
+        if row is None:
+            print(f"Processing: {title}")
+            print(f"Link: {entry.link}")
+            full_content = content
+            if source.summary_fallback:
+                full_content = full_content or summary
+            # Supabase 저장은 writer가 모아서 일괄 upsert 합니다.
+            new_row = {
+                "title": title,
+                "link": entry.link,
+                "published_at": to_iso(self._candidate_links[entry.link]),
+                "summary": summary,
+                "full_content": full_content,
+                "source": source.name,
+            }
+            if self.ctx.options.cluster_column and cluster_id:
+                new_row[self.ctx.options.cluster_column] = cluster_id
+            self.metrics.expect_write(entry.link, source.key, "inserted")
+            self.ctx.writer.add(new_row, label=title)
+            return None
+
+        # 비어 있던 컬럼만 기존 행에 update 합니다. (upsert로 보내면 없는 행을 새로 만들 수 있습니다)
+        update = {"link": entry.link}
+        if 'full_content' in source.repair_columns and not row.get('full_content'):
+            if content:
+                update["full_content"] = content
+            else:
+                print(f"Could not fetch content for: {title}")
+        if 'source' in source.repair_columns and not row.get('source'):
+            update["source"] = source.name
+        if len(update) > 1:
+            self.metrics.expect_write(entry.link, source.key, "updated")
+            self.ctx.writer.update(update, label=title)
+        else:
+            print(f"Nothing to update: {title}")
+            self._count("nothing_to_update")
+        return None
+
+    def _count(self, event, amount=1):
+        if amount:
+            self.metrics.count(self.source.key, event, amount)
+
+    @contextmanager
+    def _timed(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.metrics.observe(self.source.key, stage, time.perf_counter() - started)
+
+
+def collect(ctx, source):
+    """소스 하나를 수집해 ``ctx.writer`` 로 저장합니다."""
+    SourceCollector(ctx, source).run()
@@ -0,0 +1,247 @@
+"""소스 정의를 바탕으로 기사 HTML에서 본문을 추출합니다.
+
+기본 경로는 lxml(C 구현)로 문서를 파싱해 본문 선택자에 맞는 하위 트리만
+골라내고, 그 조각만 BeautifulSoup으로 다시 읽어 문단을 추출합니다.
+수백 KB의 페이지 대부분을 Python 파서로 읽지 않아도 됩니다. lxml 경로가
+본문을 찾지 못하면 기존처럼 문서 전체를 html.parser로 파싱합니다.
+
+기사 페이지는 조각 단위로 스트리밍해 받으면서 lxml 증분 파서에 넣고, 본문
+컨테이너가 닫히면 그 뒤(댓글, 많이 본 뉴스, 푸터 등)는 읽지 않습니다. 어느 선택자가
+본문인지는 소스마다 마지막으로 끝까지 받은 페이지에서 기억해 둡니다. 본문이 끝나기
+전에 ``max_bytes`` 를 넘는 페이지는 실패로 처리합니다.
+
+lxml, BeautifulSoup, soupsieve는 가져오는 데 오래 걸리므로 추출기를 처음 만들거나
+쓸 때 가져옵니다. (명령행 시작과 추출 작업자 프로세스 시작이 빨라집니다)
+"""
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from news_collector.sources import SOURCES
+from news_collector.textfilter import ParagraphFilter
+
+# 기사 페이지 하나에서 읽을 최대 바이트 수 (압축을 푼 크기, 0이면 제한 없음)
+DEFAULT_MAX_ARTICLE_BYTES = 4 * 1024 * 1024
+STREAM_CHUNK_SIZE = 16 * 1024
+# 본문이 끝난 뒤 남은 응답이 이보다 작으면 끝까지 읽어 연결을 재사용하고, 크면 연결을 닫습니다.
+DRAIN_LIMIT = 64 * 1024
+
+
+class Extractor:
+    """한 소스의 선택자와 필터를 미리 컴파일해 두고 재사용하는 본문 추출기."""
+
+    def __init__(self, source, fast=True):
+        import soupsieve
+        from lxml import etree
+        from lxml.cssselect import CSSSelector, LxmlHTMLTranslator
+
+        self.source = source
+        self.fast = fast
+        self.selectors = tuple(soupsieve.compile(css) for css in source.selectors)
+        self.lxml_selectors = tuple(CSSSelector(css) for css in source.selectors)
+        self.paragraph_filter = ParagraphFilter.for_source(source)
+        # 닫힌 요소가 각 선택자에 맞는지 확인하는 XPath와, 증분 파서가 알려 줄 태그 이름
+        translator = LxmlHTMLTranslator()
+        self.body_ends = tuple(etree.XPath(translator.css_to_xpath(css, prefix='self::'))
+                               for css in source.selectors)
+        tags = [re.match(r'[a-zA-Z][\w-]*', css.split()[-1]) for css in source.selectors]
+        self.body_end_tags = tuple({tag.group(0).lower() for tag in tags}) if all(tags) else None
+        # 본문으로 쓰이는 선택자의 위치. 처음에는 첫 번째 선택자를 가정하고, 끝까지 받은
+        # 페이지에서 더 뒤의 선택자만 맞으면 그 위치를 기억합니다. (사이트 개편 대비)
+        # 같은 소스의 기사를 여러 스레드가 받으므로 _body_lock 안에서 읽고 씁니다.
+        self.body_index = 0
+        self._body_lock = threading.Lock()
+
+    def find_container(self, soup):
+        for selector in self.selectors:
+            container = selector.select_one(soup)
+            if container is not None:
+                return container
+        return None
+
+    def find_container_fast(self, html, encoding=None):
+        """lxml로 본문 컨테이너를 찾아 그 하위 트리만 BeautifulSoup으로 파싱합니다."""
+        import lxml.html
+        from bs4 import BeautifulSoup
+        from bs4.dammit import UnicodeDammit
+        from lxml import etree
+
+        if isinstance(html, bytes):
+            # BeautifulSoup과 같은 방식으로 인코딩을 판단해 두 경로의 결과가 같도록 합니다.
+            html = UnicodeDammit(html, [encoding] if encoding else [], is_html=True).unicode_markup
+            if html is None:
+                return None
+        try:
+            tree = lxml.html.document_fromstring(html)
+        except (ValueError, etree.ParserError):
+            return None
+        for selector in self.lxml_selectors:
+            matches = selector(tree)
+            if matches:
+                fragment = lxml.html.tostring(matches[0], encoding='unicode', with_tail=False)
+                return BeautifulSoup(fragment, 'html.parser')
+        return None
+
+    def extract(self, html, url, encoding=None):
+        """본문 텍스트를 반환하고, 본문을 찾지 못했거나 비어 있으면 None을 반환합니다."""
+        container = self.find_container_fast(html, encoding) if self.fast else None
+        if container is None:
+            from bs4 import BeautifulSoup
+
+            # 빠른 경로가 아무것도 찾지 못했을 때만 문서 전체를 파싱합니다.
+            soup = BeautifulSoup(html, 'html.parser', from_encoding=encoding if isinstance(html, bytes) else None)
+            container = self.find_container(soup)
+        if container is None:
+            print(f"Warning: Could not find article content for {url}")
+            return None
+
+        strip = self.source.strip_text_nodes
+        paragraphs = (
+            p.get_text(strip=True) if strip else p.get_text().strip()
+            for p in container.find_all('p')
+        )
+        return self.source.paragraph_separator.join(self.paragraph_filter.filter(paragraphs)) or None
+
+    def download(self, url, session, hooks=None, max_bytes=DEFAULT_MAX_ARTICLE_BYTES, stop_early=True):
+        """기사 페이지를 내려받아 ``(bytes, 선언된 인코딩, 잘림 여부)`` 를 반환합니다. 실패하면 None.
+
+        ``stop_early`` 면 본문 컨테이너가 닫히는 즉시 읽기를 멈추므로 반환되는 bytes는
+        문서의 앞부분일 수 있고, 그때 잘림 여부가 True입니다. (파서들은 닫히지 않은 태그를
+        그대로 복구합니다)
+        """
+        import requests
+
+        try:
+            with session.get(url, hooks=hooks, stream=True) as response:
+                response.raise_for_status()
+                read = self._read_body(response, url, max_bytes, stop_early)
+                if read is None:
+                    return None
+                body, truncated = read
+                return body, declared_encoding(response), truncated
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching article content from {url}: {e}")
+            return None
+
+    def _read_body(self, response, url, max_bytes, stop_early):
+        from lxml import etree
+
+        parser = etree.HTMLPullParser(events=('end',), tag=self.body_end_tags) if stop_early else None
+        with self._body_lock:
+            body_index = self.body_index
+        # 이 페이지에서 닫힌 것을 본 가장 앞선 선택자의 위치
+        matched = len(self.body_ends)
+        chunks = []
+        size = 0
+        stream = response.iter_content(STREAM_CHUNK_SIZE)
+        for chunk in stream:
+            chunks.append(chunk)
+            size += len(chunk)
+            if parser is not None:
+                parser.feed(chunk)
+                matched = min(matched, self._closed_body_index(parser))
+                if matched <= body_index:
+                    _drain(response, stream)
+                    return b''.join(chunks), True
+            if max_bytes and size > max_bytes:
+                print(f"Warning: Article page exceeded {max_bytes} bytes before its body ended: {url}")
+                return None
+        if matched < len(self.body_ends):
+            with self._body_lock:
+                self.body_index = matched
+        return b''.join(chunks), False
+
+    def _closed_body_index(self, parser):
+        """증분 파서가 새로 닫은 요소 중 본문 선택자에 맞는 가장 앞선 선택자의 위치."""
+        best = len(self.body_ends)
+        for _, element in parser.read_events():
+            for index, body_end in enumerate(self.body_ends[:best]):
+                if body_end(element):
+                    best = index
+                    break
+        return best
+
+    def extract_downloaded(self, downloaded, url):
+        """``download`` 결과(또는 ``(bytes, 인코딩)``)에서 본문을 추출합니다. 실패하면 None."""
+        if downloaded is None:
+            return None
+        html, encoding = downloaded[:2]
+        try:
+            return self.extract(html, url, encoding=encoding)
+        except Exception as e:
+            print(f"An unexpected error occurred while parsing {url}: {e}")
+            return None
+
+
+@lru_cache(maxsize=None)
+def get_extractor(source, fast=True):
+    """소스마다 한 번만 컴파일된 ``Extractor`` 를 반환합니다."""
+    return Extractor(source, fast=fast)
+
+
+def _drain(response, stream):
+    """남은 응답이 작으면 끝까지 읽어 연결을 풀에 돌려보냅니다. 크면 연결을 닫게 둡니다."""
+    length = response.headers.get('Content-Length', '')
+    if not length.isdigit():
+        return
+    # Content-Length는 전송 크기(압축된 크기)이므로 원본 스트림에서 읽은 바이트와 비교합니다.
+    if int(length) - response.raw.tell() <= DRAIN_LIMIT:
+        for _ in stream:
+            pass
+
+
+def declared_encoding(response):
+    """Content-Type 헤더에 charset이 있을 때만 그 값을, 없으면 None(문서 내 meta로 판단)."""
+    if 'charset' in response.headers.get('Content-Type', '').lower():
+        return response.encoding
+    return None
+
+
+# 추출 작업자 프로세스 안에서만 쓰이는 Extractor 캐시
+_worker_extractors = {}
+_worker_fast = True
+
+
+def _init_worker(fast):
+    global _worker_fast
+    _worker_fast = fast
+    # 선택자와 필터를 작업자 시작 시 한 번만 컴파일해 둡니다.
+    for source in SOURCES.values():
+        _worker_extractors[source] = Extractor(source, fast=fast)
+
+
+def _extract_in_worker(source, downloaded, url):
+    extractor = _worker_extractors.get(source)
+    if extractor is None:
+        # 등록되지 않은 정의(예: 벤치마크용으로 URL만 바꾼 정의)는 처음 쓸 때 컴파일합니다.
+        extractor = _worker_extractors[source] = Extractor(source, fast=_worker_fast)
+    return extractor.extract_downloaded(downloaded, url)
+
+
+class ExtractionPool:
+    """HTML 파싱을 별도 프로세스들에서 실행해 GIL 경합을 피합니다.
+
+    작업자에게는 내려받은 bytes를 넘기고 최종 본문 텍스트만 돌려받습니다.
+    수천 건을 다시 처리하는 백필에서 효과가 큽니다.
+    """
+
+    def __init__(self, processes=None, fast=True):
+        self.processes = processes or os.cpu_count() or 1
+        # 스레드가 여럿 도는 프로세스에서 fork하지 않도록 spawn을 사용합니다.
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(fast,),
+        )
+
+    def extract_downloaded(self, source, downloaded, url):
+        if downloaded is None:
+            return None
+        return self._pool.submit(_extract_in_worker, source, downloaded, url).result()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
@@ -0,0 +1,117 @@
+"""ETag / Last-Modified 기반의 조건부 피드 요청과 디스크 상태 저장.
+
+피드 URL마다 마지막으로 처리한 응답의 ETag, Last-Modified, 내용 해시를
+저장해 두고, 다음 실행에서 조건부 GET을 보냅니다. 304 응답이거나 내용
+해시가 같으면 ``None`` 을 반환해 해당 피드의 파싱/처리를 건너뛰게 합니다.
+"""
+import hashlib
+import json
+import os
+import threading
+
+DEFAULT_FEED_STATE_PATH = os.path.join('.cache', 'feed_state.json')
+
+
+class FeedCache:
+    """피드 URL별 조건부 요청 상태.
+
+    상태는 ``commit(url, source_key)`` 로 피드를 끝까지 처리했음을 알리고, writer가 모든
+    행을 저장한 뒤 ``save`` 할 때 확정됩니다. 그 소스의 행 중 하나라도 저장에 실패했으면
+    (``record_write``) 확정하지 않습니다. 피드를 받아 놓고 처리나 저장에 실패한 경우 다음
+    실행이 304를 받지 않고 같은 내용을 다시 처리할 수 있도록 하기 위함입니다.
+    """
+
+    def __init__(self, path=DEFAULT_FEED_STATE_PATH, enabled=True):
+        self.path = path
+        self.enabled = enabled
+        self._state = {}
+        self._pending = {}
+        # 끝까지 처리한 피드 URL -> 소스 key
+        self._committed = {}
+        # 처리 대상이 된 링크 -> 소스 key, 저장에 실패한 행이 있는 소스 key
+        self._links = {}
+        self._failed_sources = set()
+        self._lock = threading.Lock()
+        if enabled and path and os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self._state = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"피드 상태 파일을 읽지 못해 무시합니다 ({path}): {e}")
+
+    def fetch(self, session, url, headers=None, timeout=None, hooks=None):
+        """피드 내용을 bytes로 반환하고, 지난 실행 이후 바뀌지 않았으면 None을 반환합니다.
+
+        ``hooks`` 는 그대로 ``requests`` 에 전달됩니다. (응답 측정용)
+        """
+        request_headers = dict(headers or {})
+        with self._lock:
+            previous = dict(self._state.get(url, {})) if self.enabled else {}
+        if previous.get('etag'):
+            request_headers['If-None-Match'] = previous['etag']
+        if previous.get('last_modified'):
+            request_headers['If-Modified-Since'] = previous['last_modified']
+
+        response = session.get(url, headers=request_headers, timeout=timeout, hooks=hooks)
+        if response.status_code == 304:
+            print(f"Feed not modified (304): {url}")
+            return None
+        response.raise_for_status()
+
+        content = response.content
+        digest = hashlib.sha256(content).hexdigest()
+        if self.enabled and previous.get('sha256') == digest:
+            print(f"Feed content unchanged: {url}")
+            return None
+
+        with self._lock:
+            self._pending[url] = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'sha256': digest,
+            }
+        return content
+
+    def validators(self, url):
+        """``url`` 에 대해 저장된 상태(etag, last_modified, sha256). 없으면 빈 dict."""
+        with self._lock:
+            return dict(self._state.get(url, {})) if self.enabled else {}
+
+    def admit(self, source_key, link):
+        """``source_key`` 의 피드에서 나온 링크를 기록합니다. 저장 결과는 ``record_write`` 로 받습니다."""
+        with self._lock:
+            self._links[link] = source_key
+
+    def record_write(self, row, result):
+        """``ArticleWriter`` 의 on_result 콜백으로 쓰입니다. 저장에 실패한 행의 소스를 기억합니다."""
+        if result.ok:
+            return
+        with self._lock:
+            source_key = self._links.get(row['link'])
+            if source_key is not None:
+                self._failed_sources.add(source_key)
+
+    def commit(self, url, source_key=None):
+        """``fetch`` 로 받은 피드를 끝까지 처리했음을 기록합니다. ``save`` 때 확정됩니다."""
+        with self._lock:
+            if url in self._pending:
+                self._committed[url] = source_key
+
+    def save(self):
+        """저장에 실패한 행이 없는 소스의 처리한 피드 상태를 확정해 파일에 씁니다."""
+        with self._lock:
+            for url, source_key in list(self._committed.items()):
+                if source_key not in self._failed_sources:
+                    self._state[url] = self._pending.pop(url)
+                    del self._committed[url]
+        if not (self.enabled and self.path):
+            return
+        with self._lock:
+            state = dict(self._state)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,246 @@
+"""내려받은 기사 HTML의 로컬 압축 캐시.
+
+사이트 마크업이 바뀌어(예: VentureBeat의 2025년 1월 ``article-body`` 전환)
+추출기를 고치면, 이미 저장한 기사를 다시 추출하기 위해 모든 페이지를 다시
+내려받아야 했습니다. 이 캐시는 내려받은 페이지를 내용의 SHA-256으로 이름 붙인
+zstd 압축 파일로 저장하고(같은 내용은 한 번만 저장), URL -> 해시 색인을
+SQLite에 둡니다. ``reextract`` 는 여기서 디스크 속도로 다시 추출하고,
+일반 실행은 ``ttl`` 안에 받은 페이지를 다시 내려받지 않습니다.
+
+본문이 끝난 뒤를 읽지 않은(``truncated``) 페이지는 문서의 앞부분이므로 그렇게 표시해
+둡니다. 같은 선택자로 수집할 때는 그대로 쓰지만, ``reextract`` 는 선택자가 바뀌었을 수
+있으므로 끝까지 다시 내려받은 뒤 추출합니다.
+
+전체 크기가 ``max_bytes`` 를 넘으면 가장 오래 쓰이지 않은 URL부터 지우고,
+더 이상 참조되지 않는 압축 파일을 삭제합니다.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+import zstandard
+
+DEFAULT_HTML_CACHE_DIR = os.path.join('.cache', 'html')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# 일반 실행에서 이 시간 안에 받은 페이지는 다시 내려받지 않습니다.
+DEFAULT_TTL = timedelta(hours=24)
+ZSTD_LEVEL = 3
+# 한도를 넘으면 한도의 이 비율까지 줄여 매번 정리하지 않도록 합니다.
+EVICT_TARGET = 0.9
+
+CachedPage = namedtuple('CachedPage', ['url', 'source', 'digest', 'encoding', 'fetched_at', 'truncated'])
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+class HtmlCache:
+    """URL별 최신 HTML을 내용 해시로 저장하는 스레드 안전한 캐시."""
+
+    def __init__(self, directory=DEFAULT_HTML_CACHE_DIR, enabled=True, max_bytes=DEFAULT_MAX_BYTES,
+                 ttl=DEFAULT_TTL):
+        self.directory = directory
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # zstd 압축/해제 객체는 스레드 간에 공유할 수 없어 스레드마다 만듭니다.
+        self._local = threading.local()
+        self._conn = None
+        self._total = 0
+        if enabled and directory:
+            os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(os.path.join(directory, 'index.sqlite3'), check_same_thread=False)
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS pages ('
+                ' url TEXT PRIMARY KEY,'
+                ' source TEXT,'
+                ' digest TEXT NOT NULL,'
+                ' encoding TEXT,'
+                ' fetched_at TEXT NOT NULL,'
+                ' accessed_at TEXT NOT NULL,'
+                ' truncated INTEGER NOT NULL DEFAULT 0)'
+            )
+            columns = {row[1] for row in self._conn.execute('PRAGMA table_info(pages)')}
+            if 'truncated' not in columns:
+                # 이 열이 생기기 전에 저장된 페이지는 끝까지 받았는지 알 수 없으므로 잘린 것으로 봅니다.
+                self._conn.execute('ALTER TABLE pages ADD COLUMN truncated INTEGER NOT NULL DEFAULT 1')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed_at)')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS pages_digest ON pages (digest)')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS blobs ('
+                ' digest TEXT PRIMARY KEY,'
+                ' size INTEGER NOT NULL,'
+                ' raw_size INTEGER NOT NULL)'
+            )
+            self._conn.commit()
+            self._total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM blobs').fetchone()[0]
+
+    def _blob_path(self, digest):
+        return os.path.join(self.directory, digest[:2], f"{digest}.zst")
+
+    def _compressor(self):
+        if not hasattr(self._local, 'compressor'):
+            self._local.compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+            self._local.decompressor = zstandard.ZstdDecompressor()
+        return self._local.compressor
+
+    def load(self, digest):
+        """해시에 해당하는 원본 HTML bytes. 파일이 없으면 None."""
+        self._compressor()
+        try:
+            with open(self._blob_path(digest), 'rb') as f:
+                return self._local.decompressor.decompress(f.read())
+        except (OSError, zstandard.ZstdError):
+            return None
+
+    def get(self, url, ttl=None):
+        """``ttl`` (기본값: ``self.ttl``) 안에 받은 ``url`` 의 ``(bytes, 인코딩, 잘림 여부)`` 를 반환합니다.
+
+        없으면 None.
+        """
+        if self._conn is None:
+            return None
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            found = self._conn.execute('SELECT digest, encoding, fetched_at, truncated FROM pages WHERE url = ?',
+                                       (url,)).fetchone()
+        if found is None:
+            return None
+        digest, encoding, fetched_at, truncated = found
+        if ttl is not None and datetime.fromisoformat(fetched_at) < datetime.now(timezone.utc) - ttl:
+            return None
+        html = self.load(digest)
+        if html is None:
+            return None
+        with self._lock:
+            self._conn.execute('UPDATE pages SET accessed_at = ? WHERE url = ?', (_now(), url))
+        return html, encoding, bool(truncated)
+
+    def put(self, url, source, html, encoding=None, truncated=False):
+        """내려받은 페이지를 저장합니다. 같은 내용이 이미 있으면 색인만 갱신합니다.
+
+        ``truncated`` 면 본문이 끝난 뒤를 읽지 않은 문서의 앞부분입니다.
+        """
+        if self._conn is None or not html:
+            return
+        digest = hashlib.sha256(html).hexdigest()
+        with self._lock:
+            exists = self._conn.execute('SELECT 1 FROM blobs WHERE digest = ?', (digest,)).fetchone()
+        if not exists:
+            compressed = self._compressor().compress(html)
+            path = self._blob_path(digest)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(compressed)
+            os.replace(tmp_path, path)
+        now = _now()
+        with self._lock:
+            if not exists and self._conn.execute(
+                    'INSERT OR IGNORE INTO blobs (digest, size, raw_size) VALUES (?, ?, ?)',
+                    (digest, len(compressed), len(html))).rowcount:
+                self._total += len(compressed)
+            self._conn.execute(
+                'INSERT OR REPLACE INTO pages (url, source, digest, encoding, fetched_at, accessed_at, truncated) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)', (url, source, digest, encoding, now, now, int(bool(truncated))))
+            over = self._total > self.max_bytes
+        if over:
+            self.evict()
+
+    def pages(self, source=None, since=None):
+        """저장된 페이지 목록. ``source`` (소스 key)와 ``since`` (datetime)로 거를 수 있습니다."""
+        if self._conn is None:
+            return []
+        query = 'SELECT url, source, digest, encoding, fetched_at, truncated FROM pages WHERE 1 = 1'
+        params = []
+        if source is not None:
+            query += ' AND source = ?'
+            params.append(source)
+        if since is not None:
+            query += ' AND fetched_at >= ?'
+            params.append(since.isoformat())
+        with self._lock:
+            return [CachedPage(*row[:5], bool(row[5]))
+                    for row in self._conn.execute(query + ' ORDER BY url', params)]
+
+    def _drop_unreferenced(self, digests):
+        removed = 0
+        for digest in digests:
+            if self._conn.execute('SELECT 1 FROM pages WHERE digest = ? LIMIT 1', (digest,)).fetchone():
+                continue
+            found = self._conn.execute('SELECT size FROM blobs WHERE digest = ?', (digest,)).fetchone()
+            self._conn.execute('DELETE FROM blobs WHERE digest = ?', (digest,))
+            if found:
+                self._total -= found[0]
+            try:
+                os.remove(self._blob_path(digest))
+            except FileNotFoundError:
+                pass
+            removed += 1
+        return removed
+
+    def evict(self, max_bytes=None):
+        """전체 크기가 한도 아래로 내려갈 때까지 오래 쓰이지 않은 URL을 지웁니다. 지운 URL 수를 반환합니다."""
+        if self._conn is None:
+            return 0
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        target = max_bytes * EVICT_TARGET
+        evicted = 0
+        with self._lock:
+            if self._total > target:
+                rows = self._conn.execute('SELECT url, digest FROM pages ORDER BY accessed_at').fetchall()
+                for url, digest in rows:
+                    if self._total <= target:
+                        break
+                    self._conn.execute('DELETE FROM pages WHERE url = ?', (url,))
+                    self._drop_unreferenced([digest])
+                    evicted += 1
+            self._conn.commit()
+        return evicted
+
+    def compact(self):
+        """한도를 넘는 항목과 색인에 없는 압축 파일(중단된 실행의 잔여물)을 지웁니다.
+
+        ``(지운 URL 수, 지운 파일 수)`` 를 반환합니다.
+        """
+        if self._conn is None:
+            return 0, 0
+        evicted = self.evict()
+        removed = 0
+        with self._lock:
+            known = {digest for digest, in self._conn.execute('SELECT digest FROM blobs')}
+            removed += self._drop_unreferenced(list(known))
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    digest, ext = os.path.splitext(name)
+                    if ext in ('.zst', '.tmp') and digest not in known:
+                        os.remove(os.path.join(root, name))
+                        removed += 1
+            self._conn.commit()
+        return evicted, removed
+
+    def stats(self):
+        if self._conn is None:
+            return {}
+        with self._lock:
+            pages = self._conn.execute('SELECT COUNT(*) FROM pages').fetchone()[0]
+            blobs, raw_size = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(raw_size), 0) FROM blobs').fetchone()
+        return {'pages': pages, 'blobs': blobs, 'bytes': self._total, 'raw_bytes': raw_size}
+
+    def save(self):
+        if self._conn is not None:
+            with self._lock:
+                self._conn.commit()
+
+    def close(self):
+        self.save()
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
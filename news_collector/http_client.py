@@ -0,0 +1,117 @@
+"""피드와 기사 다운로드가 함께 쓰는 커넥션 풀 기반 HTTP 클라이언트.
+
+호스트별 커넥션 풀과 keep-alive로 TCP/TLS 연결을 재사용하고, gzip/brotli
+압축 응답을 받으며, 모든 요청에 기본 타임아웃을 적용합니다. 5xx 응답과
+연결 끊김은 지터가 들어간 지수 백오프로 재시도합니다.
+
+호스트별 속도 제한기(``AdaptiveRateLimiter``)를 쓰면 ``defer_throttling`` 으로
+429/503 재시도와 Retry-After 대기를 제한기에 넘깁니다. urllib3가 안에서 재시도하면
+제한기는 마지막 응답만 보게 되기 때문입니다.
+"""
+import random
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
+
+# (연결, 읽기) 타임아웃(초)
+DEFAULT_TIMEOUT = (5, 20)
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (500, 502, 503, 504)
+# 속도 제한기가 직접 처리하는 상태 코드 (서버가 요청을 늦춰 달라는 응답)
+THROTTLING_STATUSES = (429, 503)
+
+# 호스트 수보다 넉넉하게 잡아 풀이 밀려나 통계가 사라지지 않도록 합니다.
+DEFAULT_POOL_CONNECTIONS = 32
+DEFAULT_POOL_MAXSIZE = 8
+
+
+class JitteredRetry(Retry):
+    """백오프 시간의 절반을 무작위로 흔들어 여러 요청이 동시에 재시도하지 않게 합니다."""
+
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        if backoff <= 0:
+            return 0
+        return backoff / 2 + random.uniform(0, backoff / 2)
+
+
+class PooledSession(requests.Session):
+    """기본 타임아웃과 연결 재사용 통계를 제공하는 ``requests.Session``."""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES,
+                 backoff_factor=DEFAULT_BACKOFF_FACTOR,
+                 pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE):
+        super().__init__()
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        retry = self._build_retry(RETRY_STATUSES, respect_retry_after=True)
+        self._adapters = []
+        for prefix in ('https://', 'http://'):
+            adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_connections,
+                                  pool_maxsize=pool_maxsize)
+            self.mount(prefix, adapter)
+            self._adapters.append(adapter)
+        # brotli 패키지가 설치되어 있으면 'br' 도 함께 요청합니다.
+        self.headers.update(make_headers(accept_encoding=True, keep_alive=True))
+
+    def _build_retry(self, statuses, respect_retry_after):
+        return JitteredRetry(
+            total=self.retries,
+            connect=self.retries,
+            read=self.retries,
+            status=self.retries,
+            status_forcelist=statuses,
+            allowed_methods=frozenset({'GET', 'HEAD'}),
+            backoff_factor=self.backoff_factor,
+            respect_retry_after_header=respect_retry_after,
+            # 재시도가 끝나면 마지막 응답을 그대로 돌려주고, 판단은 raise_for_status()에 맡깁니다.
+            raise_on_status=False,
+        )
+
+    def defer_throttling(self):
+        """429/503 응답을 재시도하지 않고 Retry-After도 기다리지 않은 채 바로 돌려줍니다.
+
+        연결 끊김과 그 밖의 5xx는 계속 재시도합니다. 대기와 재시도는 속도 제한기가 정합니다.
+        """
+        statuses = tuple(status for status in RETRY_STATUSES if status not in THROTTLING_STATUSES)
+        retry = self._build_retry(statuses, respect_retry_after=False)
+        for adapter in self._adapters:
+            # 어댑터를 새로 마운트하지 않으므로 커넥션 풀과 통계는 그대로 남습니다.
+            adapter.max_retries = retry
+
+    def request(self, method, url, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().request(method, url, **kwargs)
+
+    def connection_stats(self):
+        """호스트별 ``{'requests', 'new_connections', 'reused'}`` 통계를 반환합니다."""
+        stats = {}
+        for adapter in self._adapters:
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                host = stats.setdefault(pool.host, {'requests': 0, 'new_connections': 0})
+                host['requests'] += pool.num_requests
+                host['new_connections'] += pool.num_connections
+        for host in stats.values():
+            host['reused'] = max(host['requests'] - host['new_connections'], 0)
+        return stats
+
+
+def format_connection_stats(stats):
+    """실행 요약에 출력할 연결 재사용 통계 문자열."""
+    total_requests = sum(host['requests'] for host in stats.values())
+    total_new = sum(host['new_connections'] for host in stats.values())
+    lines = [f"HTTP 요청 {total_requests}회, 새 연결 {total_new}개, "
+             f"재사용 {max(total_requests - total_new, 0)}회"]
+    for name, host in sorted(stats.items()):
+        lines.append(f"  {name}: 요청 {host['requests']}회, 새 연결 {host['new_connections']}개, "
+                     f"재사용 {host['reused']}회")
+    return '\n'.join(lines)
@@ -0,0 +1,381 @@
+"""여러 작업자가 소스와 링크를 나눠 수집하기 위한 lease 테이블.
+
+GitHub Actions matrix 작업이나 로컬 프로세스 여러 개가 같은 ``run_id`` 로
+실행되면, 각 작업자는 소스(``<run_id>:source:<key>``)를 lease로 잡은 것만
+수집하고 끝나면 완료로 표시합니다. 새로 내려받을 링크도 중복 확인 단계에서
+한 번에 lease(``<run_id>:link:<url>``)를 잡으므로 두 작업자가 같은 기사를
+내려받지 않고, 저장한 링크는 완료로 표시해 다른 작업자가 다시 잡지 않습니다.
+작업자는 ``ttl`` 의 1/3마다 자신의 lease를 모두 연장하고, 작업자가 죽으면
+lease가 만료되어 다른 작업자가 그 소스를 이어받습니다.
+
+lease 저장소는 로컬 테스트용 SQLite(``SqliteLeaseStore``, 한 컴퓨터의 여러
+프로세스)와 여러 러너가 함께 쓰는 Supabase/Postgres(``SupabaseLeaseStore``)
+두 가지입니다. Supabase에서는 ``SUPABASE_SCHEMA`` 의 테이블과 함수를 먼저
+만들어야 합니다. (``python -m news_collector leases schema`` 로 출력)
+"""
+import os
+import socket
+import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+
+DEFAULT_LEASE_PATH = os.path.join('.cache', 'leases.sqlite3')
+DEFAULT_LEASE_TTL = 300.0
+LEASE_TABLE = 'collector_leases'
+
+STATUS_HELD = 'held'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+KIND_SOURCE = 'source'
+KIND_LINK = 'link'
+
+# 이보다 오래 갱신되지 않은 lease(지난 실행들의 것)는 시작할 때 지웁니다.
+PRUNE_AFTER = timedelta(days=7)
+# 한 작업자가 동시에 처리하는 소스 수의 기본값
+DEFAULT_LEASE_SLOTS = 2
+# 다른 작업자가 잡은 소스가 끝나거나 만료되기를 기다릴 때 확인 간격(초)의 상한
+MAX_POLL_INTERVAL = 15.0
+
+# SQLite의 바인딩 변수 제한, PostgREST URL 길이보다 충분히 작게
+_CHUNK_SIZE = 100
+
+SUPABASE_SCHEMA = f"""\
+create table if not exists {LEASE_TABLE} (
+  key text primary key,
+  owner text not null,
+  status text not null default '{STATUS_HELD}',
+  expires_at timestamptz not null,
+  updated_at timestamptz not null default now()
+);
+
+-- 비어 있거나, 만료되었거나, 이미 같은 작업자가 가진 lease만 잡고 잡은 key를 돌려줍니다.
+create or replace function claim_leases(keys text[], worker text, ttl_seconds double precision)
+returns table (key text) language sql as $$
+  insert into {LEASE_TABLE} as l (key, owner, status, expires_at, updated_at)
+  select k, worker, '{STATUS_HELD}', now() + make_interval(secs => ttl_seconds), now()
+  from unnest(keys) as k
+  on conflict on constraint {LEASE_TABLE}_pkey do update
+    set owner = excluded.owner, expires_at = excluded.expires_at, updated_at = now()
+    where l.status = '{STATUS_HELD}' and (l.expires_at < now() or l.owner = excluded.owner)
+  returning l.key;
+$$;
+
+-- 작업자가 아직 가진 lease를 모두 연장하고 그 key를 돌려줍니다.
+create or replace function renew_leases(worker text, ttl_seconds double precision)
+returns table (key text) language sql as $$
+  update {LEASE_TABLE} as l
+    set expires_at = now() + make_interval(secs => ttl_seconds), updated_at = now()
+    where l.owner = worker and l.status = '{STATUS_HELD}' and l.expires_at >= now()
+  returning l.key;
+$$;
+"""
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def default_run_id():
+    """GitHub Actions에서는 실행 id와 재시도 번호로 만든 run id, 그 밖에는 None."""
+    run_id = os.environ.get('GITHUB_RUN_ID')
+    if not run_id:
+        return None
+    return f"{run_id}-{os.environ.get('GITHUB_RUN_ATTEMPT', '1')}"
+
+
+def _chunks(items):
+    items = list(items)
+    for start in range(0, len(items), _CHUNK_SIZE):
+        yield items[start:start + _CHUNK_SIZE]
+
+
+class SqliteLeaseStore:
+    """한 컴퓨터의 여러 프로세스가 공유하는 SQLite lease 저장소. 시각은 epoch 초로 저장합니다."""
+
+    def __init__(self, path=DEFAULT_LEASE_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # 트랜잭션을 직접 시작(BEGIN IMMEDIATE)해 다른 프로세스와의 경쟁을 막습니다.
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS leases ('
+            ' key TEXT PRIMARY KEY,'
+            ' owner TEXT NOT NULL,'
+            ' status TEXT NOT NULL,'
+            ' expires_at REAL NOT NULL,'
+            ' updated_at REAL NOT NULL)'
+        )
+
+    def _transaction(self, fn):
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                result = fn(time.time())
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            self._conn.execute('COMMIT')
+            return result
+
+    def claim(self, keys, owner, ttl):
+        """잡은 key 목록을 반환합니다."""
+        def claim(now):
+            claimed = []
+            for key in keys:
+                cursor = self._conn.execute(
+                    'INSERT INTO leases (key, owner, status, expires_at, updated_at) VALUES (?, ?, ?, ?, ?) '
+                    'ON CONFLICT(key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at, '
+                    'updated_at = excluded.updated_at '
+                    'WHERE leases.status = ? AND (leases.expires_at < ? OR leases.owner = excluded.owner)',
+                    (key, owner, STATUS_HELD, now + ttl, now, STATUS_HELD, now))
+                if cursor.rowcount:
+                    claimed.append(key)
+            return claimed
+        return self._transaction(claim)
+
+    def renew(self, owner, ttl):
+        """``owner`` 가 아직 가진 lease를 모두 연장하고 그 key 집합을 반환합니다."""
+        def renew(now):
+            self._conn.execute(
+                'UPDATE leases SET expires_at = ?, updated_at = ? '
+                'WHERE owner = ? AND status = ? AND expires_at >= ?',
+                (now + ttl, now, owner, STATUS_HELD, now))
+            return {key for key, in self._conn.execute(
+                'SELECT key FROM leases WHERE owner = ? AND status = ? AND expires_at >= ?',
+                (owner, STATUS_HELD, now))}
+        return self._transaction(renew)
+
+    def finish(self, keys, owner, status):
+        def finish(now):
+            for chunk in _chunks(keys):
+                placeholders = ','.join('?' * len(chunk))
+                self._conn.execute(
+                    f'UPDATE leases SET status = ?, updated_at = ? WHERE owner = ? AND key IN ({placeholders})',
+                    (status, now, owner, *chunk))
+        self._transaction(finish)
+
+    def release(self, keys, owner):
+        """완료하지 않은 lease를 바로 만료시켜 다른 작업자가 잡을 수 있게 합니다."""
+        def release(now):
+            for chunk in _chunks(keys):
+                placeholders = ','.join('?' * len(chunk))
+                self._conn.execute(
+                    f'UPDATE leases SET expires_at = ?, updated_at = ? '
+                    f'WHERE owner = ? AND status = ? AND key IN ({placeholders})',
+                    (now, now, owner, STATUS_HELD, *chunk))
+        self._transaction(release)
+
+    def statuses(self, prefix):
+        """``prefix`` 로 시작하는 lease의 ``{key: (owner, status, 만료 시각)}``."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT key, owner, status, expires_at FROM leases WHERE substr(key, 1, ?) = ?',
+                (len(prefix), prefix)).fetchall()
+        return {key: (owner, status, datetime.fromtimestamp(expires_at, timezone.utc))
+                for key, owner, status, expires_at in rows}
+
+    def prune(self, before):
+        """``before`` (datetime) 이전에 마지막으로 갱신된 lease를 지우고 지운 수를 반환합니다."""
+        return self._transaction(lambda now: self._conn.execute(
+            'DELETE FROM leases WHERE updated_at < ?', (before.timestamp(),)).rowcount)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class SupabaseLeaseStore:
+    """Supabase(Postgres)의 ``collector_leases`` 테이블을 쓰는 lease 저장소.
+
+    잡기와 연장은 서버 시각으로 원자적으로 처리하는 함수(``SUPABASE_SCHEMA``)를 호출합니다.
+    """
+
+    def __init__(self, supabase, table=LEASE_TABLE):
+        self.supabase = supabase
+        self.table = table
+
+    def claim(self, keys, owner, ttl):
+        claimed = []
+        for chunk in _chunks(keys):
+            rows = self.supabase.rpc('claim_leases', {
+                'keys': chunk, 'worker': owner, 'ttl_seconds': ttl}).execute().data
+            claimed.extend(row['key'] for row in rows or [])
+        return claimed
+
+    def renew(self, owner, ttl):
+        rows = self.supabase.rpc('renew_leases', {'worker': owner, 'ttl_seconds': ttl}).execute().data
+        return {row['key'] for row in rows or []}
+
+    def finish(self, keys, owner, status):
+        now = datetime.now(timezone.utc).isoformat()
+        for chunk in _chunks(keys):
+            self.supabase.table(self.table).update({'status': status, 'updated_at': now}) \
+                .eq('owner', owner).in_('key', chunk).execute()
+
+    def release(self, keys, owner):
+        now = datetime.now(timezone.utc).isoformat()
+        for chunk in _chunks(keys):
+            self.supabase.table(self.table).update({'expires_at': now, 'updated_at': now}) \
+                .eq('owner', owner).eq('status', STATUS_HELD).in_('key', chunk).execute()
+
+    def statuses(self, prefix):
+        rows = self.supabase.table(self.table).select('key, owner, status, expires_at') \
+            .like('key', f"{prefix}%").execute().data
+        return {row['key']: (row['owner'], row['status'], datetime.fromisoformat(row['expires_at']))
+                for row in rows or []}
+
+    def prune(self, before):
+        rows = self.supabase.table(self.table).delete().lt('updated_at', before.isoformat()).execute().data
+        return len(rows or [])
+
+    def close(self):
+        pass
+
+
+def open_lease_store(backend, path=DEFAULT_LEASE_PATH, supabase=None):
+    """``backend`` ('sqlite' 또는 'supabase')에 맞는 lease 저장소를 만듭니다."""
+    if backend == 'sqlite':
+        return SqliteLeaseStore(path)
+    if backend == 'supabase':
+        if supabase is None:
+            from news_collector.clients import get_supabase
+            supabase = get_supabase()
+        return SupabaseLeaseStore(supabase)
+    raise ValueError(f"알 수 없는 lease 저장소: {backend} (사용 가능: sqlite, supabase)")
+
+
+class LeaseCoordinator:
+    """한 작업자의 lease를 잡고, 주기적으로 연장하고, 끝나면 완료로 표시합니다.
+
+    ``start`` 로 연장 스레드를 시작하고 ``stop`` 으로 멈춥니다. ``stop`` 은 저장한
+    링크(``record_write``)의 lease를 완료로 표시하고, 아직 완료하지 않은 나머지 lease는
+    놓아 다른 작업자가 바로 이어받을 수 있게 합니다.
+    """
+
+    def __init__(self, store, run_id, worker_id=None, ttl=DEFAULT_LEASE_TTL):
+        self.store = store
+        self.run_id = run_id
+        self.worker_id = worker_id or default_worker_id()
+        self.ttl = ttl
+        self._held = set()
+        # 저장에 성공한 링크의 lease key (stop 때 완료로 표시)
+        self._written = set()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def _key(self, kind, name):
+        return f"{self.run_id}:{kind}:{name}"
+
+    def start(self):
+        pruned = self.store.prune(datetime.now(timezone.utc) - PRUNE_AFTER)
+        if pruned:
+            print(f"오래된 lease {pruned}개를 지웠습니다")
+        self._thread = threading.Thread(target=self._renew_loop, name="lease-renew", daemon=True)
+        self._thread.start()
+        return self
+
+    def _renew_loop(self):
+        while not self._stopped.wait(self.ttl / 3):
+            try:
+                renewed = self.store.renew(self.worker_id, self.ttl)
+            except Exception as e:
+                print(f"lease를 연장하지 못했습니다: {e}")
+                continue
+            with self._lock:
+                lost = self._held - renewed
+                self._held -= lost
+            for key in sorted(lost):
+                print(f"경고: lease가 만료되어 다른 작업자에게 넘어갔을 수 있습니다: {key}")
+
+    def claim(self, kind, names):
+        """``names`` 중 이 작업자가 lease를 잡은 것을 입력 순서대로 반환합니다."""
+        keys = {self._key(kind, name): name for name in names}
+        if not keys:
+            return []
+        claimed = set(self.store.claim(list(keys), self.worker_id, self.ttl))
+        with self._lock:
+            self._held |= claimed
+        return [name for key, name in keys.items() if key in claimed]
+
+    def claim_links(self, links):
+        """새로 내려받을 링크의 lease를 한 번에 잡고 잡은 링크 집합을 반환합니다."""
+        return set(self.claim(KIND_LINK, links))
+
+    def record_write(self, row, result):
+        """``ArticleWriter`` 의 on_result 콜백으로 쓰입니다. 저장한 링크를 ``stop`` 때 완료로 표시합니다."""
+        if not result.ok:
+            return
+        key = self._key(KIND_LINK, row['link'])
+        with self._lock:
+            if key in self._held:
+                self._written.add(key)
+
+    def finish(self, kind, names, ok=True):
+        keys = [self._key(kind, name) for name in names]
+        self.store.finish(keys, self.worker_id, STATUS_DONE if ok else STATUS_FAILED)
+        with self._lock:
+            self._held.difference_update(keys)
+
+    def unfinished(self, kind, names):
+        """``names`` 중 아직 어느 작업자도 끝내지 않은 것."""
+        statuses = self.store.statuses(f"{self.run_id}:{kind}:")
+        return [name for name in names
+                if statuses.get(self._key(kind, name), (None, STATUS_HELD, None))[1] == STATUS_HELD]
+
+    def run_claimed(self, kind, names, fn, workers=DEFAULT_LEASE_SLOTS):
+        """``names`` 를 하나씩 lease로 잡아 ``fn(name)`` 을 최대 ``workers`` 개까지 동시에 실행합니다.
+
+        끝난 것마다 완료(예외가 나면 실패)로 표시하고 ``(name, 예외 또는 None)`` 을 내보냅니다.
+        자리가 빌 때만 하나씩 잡으므로 먼저 시작한 작업자가 모든 소스를 가져가지 않습니다.
+        다른 작업자가 잡은 것은 끝나거나 lease가 만료되어 잡을 수 있을 때까지 기다리므로,
+        모든 작업자가 끝나면 모든 ``names`` 가 정확히 한 번 처리되어 있습니다.
+        """
+        poll = min(self.ttl / 3, MAX_POLL_INTERVAL)
+        remaining = list(names)
+        running = {}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while remaining or running:
+                for name in list(remaining):
+                    if len(running) >= workers:
+                        break
+                    if self.claim(kind, [name]):
+                        remaining.remove(name)
+                        running[pool.submit(fn, name)] = name
+                if not running:
+                    # 남은 것은 모두 다른 작업자가 잡고 있습니다. 다른 작업자가 끝낸 것은 더 기다리지 않습니다.
+                    remaining = self.unfinished(kind, remaining)
+                    if remaining:
+                        print(f"다른 작업자가 처리 중인 {kind} {len(remaining)}개를 기다립니다: "
+                              f"{', '.join(remaining)}")
+                        time.sleep(poll)
+                    continue
+                done, _ = wait(running, timeout=poll, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    error = future.exception()
+                    self.finish(kind, [name], ok=error is None)
+                    yield name, error
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        with self._lock:
+            # 연장하지 못해 넘어간 lease는 _held에서 빠졌으므로 완료로 표시하지 않습니다.
+            written = sorted(self._written & self._held)
+            held = sorted(self._held - self._written)
+            self._held.clear()
+            self._written.clear()
+        if written:
+            self.store.finish(written, self.worker_id, STATUS_DONE)
+        if held:
+            self.store.release(held, self.worker_id)
+        self.store.close()
@@ -0,0 +1,233 @@
+"""실행 중 단계별 소요 시간과 이벤트 수를 모아 기계가 읽을 수 있는 보고서로 남깁니다.
+
+소스마다 피드 요청, 날짜 파싱, 중복 조회, 기사 다운로드, 본문 추출, 저장에
+걸린 시간과 내려받은 바이트 수, HTTP 상태 코드 분포, 건너뜀/저장/갱신/실패
+건수를 기록합니다. 실행이 끝나면 JSON 보고서와 Prometheus textfile
+collector 형식(.prom)으로 저장해 실행 간 처리량과 지연을 비교할 수 있습니다.
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+DEFAULT_REPORT_PATH = os.path.join('reports', 'run_report.json')
+DEFAULT_PROMETHEUS_PATH = os.path.join('reports', 'news_collector.prom')
+
+# 소스에 속하지 않는 작업(일괄 저장 등)을 기록할 때 쓰는 이름
+RUN_SCOPE = '_run'
+
+# 보고서에 출력할 단계 순서. 여기에 없는 단계는 뒤에 이름순으로 붙습니다.
+STAGE_ORDER = (
+    "feed_fetch", "feed_parse", "filter", "date_parse", "dedup", "dedup_query",
+    "fetch", "article_fetch", "extract", "fingerprint", "neardup_lookup", "write", "db_write",
+)
+
+
+def percentile(sorted_values, fraction):
+    """정렬된 값에서 nearest-rank 방식의 백분위 값을 반환합니다."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+def summarize_durations(values):
+    values = sorted(values)
+    return {
+        "count": len(values),
+        "total_s": sum(values),
+        "p50_ms": percentile(values, 0.50) * 1000,
+        "p95_ms": percentile(values, 0.95) * 1000,
+        "max_ms": (values[-1] if values else 0.0) * 1000,
+    }
+
+
+def _ordered(names):
+    names = set(names)
+    return [name for name in STAGE_ORDER if name in names] + sorted(names.difference(STAGE_ORDER))
+
+
+class _SourceMetrics:
+    def __init__(self):
+        self.durations = {}
+        self.counters = {}
+        self.http_status = {}
+        self.http_bytes = 0
+
+
+class RunMetrics:
+    """한 번의 실행 동안 모든 소스가 공유하는 스레드 안전한 측정값 모음."""
+
+    def __init__(self):
+        self.started_at = datetime.now(timezone.utc)
+        self.finished_at = None
+        self.exit_code = None
+        self._started = time.perf_counter()
+        self._elapsed = None
+        self._sources = {}
+        # 저장 결과가 어느 소스의 신규/갱신 행인지 알기 위한 링크별 표시
+        self._pending_writes = {}
+        self._lock = threading.Lock()
+
+    def _source(self, source):
+        metrics = self._sources.get(source)
+        if metrics is None:
+            metrics = self._sources[source] = _SourceMetrics()
+        return metrics
+
+    def observe(self, source, stage, seconds):
+        """``source`` 의 ``stage`` 가 한 번 실행되는 데 걸린 시간을 기록합니다."""
+        with self._lock:
+            self._source(source).durations.setdefault(stage, []).append(seconds)
+
+    def stage_observer(self, source):
+        """``run_pipeline`` 의 observer로 넘길 수 있는 ``(stage, seconds)`` 콜백."""
+        return lambda stage, seconds: self.observe(source, stage, seconds)
+
+    def count(self, source, event, amount=1):
+        with self._lock:
+            counters = self._source(source).counters
+            counters[event] = counters.get(event, 0) + amount
+
+    def response_hook(self, source):
+        """``requests`` 응답 훅: 상태 코드와 내려받은 바이트 수를 ``source`` 에 기록합니다.
+
+        스트리밍 요청은 본문을 여기서 읽지 않습니다. 읽은 바이트 수는 ``add_http_bytes`` 로 따로 기록합니다.
+        """
+        def hook(response, *args, **kwargs):
+            size = 0 if kwargs.get('stream') else len(response.content or b'')
+            with self._lock:
+                metrics = self._source(source)
+                status = str(response.status_code)
+                metrics.http_status[status] = metrics.http_status.get(status, 0) + 1
+                metrics.http_bytes += size
+            return response
+        return hook
+
+    def add_http_bytes(self, source, size):
+        with self._lock:
+            self._source(source).http_bytes += size
+
+    def expect_write(self, link, source, kind):
+        """writer에 넘긴 행의 소스와 종류('inserted' 또는 'updated')를 기억해 둡니다."""
+        with self._lock:
+            self._pending_writes[link] = (source, kind)
+
+    def record_write(self, row, result):
+        """``ArticleWriter`` 의 on_result 콜백으로 쓰입니다."""
+        with self._lock:
+            source, kind = self._pending_writes.pop(row['link'], (RUN_SCOPE, 'written'))
+            counters = self._source(source).counters
+            event = kind if result.ok else 'failed'
+            counters[event] = counters.get(event, 0) + 1
+
+    def finish(self, exit_code):
+        self.exit_code = exit_code
+        self.finished_at = datetime.now(timezone.utc)
+        self._elapsed = time.perf_counter() - self._started
+
+    def elapsed(self):
+        return self._elapsed if self._elapsed is not None else time.perf_counter() - self._started
+
+    def stage_summary(self, sources=None):
+        """단계별 소요 시간 요약. ``sources`` 를 주면 그 소스들만 합칩니다."""
+        with self._lock:
+            merged = {}
+            for name, metrics in self._sources.items():
+                if sources is not None and name not in sources:
+                    continue
+                for stage, values in metrics.durations.items():
+                    merged.setdefault(stage, []).extend(values)
+        return {stage: summarize_durations(merged[stage]) for stage in _ordered(merged)}
+
+    def report(self):
+        """JSON으로 저장할 보고서 dict."""
+        with self._lock:
+            sources = {
+                name: {
+                    "counters": dict(sorted(metrics.counters.items())),
+                    "stages": {stage: summarize_durations(metrics.durations[stage])
+                               for stage in _ordered(metrics.durations)},
+                    "http": {
+                        "status": dict(sorted(metrics.http_status.items())),
+                        "requests": sum(metrics.http_status.values()),
+                        "bytes": metrics.http_bytes,
+                    },
+                }
+                for name, metrics in sorted(self._sources.items())
+            }
+        return {
+            "started_at": self.started_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "elapsed_s": self.elapsed(),
+            "exit_code": self.exit_code,
+            "sources": sources,
+        }
+
+    def prometheus_lines(self, prefix='news_collector'):
+        """Prometheus textfile collector 형식의 줄 목록. 모든 값은 마지막 실행 기준입니다."""
+        report = self.report()
+        lines = []
+
+        def family(name, help_text, metric_type, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+            for suffix, labels, value in samples:
+                label_text = ','.join(f'{key}="{_escape_label(val)}"' for key, val in labels)
+                label_text = f"{{{label_text}}}" if label_text else ''
+                lines.append(f"{prefix}_{name}{suffix}{label_text} {value}")
+
+        family("last_run_timestamp_seconds", "Unix time the last run finished.", "gauge",
+               [("", (), (self.finished_at or datetime.now(timezone.utc)).timestamp())])
+        family("last_run_duration_seconds", "Wall-clock duration of the last run.", "gauge",
+               [("", (), report["elapsed_s"])])
+        family("last_run_success", "1 if the last run exited with code 0.", "gauge",
+               [("", (), 1 if report["exit_code"] == 0 else 0)])
+
+        stage_samples = []
+        for source, data in report["sources"].items():
+            for stage, summary in data["stages"].items():
+                labels = (("source", source), ("stage", stage))
+                stage_samples.append(("", labels + (("quantile", "0.5"),), summary["p50_ms"] / 1000))
+                stage_samples.append(("", labels + (("quantile", "0.95"),), summary["p95_ms"] / 1000))
+                stage_samples.append(("_sum", labels, summary["total_s"]))
+                stage_samples.append(("_count", labels, summary["count"]))
+        family("stage_duration_seconds", "Per-call stage duration in the last run.", "summary", stage_samples)
+
+        family("last_run_events", "Entries skipped/inserted/updated/failed in the last run.", "gauge", [
+            ("", (("source", source), ("event", event)), value)
+            for source, data in report["sources"].items()
+            for event, value in data["counters"].items()
+        ])
+        family("last_run_http_responses", "HTTP responses by status code in the last run.", "gauge", [
+            ("", (("source", source), ("status", status)), value)
+            for source, data in report["sources"].items()
+            for status, value in data["http"]["status"].items()
+        ])
+        family("last_run_http_bytes", "Response body bytes downloaded in the last run.", "gauge", [
+            ("", (("source", source),), data["http"]["bytes"])
+            for source, data in report["sources"].items()
+        ])
+        return lines
+
+    def write_json(self, path):
+        _write_atomic(path, json.dumps(self.report(), ensure_ascii=False, indent=2))
+
+    def write_prometheus(self, path):
+        _write_atomic(path, '\n'.join(self.prometheus_lines()) + '\n')
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _write_atomic(path, text):
+    # node_exporter가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체합니다.
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
@@ -0,0 +1,293 @@
+"""소스 간 유사 중복(near-duplicate) 기사 탐지.
+
+같은 보도자료나 통신 기사가 여러 소스에 거의 그대로 실리면 링크가 달라
+정확히 일치하는 중복 확인에 걸리지 않습니다. 제목과 본문의 단어 3-gram
+집합으로 MinHash 시그니처를 만들고, 시그니처를 여러 밴드로 나눈 LSH 색인에서
+같은 밴드 값을 가진 후보만 비교해 추정 Jaccard 유사도가 기준 이상이면
+같은 클러스터로 묶습니다. 조회는 밴드 수만큼의 dict 조회와 후보 몇 개의
+비교로 끝납니다.
+
+색인은 로컬 SQLite(``.cache/neardup.sqlite3``)에 저장되고 실행 시작 시
+최근 ``max_age_days`` 일치만 메모리에 올립니다. 캐시가 없으면
+``neardup seed`` 로 Supabase의 최근 기사에서 다시 만들 수 있습니다.
+
+클러스터 id를 DB에도 저장하려면 articles 테이블에 컬럼을 추가하고
+(``alter table articles add column cluster_id text;``) ``--cluster-column cluster_id``
+로 실행합니다.
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import struct
+import threading
+from array import array
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+DEFAULT_NEARDUP_INDEX_PATH = os.path.join('.cache', 'neardup.sqlite3')
+
+NUM_PERM = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERM // BANDS
+# 16밴드 x 4행이면 Jaccard 약 0.5부터 후보로 잡힙니다. 최종 판단은 THRESHOLD로 합니다.
+DEFAULT_THRESHOLD = 0.6
+SHINGLE_SIZE = 3
+DEFAULT_MAX_AGE_DAYS = 7
+
+# shingle 하나를 SHAKE-128로 한 번 해시해 32비트 값 NUM_PERM개(서로 독립인 해시 함수 역할)를 얻습니다.
+_unpack_hashes = struct.Struct(f'<{NUM_PERM}I').unpack
+
+_WORD = re.compile(r'\w+')
+
+Match = namedtuple('Match', ['cluster_id', 'link', 'similarity'])
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """소문자로 바꾼 단어 ``size``-gram 집합."""
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def signature(text):
+    """MinHash 시그니처(길이 ``NUM_PERM`` 의 tuple). 단어가 없으면 None."""
+    grams = shingles(text)
+    if not grams:
+        return None
+    hashed = (_unpack_hashes(hashlib.shake_128(gram.encode('utf-8')).digest(NUM_PERM * 4)) for gram in grams)
+    # 해시 함수별 최솟값: 전치(zip) 후 min을 C 수준에서 계산합니다.
+    return tuple(map(min, zip(*hashed)))
+
+
+def similarity(left, right):
+    """두 시그니처의 추정 Jaccard 유사도."""
+    return sum(1 for x, y in zip(left, right) if x == y) / NUM_PERM
+
+
+def _bands(sig):
+    return [(band, sig[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]) for band in range(BANDS)]
+
+
+def _new_cluster_id(link):
+    return hashlib.sha1(link.encode('utf-8')).hexdigest()[:16]
+
+
+def article_text(title, content):
+    return f"{title or ''}\n{content or ''}"
+
+
+class NearDuplicateIndex:
+    """MinHash LSH 색인. 여러 소스가 함께 쓰며 스레드 안전합니다.
+
+    ``assign`` 한 기사는 바로 같은 실행의 다른 기사와 비교할 후보가 되지만, 파일에는
+    writer가 저장을 확인한 뒤(``record_write``)에만 씁니다. 저장에 실패하면 색인에서
+    뺍니다. 유사 중복이라 저장하지 않은 기사는 ``skip`` 으로 그 판단을 기록해 두고,
+    다시 나오면 같은 판단을 돌려줍니다.
+    """
+
+    def __init__(self, path=DEFAULT_NEARDUP_INDEX_PATH, enabled=True, threshold=DEFAULT_THRESHOLD,
+                 max_age_days=DEFAULT_MAX_AGE_DAYS):
+        self.path = path
+        self.enabled = enabled
+        self.threshold = threshold
+        self.max_age_days = max_age_days
+        self._buckets = {}
+        # 색인에 있는 기사: link -> (cluster_id, 시그니처, source, Match 또는 None)
+        self._entries = {}
+        # 유사 중복이라 저장하지 않은 기사: link -> (cluster_id, 시그니처, source, Match)
+        self._skipped = {}
+        # assign 했지만 아직 저장을 확인하지 못한 링크
+        self._pending = set()
+        self._new = []
+        self._lock = threading.Lock()
+        self._conn = None
+        if enabled and path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS signatures ('
+                ' link TEXT PRIMARY KEY,'
+                ' cluster_id TEXT NOT NULL,'
+                ' source TEXT,'
+                ' signature BLOB NOT NULL,'
+                ' created_at TEXT NOT NULL,'
+                ' match_link TEXT,'
+                ' match_similarity REAL,'
+                ' skipped INTEGER NOT NULL DEFAULT 0)'
+            )
+            columns = {row[1] for row in self._conn.execute('PRAGMA table_info(signatures)')}
+            if 'skipped' not in columns:
+                # 이 열들이 생기기 전의 시그니처는 모두 저장된 기사의 것으로 봅니다.
+                self._conn.execute('ALTER TABLE signatures ADD COLUMN match_link TEXT')
+                self._conn.execute('ALTER TABLE signatures ADD COLUMN match_similarity REAL')
+                self._conn.execute('ALTER TABLE signatures ADD COLUMN skipped INTEGER NOT NULL DEFAULT 0')
+            self._conn.commit()
+            self._load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _cutoff(self):
+        return (datetime.now(timezone.utc) - timedelta(days=self.max_age_days)).isoformat()
+
+    def _load(self):
+        rows = self._conn.execute(
+            'SELECT link, cluster_id, source, signature, match_link, match_similarity, skipped '
+            'FROM signatures WHERE created_at >= ?', (self._cutoff(),))
+        for link, cluster_id, source, blob, match_link, match_similarity, skipped in rows:
+            match = Match(cluster_id, match_link, match_similarity) if match_link else None
+            sig = tuple(array('I', blob))
+            if skipped:
+                self._skipped[link] = (cluster_id, sig, source, match)
+            else:
+                self._add(link, cluster_id, sig, source, match)
+
+    def _add(self, link, cluster_id, sig, source, match):
+        self._entries[link] = (cluster_id, sig, source, match)
+        for band in _bands(sig):
+            self._buckets.setdefault(band, []).append(link)
+
+    def _remove(self, link):
+        _, sig, _, _ = self._entries.pop(link)
+        for band in _bands(sig):
+            self._buckets[band].remove(link)
+
+    def _best_match(self, link, sig, source):
+        candidates = set()
+        for band in _bands(sig):
+            candidates.update(self._buckets.get(band, ()))
+        candidates.discard(link)
+        best = None
+        for candidate in candidates:
+            cluster_id, other, other_source, _ = self._entries[candidate]
+            # 같은 소스의 비슷한 기사(연재, 정정 기사 등)는 소스 간 중복이 아닙니다.
+            if source is not None and other_source == source:
+                continue
+            score = similarity(sig, other)
+            if score >= self.threshold and (best is None or score > best.similarity):
+                best = Match(cluster_id, candidate, score)
+        return best
+
+    def assign(self, link, sig, source=None):
+        """``(cluster_id, 가장 비슷한 다른 소스의 기존 기사 Match 또는 None)`` 을 반환합니다.
+
+        비슷한 기사가 있으면 그 클러스터 id를, 없으면 새 id를 씁니다. 이미 색인에 있거나
+        ``skip`` 한 링크면 처음 판단한 클러스터 id와 Match를 그대로 돌려줍니다. 새 링크는
+        ``record_write`` 로 저장 결과를 받을 때까지 이번 실행의 후보로만 쓰입니다.
+        """
+        with self._lock:
+            known = self._entries.get(link) or self._skipped.get(link)
+            if known is not None:
+                return known[0], known[3]
+            match = self._best_match(link, sig, source)
+            cluster_id = match.cluster_id if match else _new_cluster_id(link)
+            self._add(link, cluster_id, sig, source, match)
+            self._pending.add(link)
+            return cluster_id, match
+
+    def skip(self, link):
+        """``assign`` 한 링크를 유사 중복이라 저장하지 않았음을 기록합니다."""
+        with self._lock:
+            if link not in self._pending:
+                return
+            self._pending.discard(link)
+            entry = self._entries[link]
+            self._remove(link)
+            self._skipped[link] = entry
+            self._queue(link, entry, skipped=True)
+
+    def record_write(self, row, result):
+        """``ArticleWriter`` 의 on_result 콜백으로 쓰입니다. 저장된 기사의 시그니처만 파일에 남깁니다."""
+        link = row['link']
+        with self._lock:
+            if link in self._skipped and result.ok:
+                # 예전에 건너뛴 기사를 이번에는 저장했습니다. (--skip-near-duplicates 없이 실행)
+                self._add(link, *self._skipped.pop(link))
+                self._queue(link, self._entries[link], skipped=False)
+                return
+            if link not in self._pending:
+                return
+            self._pending.discard(link)
+            if result.ok:
+                self._queue(link, self._entries[link], skipped=False)
+            else:
+                self._remove(link)
+
+    def _queue(self, link, entry, skipped):
+        if not self.enabled:
+            return
+        cluster_id, sig, source, match = entry
+        self._new.append((link, cluster_id, source, array('I', sig).tobytes(),
+                          datetime.now(timezone.utc).isoformat(),
+                          match.link if match else None, match.similarity if match else None,
+                          int(skipped)))
+
+    def save(self):
+        """이번 실행에서 저장을 확인한 시그니처와 건너뛴 판단을 파일에 씁니다."""
+        if self._conn is None:
+            return
+        with self._lock:
+            pending, self._new = self._new, []
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO signatures (link, cluster_id, source, signature, created_at, '
+                'match_link, match_similarity, skipped) VALUES (?, ?, ?, ?, ?, ?, ?, ?)', pending)
+            self._conn.commit()
+
+    def seed(self, supabase, limit=2000, page_size=500):
+        """Supabase의 최근 기사(id 역순 ``limit`` 개)로 색인을 채웁니다. 추가한 기사 수를 반환합니다."""
+        rows = []
+        while len(rows) < limit:
+            query = (supabase.table('articles').select('id, link, title, full_content, source')
+                     .order('id', desc=True).limit(min(page_size, limit - len(rows))))
+            if rows:
+                query = query.lt('id', rows[-1]['id'])
+            page = query.execute().data
+            if not page:
+                break
+            rows.extend(page)
+            print(f"Read {len(rows)} recent articles for the near-duplicate index")
+        # 오래된 기사부터 넣어야 먼저 나온 기사의 클러스터 id가 유지됩니다.
+        for row in reversed(rows):
+            sig = signature(article_text(row.get('title'), row.get('full_content')))
+            if sig is not None:
+                self.assign(row['link'], sig, row.get('source'))
+                # 이미 저장된 기사이므로 저장을 확인한 것으로 기록합니다.
+                with self._lock:
+                    if row['link'] in self._pending:
+                        self._pending.discard(row['link'])
+                        self._queue(row['link'], self._entries[row['link']], skipped=False)
+        self.save()
+        return len(rows)
+
+    def compact(self):
+        """``max_age_days`` 보다 오래된 시그니처를 지웁니다. 삭제한 행 수를 반환합니다."""
+        if self._conn is None:
+            return 0
+        with self._lock:
+            deleted = self._conn.execute('DELETE FROM signatures WHERE created_at < ?',
+                                         (self._cutoff(),)).rowcount
+            self._conn.commit()
+            self._conn.execute('VACUUM')
+        return deleted
+
+    def stats(self):
+        with self._lock:
+            clusters = {}
+            for cluster_id, _, _, _ in self._entries.values():
+                clusters[cluster_id] = clusters.get(cluster_id, 0) + 1
+        return {
+            'articles': len(self._entries),
+            'clusters': len(clusters),
+            'clustered_articles': sum(size for size in clusters.values() if size > 1),
+        }
+
+    def close(self):
+        self.save()
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,154 @@
+"""크기가 제한된 큐로 연결된 단계별(staged) 처리 파이프라인.
+
+각 단계는 자기 작업자 스레드에서 입력 큐의 항목을 처리해 다음 단계의 큐에
+넣습니다. 네트워크 다운로드, HTML 추출, DB 저장이 서로 겹쳐 진행되고,
+뒤 단계가 느리면 큐가 차서 앞 단계가 기다리므로(backpressure) 메모리가
+끝없이 늘어나지 않습니다.
+"""
+import queue
+import threading
+import time
+
+_DONE = object()
+
+
+class Stage:
+    """파이프라인의 한 단계.
+
+    ``fn`` 은 항목 하나(``batch_size`` 가 있으면 항목 리스트)를 받아 다음
+    단계로 보낼 항목들의 iterable(없으면 None)을 반환합니다.
+    ``batch_size`` 가 있는 단계는 그만큼 모이거나, 입력이 ``batch_wait`` 초
+    동안 끊기거나, 입력이 끝나면 모인 항목을 한 번에 처리합니다.
+    """
+
+    def __init__(self, name, fn, workers=1, batch_size=None, batch_wait=0.2):
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+
+
+class _StageRunner:
+    def __init__(self, stage, inbox, outbox, abort, errors, observer=None):
+        self.stage = stage
+        self.observer = observer
+        self.inbox = inbox
+        self.outbox = outbox
+        self.abort = abort
+        self.errors = errors
+        self._remaining = stage.workers
+        self._lock = threading.Lock()
+
+    def start(self):
+        threads = []
+        for i in range(self.stage.workers):
+            thread = threading.Thread(target=self._work, name=f"{self.stage.name}-{i}", daemon=True)
+            thread.start()
+            threads.append(thread)
+        return threads
+
+    def _emit(self, outputs):
+        if outputs is None:
+            return
+        for output in outputs:
+            if self.abort.is_set():
+                return
+            self.outbox.put(output)
+
+    def _call(self, payload):
+        if self.abort.is_set():
+            # 다른 단계가 실패했으면 입력만 비우며 종료를 기다립니다.
+            return
+        try:
+            started = time.perf_counter()
+            outputs = self.stage.fn(payload)
+            if self.observer is not None:
+                self.observer(self.stage.name, time.perf_counter() - started)
+            self._emit(outputs)
+        except BaseException as e:
+            self.errors.append((self.stage.name, e))
+            self.abort.set()
+
+    def _work(self):
+        batch = []
+        while True:
+            if self.stage.batch_size and batch:
+                try:
+                    item = self.inbox.get(timeout=self.stage.batch_wait)
+                except queue.Empty:
+                    self._call(batch)
+                    batch = []
+                    continue
+            else:
+                item = self.inbox.get()
+
+            if item is _DONE:
+                if batch:
+                    self._call(batch)
+                # 같은 단계의 다른 작업자도 종료 신호를 볼 수 있도록 돌려놓습니다.
+                self.inbox.put(_DONE)
+                with self._lock:
+                    self._remaining -= 1
+                    last = self._remaining == 0
+                if last:
+                    self.outbox.put(_DONE)
+                return
+
+            if self.stage.batch_size:
+                batch.append(item)
+                if len(batch) >= self.stage.batch_size:
+                    self._call(batch)
+                    batch = []
+            else:
+                self._call(item)
+
+
+def run_pipeline(items, stages, queue_size=32, observer=None):
+    """``items`` 를 단계들에 차례로 흘려보내고 마지막 단계의 출력을 리스트로 반환합니다.
+
+    ``observer(stage_name, seconds)`` 를 넘기면 단계 함수가 한 번 실행될 때마다
+    걸린 시간을 알려줍니다. (배치 단계는 배치 하나당 한 번)
+
+    어느 단계에서든 예외가 나면 나머지 항목은 버리고, 모든 스레드가 끝난 뒤
+    첫 번째 예외를 다시 발생시킵니다.
+    """
+    abort = threading.Event()
+    errors = []
+    queues = [queue.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)]
+    # 마지막 큐는 이 함수가 직접 비우므로 크기를 제한하지 않아도 됩니다.
+    queues[-1] = queue.Queue()
+
+    threads = []
+    for i, stage in enumerate(stages):
+        threads.extend(_StageRunner(stage, queues[i], queues[i + 1], abort, errors, observer).start())
+
+    def feed():
+        try:
+            for item in items:
+                if abort.is_set():
+                    break
+                queues[0].put(item)
+        except BaseException as e:
+            errors.append(("source", e))
+            abort.set()
+        finally:
+            queues[0].put(_DONE)
+
+    feeder = threading.Thread(target=feed, name="pipeline-source", daemon=True)
+    feeder.start()
+
+    outputs = []
+    while True:
+        item = queues[-1].get()
+        if item is _DONE:
+            break
+        outputs.append(item)
+
+    feeder.join()
+    for thread in threads:
+        thread.join()
+    if errors:
+        stage_name, error = errors[0]
+        raise RuntimeError(f"pipeline stage '{stage_name}' failed: {error}") from error
+    return outputs
@@ -0,0 +1,359 @@
+"""호스트별 적응형(AIMD) 요청 속도 제한.
+
+고정된 최소 간격 대신 호스트마다 토큰 버킷(GCRA 방식) 속도를 두고, 응답이
+건강하면 속도를 조금씩 올리고(additive increase) 429/5xx, 연결 실패, 급격한
+지연 증가가 보이면 절반으로 줄입니다(multiplicative decrease).
+``Retry-After`` 헤더가 오면 그 시각까지 해당 호스트로 요청을 보내지 않습니다.
+
+처음 보는 호스트는 robots.txt의 ``Crawl-delay`` 로 시작 속도와 최대 속도를
+정합니다. 배운 속도, Retry-After 차단 시각, robots.txt 결과는
+``.cache/rate_limits.json`` 에 저장되어 다음 실행이 이어서 씁니다.
+
+응답은 요청에 붙이는 ``response_hook`` 으로 관찰하므로 피드와 기사 요청이 모두
+반영됩니다. 응답 없이 끝난 요청(연결 실패, 시간 초과)은 ``finish`` 로 알려 줍니다.
+요청은 ``call`` 로 보내며, 429/503 응답은 세션이 재시도하지 않고(``defer_throttling``)
+제한기가 속도를 줄이거나 Retry-After만큼 기다린 뒤 다시 보냅니다.
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+DEFAULT_RATE_STATE_PATH = os.path.join('.cache', 'rate_limits.json')
+
+DEFAULT_MIN_RATE = 0.05      # 초당 요청 수 (20초에 한 번)
+DEFAULT_MAX_RATE = 8.0
+DEFAULT_INCREASE = 0.1       # 건강한 응답마다 더하는 속도
+DEFAULT_DECREASE = 0.5       # 문제가 생기면 곱하는 비율
+# 이 시간보다 오래, 그리고 평소 지연의 SLOW_FACTOR배보다 오래 걸린 응답은 과부하 신호로 봅니다.
+SLOW_LATENCY = 2.0
+SLOW_FACTOR = 3.0
+# Retry-After가 이보다 길면 이번 실행에서는 기다리지 않고 요청을 건너뜁니다.
+DEFAULT_MAX_WAIT = 60.0
+ROBOTS_TTL = timedelta(days=7)
+ROBOTS_TIMEOUT = (3, 5)
+
+THROTTLE_STATUSES = (429, 500, 502, 503, 504)
+# 이 상태 코드는 세션이 재시도하지 않으므로 ``call`` 이 기다렸다가 다시 보냅니다.
+RETRY_LATER_STATUSES = (429, 503)
+DEFAULT_THROTTLE_RETRIES = 2
+
+
+class HostBlocked(Exception):
+    """호스트가 Retry-After로 ``max_wait`` 보다 오래 막혀 있어 요청을 보내지 않았습니다."""
+
+
+def parse_retry_after(value, now=None):
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 기다릴 초로 바꿉니다. 해석할 수 없으면 None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    return max((when - now).total_seconds(), 0.0)
+
+
+def parse_crawl_delay(text, user_agent='*'):
+    """robots.txt에서 ``user_agent`` 에 적용되는 Crawl-delay(초)를 찾습니다. 없으면 None.
+
+    ``urllib.robotparser`` 는 정수 Crawl-delay만 인식하므로 ``0.5`` 같은 값도 읽도록
+    직접 해석합니다. 이름이 맞는 그룹이 없으면 ``*`` 그룹의 값을 씁니다.
+    """
+    agent = user_agent.split('/')[0].lower()
+    delays = {}
+    group, in_rules = [], False
+    for line in text.splitlines():
+        key, sep, value = line.split('#', 1)[0].partition(':')
+        if not sep:
+            continue
+        key, value = key.strip().lower(), value.strip()
+        if key == 'user-agent':
+            # 규칙 뒤에 나온 User-agent는 새 그룹을 시작합니다.
+            if in_rules:
+                group, in_rules = [], False
+            group.append(value.lower())
+        elif key == 'crawl-delay':
+            in_rules = True
+            try:
+                delay = float(value)
+            except ValueError:
+                continue
+            for name in group:
+                delays.setdefault(name, delay)
+        else:
+            in_rules = True
+    for name, delay in delays.items():
+        if name != '*' and name in agent:
+            return delay
+    return delays.get('*')
+
+
+class _HostRate:
+    """한 호스트의 속도, 토큰 버킷 상태, 차단 시각."""
+
+    def __init__(self, rate, max_rate, crawl_delay=None, blocked_until=0.0, robots_checked_at=None):
+        self.rate = rate
+        self.max_rate = max_rate
+        self.crawl_delay = crawl_delay
+        # time.time() 기준. 실행 간에 저장되므로 monotonic 대신 벽시계를 씁니다.
+        self.blocked_until = blocked_until
+        self.robots_checked_at = robots_checked_at
+        self.latency = None
+        self.lock = threading.Lock()
+        self.robots_lock = threading.Lock()
+        # 다음 요청이 이론상 도착해야 할 시각 (GCRA의 TAT, monotonic)
+        self._tat = 0.0
+        self._last_decrease = 0.0
+        self.requests = 0
+        self.throttled = 0
+
+    def reserve(self, burst):
+        """요청 시작 시각을 예약하고 기다릴 초를 반환합니다."""
+        with self.lock:
+            now = time.monotonic()
+            interval = 1.0 / self.rate
+            tat = max(self._tat, now)
+            start = max(now, tat - (burst - 1) * interval)
+            blocked = self.blocked_until - time.time()
+            if blocked > 0:
+                start = max(start, now + blocked)
+            self._tat = max(tat, start) + interval
+            return start - now
+
+    def increase(self, step):
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + step)
+
+    def decrease(self, factor, min_rate):
+        with self.lock:
+            now = time.monotonic()
+            # 동시에 실패한 여러 응답 때문에 연달아 줄어들지 않도록 한 간격에 한 번만 줄입니다.
+            if now - self._last_decrease < max(1.0 / self.rate, 1.0):
+                return
+            self._last_decrease = now
+            self.rate = max(min_rate, self.rate * factor)
+            self.throttled += 1
+
+    def block_for(self, seconds):
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.time() + seconds)
+
+
+class AdaptiveRateLimiter:
+    """호스트(netloc)별 ``_HostRate`` 를 관리하고 상태를 파일에 저장합니다."""
+
+    def __init__(self, path=DEFAULT_RATE_STATE_PATH, enabled=True, start_rate=1.0, min_rate=DEFAULT_MIN_RATE,
+                 max_rate=DEFAULT_MAX_RATE, increase=DEFAULT_INCREASE, decrease=DEFAULT_DECREASE,
+                 burst=1, max_wait=DEFAULT_MAX_WAIT, session=None, use_robots=True,
+                 throttle_retries=DEFAULT_THROTTLE_RETRIES):
+        self.path = path
+        self.enabled = enabled
+        self.start_rate = start_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase_step = increase
+        self.decrease_factor = decrease
+        self.burst = burst
+        self.max_wait = max_wait
+        self.throttle_retries = throttle_retries
+        # robots.txt를 받을 때 쓰는 세션 (None이면 robots.txt를 확인하지 않음)
+        self.session = session
+        self.use_robots = use_robots
+        self._hosts = {}
+        self._state = {}
+        self._lock = threading.Lock()
+        # 현재 스레드의 작업 중 응답을 받았는지(연결 실패 판단용), 마지막 응답이 429/503이었는지
+        self._local = threading.local()
+        if enabled and path and os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self._state = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"속도 제한 상태 파일을 읽지 못해 무시합니다 ({path}): {e}")
+
+    def _host(self, host):
+        with self._lock:
+            rate = self._hosts.get(host)
+            if rate is None:
+                saved = self._state.get(host, {})
+                crawl_delay = saved.get('crawl_delay')
+                max_rate = self.max_rate
+                if crawl_delay:
+                    max_rate = min(max_rate, 1.0 / crawl_delay)
+                start = saved.get('rate') or self.start_rate
+                blocked_until = saved.get('blocked_until')
+                rate = _HostRate(
+                    rate=max(self.min_rate, min(max_rate, start)),
+                    max_rate=max_rate,
+                    crawl_delay=crawl_delay,
+                    blocked_until=datetime.fromisoformat(blocked_until).timestamp() if blocked_until else 0.0,
+                    robots_checked_at=saved.get('robots_checked_at'),
+                )
+                self._hosts[host] = rate
+            return rate
+
+    def _check_robots(self, url, host, rate):
+        if not (self.use_robots and self.session is not None):
+            return
+        with rate.robots_lock:
+            checked = rate.robots_checked_at
+            if checked and datetime.fromisoformat(checked) > datetime.now(timezone.utc) - ROBOTS_TTL:
+                return
+            parts = urlsplit(url)
+            robots_url = f"{parts.scheme}://{parts.netloc}/robots.txt"
+            crawl_delay = None
+            try:
+                response = self.session.get(robots_url, timeout=ROBOTS_TIMEOUT)
+                if response.status_code == 200:
+                    crawl_delay = parse_crawl_delay(response.text,
+                                                    self.session.headers.get('User-Agent', '*'))
+            except Exception as e:
+                print(f"robots.txt를 확인하지 못했습니다 ({robots_url}): {e}")
+            with rate.lock:
+                rate.robots_checked_at = datetime.now(timezone.utc).isoformat()
+                rate.crawl_delay = float(crawl_delay) if crawl_delay else None
+                if rate.crawl_delay:
+                    rate.max_rate = min(self.max_rate, 1.0 / rate.crawl_delay)
+                    # 학습한 속도가 없으면 사이트가 허용한 속도에서 시작합니다.
+                    learned = self._state.get(host, {}).get('rate')
+                    rate.rate = min(rate.rate, rate.max_rate) if learned else rate.max_rate
+                    print(f"{host}: robots.txt Crawl-delay {rate.crawl_delay:g}초")
+
+    def acquire(self, url):
+        """``url`` 의 호스트로 요청을 보낼 차례까지 기다립니다.
+
+        Retry-After로 ``max_wait`` 보다 오래 막혀 있으면 기다리지 않고 False를 반환합니다.
+        """
+        host = urlsplit(url).netloc.lower()
+        rate = self._host(host)
+        self._check_robots(url, host, rate)
+        if rate.blocked_until - time.time() > self.max_wait:
+            print(f"{host}: Retry-After로 {rate.blocked_until - time.time():.0f}초 동안 요청하지 않습니다")
+            return False
+        wait = rate.reserve(self.burst)
+        if wait > 0:
+            time.sleep(wait)
+        self._local.responded = False
+        self._local.retry_later = None
+        return True
+
+    def call(self, url, fn, *args, **kwargs):
+        """``url`` 의 차례를 기다려 ``fn(url, *args, **kwargs)`` 를 실행하고 결과를 반환합니다.
+
+        응답이 429/503이면 이미 줄인 속도와 Retry-After에 따라 기다린 뒤 최대
+        ``throttle_retries`` 번 다시 실행합니다. 호스트가 ``max_wait`` 보다 오래 막혀 있으면
+        ``HostBlocked`` 를 발생시킵니다.
+        """
+        attempt = 0
+        while True:
+            if not self.acquire(url):
+                raise HostBlocked(url)
+            try:
+                result = fn(url, *args, **kwargs)
+            except Exception:
+                self.finish(url, None)
+                if not self._retry_later(url, attempt):
+                    raise
+            else:
+                self.finish(url, result)
+                if not self._retry_later(url, attempt):
+                    return result
+            attempt += 1
+
+    def _retry_later(self, url, attempt):
+        status = getattr(self._local, 'retry_later', None)
+        if status is None or attempt >= self.throttle_retries:
+            return False
+        print(f"{urlsplit(url).netloc.lower()}: 응답 {status}, 속도를 낮춰 다시 요청합니다: {url}")
+        return True
+
+    def record(self, host, status, latency=None, retry_after=None):
+        """응답 하나를 반영합니다. ``status`` 가 None이면 연결 실패로 봅니다."""
+        rate = self._host(host)
+        with rate.lock:
+            rate.requests += 1
+        if retry_after:
+            rate.block_for(retry_after)
+        if status is None or status in THROTTLE_STATUSES:
+            rate.decrease(self.decrease_factor, self.min_rate)
+            return
+        if latency is not None:
+            with rate.lock:
+                baseline = rate.latency
+                rate.latency = latency if baseline is None else baseline * 0.8 + latency * 0.2
+            if baseline is not None and latency > SLOW_LATENCY and latency > baseline * SLOW_FACTOR:
+                rate.decrease(self.decrease_factor, self.min_rate)
+                return
+        rate.increase(self.increase_step)
+
+    def response_hook(self, response, *args, **kwargs):
+        """요청의 ``response`` 훅. 상태 코드, 지연, Retry-After를 원래 요청한 호스트에 기록합니다."""
+        first = response.history[0] if response.history else response
+        host = urlsplit(first.request.url).netloc.lower()
+        retry_after = None
+        if response.status_code in THROTTLE_STATUSES:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        self.record(host, response.status_code, response.elapsed.total_seconds(), retry_after)
+        self._local.responded = True
+        self._local.retry_later = response.status_code if response.status_code in RETRY_LATER_STATUSES else None
+        return response
+
+    def finish(self, url, result):
+        """요청 작업이 끝난 뒤 호출됩니다. 응답 없이 실패했으면 연결 실패로 기록합니다."""
+        if result is None and not getattr(self._local, 'responded', True):
+            self.record(urlsplit(url).netloc.lower(), None)
+
+    def summary(self):
+        """호스트별 ``(초당 속도, 요청 수, 감속 횟수, Crawl-delay)``."""
+        with self._lock:
+            hosts = dict(self._hosts)
+        return {host: (rate.rate, rate.requests, rate.throttled, rate.crawl_delay)
+                for host, rate in sorted(hosts.items())}
+
+    def save(self):
+        if not (self.enabled and self.path):
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            for host, rate in self._hosts.items():
+                with rate.lock:
+                    self._state[host] = {
+                        'rate': round(rate.rate, 4),
+                        'crawl_delay': rate.crawl_delay,
+                        'robots_checked_at': rate.robots_checked_at,
+                        'blocked_until': (datetime.fromtimestamp(rate.blocked_until, timezone.utc).isoformat()
+                                          if rate.blocked_until > time.time() else None),
+                        'updated_at': now,
+                    }
+            state = dict(self._state)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def start_rate(min_interval):
+    """고정 간격 설정(``--min-interval``)에 해당하는 시작 속도(초당 요청 수)."""
+    return 1.0 / min_interval if min_interval else DEFAULT_MAX_RATE
+
+
+def format_rate_summary(summary):
+    """실행 요약에 출력할 호스트별 속도 문자열."""
+    lines = ["호스트별 요청 속도:"]
+    for host, (rate, requests, throttled, crawl_delay) in summary.items():
+        robots = f", Crawl-delay {crawl_delay:g}초" if crawl_delay else ""
+        lines.append(f"  {host}: {rate:.2f}회/초, 응답 {requests}건, 감속 {throttled}회{robots}")
+    return '\n'.join(lines)
@@ -0,0 +1,387 @@
+"""본문이 비어 있는 기사를 다시 내려받아 채우는 일괄 복구(backfill)와 재추출.
+
+수집 단계의 복구는 기사가 아직 피드에 있을 때만 동작하므로, 이 모듈은
+articles 테이블을 ``id`` 키셋 페이지네이션으로 훑어 ``full_content`` 가 NULL이거나
+비어 있는(옵션으로 요약과 같은) 행을 찾습니다. 소스별 ``Extractor`` 로
+호스트별 제한을 지키며 동시에 다시 추출하고, 결과는 ``ArticleWriter`` 로
+기존 행에만 ``batch_size`` 개씩 묶어 update 합니다. (``writer.SUPABASE_SCHEMA``) 페이지마다 진행 상황을 파일에 남기므로 수만 건을
+여러 번에 나눠 처리할 수 있습니다.
+
+``reextract_articles`` 는 추출기를 고친 뒤 HTML 캐시에 보관된 페이지를 내려받지
+않고 다시 추출해 ``full_content`` 를 갱신합니다. (본문 뒤를 읽지 않고 캐시된 페이지만
+끝까지 다시 내려받습니다)
+"""
+import json
+import os
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+from urllib.parse import urlsplit
+
+from news_collector.clients import get_session, get_supabase
+from news_collector.dedup import fetch_existing
+from news_collector.extract import ExtractionPool, get_extractor
+from news_collector.htmlcache import DEFAULT_HTML_CACHE_DIR, HtmlCache
+from news_collector.leases import (DEFAULT_LEASE_PATH, DEFAULT_LEASE_TTL, KIND_LINK, LeaseCoordinator,
+                                   open_lease_store)
+from news_collector.ratelimit import DEFAULT_RATE_STATE_PATH, AdaptiveRateLimiter, start_rate
+from news_collector.scheduler import FetchScheduler
+from news_collector.seen import DEFAULT_SEEN_INDEX_PATH, SeenIndex
+from news_collector.sources import SOURCES
+from news_collector.writer import ArticleWriter
+
+DEFAULT_REPAIR_STATE_PATH = os.path.join('.cache', 'repair_state.json')
+
+REPAIR_COLUMNS = 'id, link, title, summary, full_content, source'
+
+
+@dataclass
+class RepairOptions:
+    """``repair_articles`` 한 번의 설정. ``repair`` 명령의 인자가 이 값으로 바뀝니다."""
+    # 한 번에 읽을 행 수와 이번 실행에서 훑을 최대 행 수 (None이면 끝까지)
+    page_size: int = 500
+    limit: Optional[int] = None
+    # True면 요약과 같은 본문도 복구 대상으로 봅니다.
+    include_summary_only: bool = False
+    # 진행 위치 파일. restart면 저장된 위치를 무시하고 처음부터 훑습니다.
+    state_path: str = DEFAULT_REPAIR_STATE_PATH
+    restart: bool = False
+    # 호스트별 동시 다운로드 수와 요청 간 최소 간격(초). 적응형 속도 제한에서는 시작 속도로만 쓰입니다.
+    per_host_concurrency: int = 2
+    min_interval: float = 1.0
+    adaptive_rate: bool = True
+    rate_state_path: str = DEFAULT_RATE_STATE_PATH
+    # 한 번의 update 요청으로 보낼 최대 행 수
+    batch_size: int = 50
+    # False면 lxml 빠른 경로 없이 항상 문서 전체를 html.parser로 파싱합니다.
+    fast_extract: bool = True
+    seen_index_path: str = DEFAULT_SEEN_INDEX_PATH
+    use_seen_index: bool = True
+    html_cache_dir: str = DEFAULT_HTML_CACHE_DIR
+    use_html_cache: bool = True
+    # 'sqlite' 또는 'supabase'면 같은 run_id로 실행된 작업자들이 대상 링크를 lease로 나눠 복구합니다.
+    lease_backend: Optional[str] = None
+    lease_path: str = DEFAULT_LEASE_PATH
+    run_id: Optional[str] = None
+    worker_id: Optional[str] = None
+    lease_ttl: float = DEFAULT_LEASE_TTL
+
+
+def _host(url):
+    host = (urlsplit(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def source_for_row(row, registry=SOURCES):
+    """행의 source 이름으로, 없으면 링크의 호스트로 소스 정의를 찾습니다. 못 찾으면 None."""
+    name = row.get('source')
+    for source in registry.values():
+        if source.name == name:
+            return source
+    host = _host(row.get('link') or '')
+    if not host:
+        return None
+    for source in registry.values():
+        if any(host == _host(url) or host.endswith('.' + _host(url)) for url in source.feed_urls):
+            return source
+    return None
+
+
+def needs_repair(row, include_summary_only=False):
+    """본문이 없거나 비어 있으면 True. ``include_summary_only`` 면 요약과 같은 본문도 포함합니다."""
+    content = (row.get('full_content') or '').strip()
+    if not content:
+        return True
+    return include_summary_only and content == (row.get('summary') or '').strip()
+
+
+class RepairProgress:
+    """마지막으로 끝낸 ``id`` 와 누적 건수를 파일에 저장해 중단된 복구를 이어서 실행합니다."""
+
+    def __init__(self, path=DEFAULT_REPAIR_STATE_PATH, restart=False):
+        self.path = path
+        self.last_id = None
+        self.counts = {}
+        if path and os.path.exists(path) and not restart:
+            try:
+                with open(path, encoding='utf-8') as f:
+                    state = json.load(f)
+                self.last_id = state.get('last_id')
+                self.counts = state.get('counts', {})
+            except (OSError, ValueError) as e:
+                print(f"복구 진행 파일을 읽지 못해 처음부터 시작합니다 ({path}): {e}")
+
+    def add(self, counts):
+        for name, value in counts.items():
+            self.counts[name] = self.counts.get(name, 0) + value
+
+    def save(self):
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'last_id': self.last_id,
+                'counts': self.counts,
+                'updated_at': datetime.now(timezone.utc).isoformat(),
+            }, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class Repairer:
+    """페이지 단위로 복구 대상을 찾아 다시 추출하고 저장합니다."""
+
+    def __init__(self, supabase, session, scheduler, writer, options=None, registry=SOURCES, sources=None,
+                 html_cache=None, rate_limiter=None, leases=None):
+        options = options if options is not None else RepairOptions()
+        self.supabase = supabase
+        self.session = session
+        self.scheduler = scheduler
+        self.writer = writer
+        self.html_cache = html_cache
+        self.hooks = {'response': [rate_limiter.response_hook]} if rate_limiter is not None else None
+        self.registry = registry
+        # 복구할 소스 key 집합 (None이면 전체)
+        self.sources = set(sources) if sources is not None else None
+        self.fast_extract = options.fast_extract
+        self.page_size = options.page_size
+        self.include_summary_only = options.include_summary_only
+        # 설정되면 여러 작업자가 같은 링크를 복구하지 않도록 페이지마다 링크 lease를 잡습니다.
+        self.leases = leases
+
+    def fetch_page(self, last_id):
+        query = self.supabase.table('articles').select(REPAIR_COLUMNS)
+        if not self.include_summary_only:
+            # 요약과 같은 본문은 서버에서 거를 수 없으므로 그 경우에만 전체를 훑습니다.
+            query = query.or_('full_content.is.null,full_content.eq.')
+        if last_id is not None:
+            query = query.gt('id', last_id)
+        return query.order('id').limit(self.page_size).execute().data
+
+    def repair_page(self, rows):
+        """한 페이지의 대상 행을 동시에 다시 추출해 writer에 넘기고 건수를 반환합니다."""
+        counts = {'scanned': len(rows)}
+        targets = []
+        for row in rows:
+            if not needs_repair(row, self.include_summary_only):
+                continue
+            source = source_for_row(row, self.registry)
+            if source is None:
+                counts['unknown_source'] = counts.get('unknown_source', 0) + 1
+                continue
+            if self.sources is not None and source.key not in self.sources:
+                continue
+            targets.append((row, source))
+        if targets and self.leases is not None:
+            claimed = self.leases.claim_links([row['link'] for row, _ in targets])
+            if len(claimed) < len(targets):
+                counts['leased_elsewhere'] = len(targets) - len(claimed)
+            targets = [(row, source) for row, source in targets if row['link'] in claimed]
+        jobs = [(row, source, self.scheduler.submit(row['link'], self._fetch, source)) for row, source in targets]
+
+        for row, source, future in jobs:
+            content = future.result()
+            label = row.get('title') or row['link']
+            if not content or content.strip() == (row.get('full_content') or '').strip():
+                print(f"Could not repair: {label}")
+                counts['still_missing'] = counts.get('still_missing', 0) + 1
+                continue
+            update = {"link": row['link'], "full_content": content}
+            if not row.get('source'):
+                update["source"] = source.name
+            self.writer.update(update, label=label)
+            counts['queued'] = counts.get('queued', 0) + 1
+        return counts
+
+    def _fetch(self, url, source):
+        extractor = get_extractor(source, fast=self.fast_extract)
+        downloaded = self.html_cache.get(url) if self.html_cache is not None else None
+        if downloaded is None:
+            downloaded = extractor.download(url, self.session, hooks=self.hooks)
+            if downloaded is not None and self.html_cache is not None:
+                self.html_cache.put(url, source.key, *downloaded)
+        return extractor.extract_downloaded(downloaded, url)
+
+    def run(self, progress, limit=None):
+        """진행 파일의 위치부터 끝까지(또는 ``limit`` 행을 훑을 때까지) 복구합니다."""
+        scanned = 0
+        while limit is None or scanned < limit:
+            rows = self.fetch_page(progress.last_id)
+            if not rows:
+                break
+            written = len(self.writer.results)
+            counts = self.repair_page(rows)
+            # 페이지의 수정 사항이 저장된 뒤에만 진행 위치를 옮깁니다.
+            self.writer.flush()
+            results = self.writer.results[written:]
+            if self.leases is not None:
+                # 저장까지 끝난 링크는 이번 run에서 다른 작업자가 다시 잡지 않도록 완료로 표시합니다.
+                self.leases.finish(KIND_LINK, [result.link for result in results if result.ok])
+            counts['repaired'] = sum(1 for result in results if result.ok)
+            counts['failed'] = sum(1 for result in results if not result.ok)
+            progress.last_id = rows[-1]['id']
+            progress.add(counts)
+            progress.save()
+            scanned += len(rows)
+            print(f"Repair progress: id <= {progress.last_id}, "
+                  + ", ".join(f"{name} {value}" for name, value in sorted(progress.counts.items())))
+        return progress.counts
+
+
+def repair_articles(names=None, options=None, supabase=None, session=None, registry=None):
+    """본문이 빈 기사를 복구하고, 오류로 중단되면 1을 반환합니다.
+
+    ``names`` 는 복구할 소스 key 목록입니다. (None이면 전체) ``options`` 는
+    ``RepairOptions`` 입니다. 진행 위치는 ``options.state_path`` 에 저장되어 다음 실행이
+    이어서 처리하며, ``restart`` 면 처음부터 다시 훑습니다. 복구한 링크는 로컬 링크
+    인덱스에도 완료로 기록됩니다. HTML 캐시에 최근(TTL 안) 받은 페이지가 있으면
+    다시 내려받지 않습니다.
+
+    ``lease_backend`` 를 주면 같은 ``run_id`` 로 실행된 여러 작업자가 페이지마다
+    대상 링크를 lease로 나눠 복구합니다. (작업자마다 ``state_path`` 를 따로 둡니다)
+    """
+    options = options if options is not None else RepairOptions()
+    supabase = supabase if supabase is not None else get_supabase()
+    session = session if session is not None else get_session()
+    registry = registry if registry is not None else SOURCES
+    rate_limiter = None
+    if options.adaptive_rate:
+        rate_limiter = AdaptiveRateLimiter(options.rate_state_path, start_rate=start_rate(options.min_interval),
+                                           session=session)
+        # 429/503은 세션이 안에서 재시도하지 않고 제한기가 보고 기다리게 합니다.
+        session.defer_throttling()
+    scheduler = FetchScheduler(per_host_concurrency=options.per_host_concurrency,
+                               min_interval=options.min_interval, limiter=rate_limiter)
+    seen = SeenIndex(options.seen_index_path, enabled=options.use_seen_index)
+    # 페이지마다 직접 flush 하므로 주기적 저장은 쓰지 않습니다.
+    writer = ArticleWriter(supabase, batch_size=options.batch_size, flush_interval=0, on_result=seen.record_write)
+    html_cache = HtmlCache(options.html_cache_dir, enabled=options.use_html_cache)
+    progress = RepairProgress(options.state_path, restart=options.restart)
+    leases = None
+    if options.lease_backend:
+        leases = LeaseCoordinator(open_lease_store(options.lease_backend, options.lease_path, supabase),
+                                  options.run_id, worker_id=options.worker_id, ttl=options.lease_ttl).start()
+    repairer = Repairer(supabase, session, scheduler, writer, options, registry=registry, sources=names,
+                        html_cache=html_cache, rate_limiter=rate_limiter, leases=leases)
+    exit_code = 0
+    try:
+        counts = repairer.run(progress, limit=options.limit)
+    except Exception:
+        exit_code = 1
+        counts = progress.counts
+        print(f"복구 중단 (id {progress.last_id} 까지 저장됨):\n{traceback.format_exc()}")
+    finally:
+        scheduler.shutdown()
+        writer.close()
+        if leases is not None:
+            leases.stop()
+        html_cache.close()
+        seen.close()
+        if rate_limiter is not None:
+            rate_limiter.save()
+    print("복구 결과: " + (", ".join(f"{name} {value}" for name, value in sorted(counts.items())) or "대상 없음"))
+    if writer.failed():
+        exit_code = 1
+    return exit_code
+
+
+def _download_full(url, source, session, html_cache, fast_extract):
+    """본문 뒤를 읽지 않고 캐시된 페이지를 끝까지 다시 내려받아 캐시의 페이지를 바꿉니다."""
+    downloaded = get_extractor(source, fast=fast_extract).download(url, session, stop_early=False)
+    if downloaded is not None:
+        html_cache.put(url, source.key, *downloaded)
+    return downloaded
+
+
+def reextract_articles(names, since=None, extract_processes=0, fast_extract=True, batch_size=50,
+                       dry_run=False, html_cache_dir=DEFAULT_HTML_CACHE_DIR,
+                       seen_index_path=DEFAULT_SEEN_INDEX_PATH, use_seen_index=True,
+                       refetch_truncated=True, per_host_concurrency=2, min_interval=1.0,
+                       supabase=None, session=None, registry=None):
+    """HTML 캐시에 있는 ``names`` 소스의 페이지를 다시 추출해 ``full_content`` 를 갱신합니다.
+
+    articles 테이블에 이미 있는 링크의 페이지만 처리하며, 행을 새로 만들지 않습니다.
+    본문이 끝난 뒤를 읽지 않은 페이지는 바뀐 선택자가 그 뒤의 마크업을 볼 수 있으므로
+    호스트별 제한을 지키며 끝까지 다시 내려받아 추출합니다. ``refetch_truncated`` 가
+    False면 그런 페이지는 건너뜁니다.
+
+    ``since`` (datetime)를 주면 그 이후에 받은 페이지만 처리합니다. ``extract_processes``
+    가 0이 아니면 추출을 그만큼의 프로세스에서 실행합니다. (None이면 CPU 코어 수)
+    ``dry_run`` 이면 추출 결과만 세고 저장하지 않습니다. 저장에 실패한 행이 있으면 1을 반환합니다.
+    """
+    registry = registry if registry is not None else SOURCES
+    html_cache = HtmlCache(html_cache_dir)
+    pool = ExtractionPool(extract_processes, fast=fast_extract) if extract_processes != 0 else None
+    writer = seen = None
+    if not dry_run:
+        supabase = supabase if supabase is not None else get_supabase()
+        seen = SeenIndex(seen_index_path, enabled=use_seen_index)
+        writer = ArticleWriter(supabase, batch_size=batch_size, flush_interval=0, on_result=seen.record_write)
+    counts = {}
+    scheduler = None
+    refetches = {}
+
+    def extract(item):
+        source, page = item
+        if page.truncated:
+            downloaded = refetches[page.url].result()
+            if downloaded is None:
+                return source, page, None
+        else:
+            html = html_cache.load(page.digest)
+            if html is None:
+                return source, page, None
+            downloaded = (html, page.encoding)
+        if pool is not None:
+            return source, page, pool.extract_downloaded(source, downloaded, page.url)
+        return source, page, get_extractor(source, fast=fast_extract).extract_downloaded(downloaded, page.url)
+
+    try:
+        items = [(registry[name], page) for name in names
+                 for page in html_cache.pages(source=registry[name].key, since=since)]
+        if writer is not None:
+            # 저장되지 않은 링크(실패, 유사 중복으로 건너뜀, 이후 삭제)의 페이지는 다시 추출하지 않습니다.
+            existing = fetch_existing(supabase, [page.url for _, page in items], columns='link')
+            missing = sum(1 for _, page in items if page.url not in existing)
+            if missing:
+                counts['not_in_db'] = missing
+                items = [(source, page) for source, page in items if page.url in existing]
+        truncated = [(source, page) for source, page in items if page.truncated]
+        if truncated and not refetch_truncated:
+            counts['skipped_truncated'] = len(truncated)
+            items = [(source, page) for source, page in items if not page.truncated]
+        elif truncated:
+            print(f"끝까지 받지 않은 페이지 {len(truncated)}개를 다시 내려받습니다")
+            session = session if session is not None else get_session()
+            scheduler = FetchScheduler(per_host_concurrency=per_host_concurrency, min_interval=min_interval)
+            refetches = {page.url: scheduler.submit(page.url, _download_full, source, session, html_cache,
+                                                    fast_extract)
+                         for source, page in truncated}
+            counts['refetched'] = len(truncated)
+        print(f"캐시된 페이지 {len(items)}개를 다시 추출합니다")
+        workers = pool.processes if pool is not None else 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for source, page, content in executor.map(extract, items):
+                event = 'extracted' if content else 'still_missing'
+                counts[event] = counts.get(event, 0) + 1
+                if content and writer is not None:
+                    writer.update({"link": page.url, "full_content": content})
+    finally:
+        if scheduler is not None:
+            scheduler.shutdown()
+        if pool is not None:
+            pool.shutdown()
+        if writer is not None:
+            writer.close()
+            seen.close()
+        html_cache.close()
+    if writer is not None:
+        counts['saved'] = len(writer.results) - len(writer.failed())
+        counts['failed'] = len(writer.failed())
+    print("재추출 결과: " + (", ".join(f"{name} {value}" for name, value in sorted(counts.items())) or "대상 없음"))
+    return 1 if writer is not None and writer.failed() else 0
@@ -0,0 +1,236 @@
+"""여러 소스를 하나의 프로세스에서 동시에 실행합니다."""
+import os
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+from news_collector.checkpoints import CheckpointStore
+from news_collector.clients import get_session, get_supabase
+from news_collector.context import RunContext, RunOptions
+from news_collector.engine import collect
+from news_collector.extract import ExtractionPool, get_extractor
+from news_collector.feeds import FeedCache
+from news_collector.htmlcache import HtmlCache
+from news_collector.http_client import format_connection_stats
+from news_collector.leases import DEFAULT_LEASE_SLOTS, KIND_SOURCE, LeaseCoordinator, open_lease_store
+from news_collector.metrics import RUN_SCOPE, RunMetrics
+from news_collector.neardup import NearDuplicateIndex
+from news_collector.ratelimit import AdaptiveRateLimiter, format_rate_summary, start_rate
+from news_collector.scheduler import FetchScheduler
+from news_collector.seen import SeenIndex
+from news_collector.sources import SOURCES
+from news_collector.spool import WriteSpool
+from news_collector.writer import ArticleWriter
+
+
+def resolve_sources(spec):
+    """'all' 또는 쉼표로 구분된 소스 이름 목록을 소스 이름 리스트로 바꿉니다."""
+    if spec == "all":
+        return list(SOURCES)
+    names = [name.strip() for name in spec.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SOURCES]
+    if unknown:
+        raise ValueError(f"알 수 없는 소스: {', '.join(unknown)} (사용 가능: {', '.join(SOURCES)})")
+    return names
+
+
+def _run_all(names, fn, workers):
+    """모든 ``names`` 에 ``fn`` 을 동시에 실행하고 끝난 순서대로 ``(name, 예외 또는 None)`` 을 내보냅니다."""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fn, name): name for name in names}
+        for future in as_completed(futures):
+            yield futures[future], future.exception()
+
+
+def describe_run(names, options=None, registry=None):
+    """원격 서비스에 접속하지 않고 소스별 처리 계획과 로컬 상태를 출력합니다.
+
+    추출기 선택자를 컴파일해 소스 정의를 검증하고, 상태 파일은 읽기만 합니다.
+    (없는 파일을 만들지 않습니다) 소스 정의에 문제가 있으면 1을 반환합니다.
+    """
+    options = options if options is not None else RunOptions()
+    registry = registry if registry is not None else SOURCES
+    feeds = FeedCache(options.feed_state_path, enabled=options.use_feed_cache)
+    checkpoints = CheckpointStore(options.checkpoint_path, enabled=options.use_checkpoints,
+                                  overlap=options.overlap, catch_up=options.catch_up)
+    now = datetime.now(timezone.utc)
+    exit_code = 0
+    print(f"[dry-run] {len(names)}개 소스, 네트워크와 Supabase에 접속하지 않습니다")
+    for name in names:
+        source = registry[name]
+        try:
+            get_extractor(source, fast=options.fast_extract)
+            extractor_state = f"선택자 {len(source.selectors)}개"
+        except Exception as e:
+            exit_code = 1
+            extractor_state = f"선택자 오류: {e}"
+        window = checkpoints.begin(source.key, now)
+        mark = window.mark.isoformat() if window.mark else "없음 (최근 24시간)"
+        print(f"[{name}] {source.name}: {extractor_state}, 체크포인트 {mark}, "
+              f"{window.cutoff.isoformat(timespec='seconds')} 이후 항목 처리")
+        for feed_url in source.feed_urls:
+            state = feeds.validators(feed_url)
+            conditional = "조건부 요청" if state.get('etag') or state.get('last_modified') else "전체 요청"
+            print(f"  {feed_url} ({conditional})")
+    # 없는 인덱스 파일을 새로 만들지 않도록 있을 때만 엽니다.
+    if options.use_seen_index and os.path.exists(options.seen_index_path):
+        seen = SeenIndex(options.seen_index_path)
+        counts = seen.counts()
+        seen.close()
+        print(f"링크 인덱스: {sum(counts.values())}건 ({options.seen_index_path})")
+    if options.use_spool and os.path.exists(options.spool_path):
+        spool = WriteSpool(options.spool_path)
+        counts = spool.counts()
+        spool.close()
+        print(f"스풀: 다시 보낼 행 {counts.get('pending', 0)}건, 포기한 행 {counts.get('dead', 0)}건")
+    return exit_code
+
+
+def run_sources(names, options=None, supabase=None, session=None, registry=None, metrics=None):
+    """소스들을 스레드 풀에서 동시에 수집하고, 하나라도 실패하면 1을 반환합니다.
+
+    설정은 ``options`` (``RunOptions``, None이면 기본값)로 받습니다. 각 값의 의미는
+    ``RunOptions`` 를 보세요.
+
+    기사 다운로드는 모든 소스가 공유하는 ``FetchScheduler`` 를 거치므로
+    호스트별 제한은 소스가 달라도 함께 적용됩니다. 저장도 하나의
+    ``ArticleWriter`` 가 모아서 일괄 upsert 하며, 저장에 실패한 행이 있어도 1을 반환합니다.
+    피드 상태와 체크포인트는 writer가 모든 행을 저장한 뒤에 저장에 성공한 만큼만 확정합니다.
+
+    ``options.lease_backend`` 를 주면 같은 ``run_id`` 로 실행된 여러 작업자가 소스와 새 링크를
+    lease로 나눠 처리합니다. 이 작업자는 잡은 소스만 한 번에 ``max_workers`` 개(기본값 2)씩
+    수집하고, 다른 작업자가 잡은 소스는 끝나거나 lease가 만료될 때까지 기다립니다. 저장한
+    링크의 lease는 완료로 표시하므로 다른 작업자가 다시 내려받지 않습니다. (``leases``)
+
+    ``options.dry_run`` 이 True면 네트워크나 Supabase에 접속하지 않고 소스 정의와 로컬 상태만
+    확인해 이번 실행이 처리할 내용을 출력합니다. (``describe_run``)
+
+    ``supabase``, ``session``, ``registry``, ``metrics`` 를 넘기면 기본 클라이언트,
+    ``SOURCES``, 새 ``RunMetrics`` 대신 사용합니다. (벤치마크 등에서 가짜 백엔드를 쓸 때)
+    """
+    options = options if options is not None else RunOptions()
+    registry = registry if registry is not None else SOURCES
+    if options.dry_run:
+        return describe_run(names, options, registry=registry)
+    supabase = supabase if supabase is not None else get_supabase()
+    session = session if session is not None else get_session()
+    metrics = metrics if metrics is not None else RunMetrics()
+    rate_limiter = None
+    if options.adaptive_rate:
+        rate_limiter = AdaptiveRateLimiter(options.rate_state_path, start_rate=start_rate(options.min_interval),
+                                           session=session)
+        # 429/503은 세션이 안에서 재시도하지 않고 제한기가 보고 기다리게 합니다.
+        session.defer_throttling()
+    scheduler = FetchScheduler(per_host_concurrency=options.per_host_concurrency,
+                               min_interval=options.min_interval, limiter=rate_limiter)
+    seen = SeenIndex(options.seen_index_path, enabled=options.use_seen_index)
+    checkpoints = CheckpointStore(options.checkpoint_path, enabled=options.use_checkpoints,
+                                  overlap=options.overlap, catch_up=options.catch_up)
+    neardup = NearDuplicateIndex(options.neardup_index_path, enabled=options.use_neardup)
+    html_cache = HtmlCache(options.html_cache_dir, enabled=options.use_html_cache,
+                           max_bytes=options.html_cache_max_bytes, ttl=options.html_cache_ttl)
+    feeds = FeedCache(options.feed_state_path, enabled=options.use_feed_cache)
+    leases = None
+    if options.lease_backend:
+        leases = LeaseCoordinator(open_lease_store(options.lease_backend, options.lease_path, supabase),
+                                  options.run_id, worker_id=options.worker_id, ttl=options.lease_ttl).start()
+        print(f"작업자 {leases.worker_id}: run {options.run_id}의 소스를 lease로 나눠 처리합니다")
+
+    def on_result(row, result):
+        seen.record_write(row, result)
+        checkpoints.record_write(row, result)
+        feeds.record_write(row, result)
+        neardup.record_write(row, result)
+        if leases is not None:
+            leases.record_write(row, result)
+        metrics.record_write(row, result)
+
+    spool = WriteSpool(options.spool_path, enabled=options.use_spool)
+    writer = ArticleWriter(supabase, batch_size=options.batch_size, flush_interval=options.flush_interval,
+                           on_result=on_result, observer=metrics.stage_observer(RUN_SCOPE), spool=spool)
+    # 지난 실행에서 남은 행을 먼저 보내야 이번 실행의 중복 확인이 그 행들을 봅니다.
+    replayed, replay_failed = spool.replay(
+        writer, before_add=lambda row: metrics.expect_write(row['link'], RUN_SCOPE, 'replayed'))
+    if replayed:
+        print(f"스풀 재전송: {replayed - replay_failed}건 저장, {replay_failed}건 실패")
+    extraction_pool = None
+    extract_workers = 1
+    if options.extract_processes != 0:
+        extraction_pool = ExtractionPool(options.extract_processes, fast=options.fast_extract)
+        # 프로세스가 놀지 않도록 소스마다 프로세스 수만큼 추출 요청을 보냅니다.
+        extract_workers = extraction_pool.processes
+    ctx = RunContext(supabase=supabase, session=session, scheduler=scheduler, writer=writer,
+                     feeds=feeds, seen=seen, checkpoints=checkpoints, neardup=neardup,
+                     html_cache=html_cache, options=options,
+                     extract_workers=extract_workers, extraction_pool=extraction_pool,
+                     rate_limiter=rate_limiter, leases=leases, metrics=metrics)
+
+    failed = []
+    collected = []
+    started = time.monotonic()
+
+    def collect_source(name):
+        collect(ctx, registry[name])
+
+    if leases is None:
+        outcomes = _run_all(names, collect_source, options.max_workers or len(names))
+    else:
+        # 이 작업자가 lease를 잡은 소스만 수집합니다.
+        outcomes = leases.run_claimed(KIND_SOURCE, names, collect_source,
+                                      options.max_workers or DEFAULT_LEASE_SLOTS)
+    for name, error in outcomes:
+        collected.append(name)
+        if error is None:
+            print(f"[{name}] 수집 완료")
+        else:
+            failed.append(name)
+            trace = ''.join(traceback.format_exception(type(error), error, error.__traceback__))
+            print(f"[{name}] 수집 실패:\n{trace}")
+    scheduler.shutdown()
+    if extraction_pool is not None:
+        extraction_pool.shutdown()
+    writer.close()
+    # 저장한 링크의 lease는 완료로 표시하고, 남은 lease(저장하지 못한 링크)는 놓아 다른 작업자가
+    # 이어받게 합니다. 모든 행이 저장된 뒤에 해야 저장 결과를 알 수 있습니다.
+    if leases is not None:
+        leases.stop()
+    # writer가 모든 행을 저장한 뒤에야 어떤 기사가 실패했는지 알 수 있습니다.
+    feeds.save()
+    checkpoints.save()
+    neardup.close()
+    html_cache.close()
+    seen.close()
+    spool_counts = spool.counts()
+    if rate_limiter is not None:
+        rate_limiter.save()
+    spool.close()
+
+    failed_rows = writer.failed()
+    elapsed = time.monotonic() - started
+    print(f"{len(collected)}개 소스 수집 종료 ({elapsed:.1f}초), 실패: {', '.join(failed) or '없음'}")
+    if leases is not None:
+        print(f"이 작업자가 수집한 소스: {', '.join(collected) or '없음'}")
+    print(f"저장 {len(writer.results) - len(failed_rows)}건, 저장 실패 {len(failed_rows)}건, "
+          f"DB 쓰기 요청 {writer.round_trips}회")
+    for result in failed_rows:
+        print(f"  저장 실패: {result.label} ({result.link}): {result.error}")
+    if spool_counts:
+        print(f"스풀에 남은 행: 다시 보낼 행 {spool_counts.get('pending', 0)}건, "
+              f"포기한 행 {spool_counts.get('dead', 0)}건")
+    if rate_limiter is not None:
+        print(format_rate_summary(rate_limiter.summary()))
+    if hasattr(session, 'connection_stats'):
+        print(format_connection_stats(session.connection_stats()))
+
+    exit_code = 1 if failed or failed_rows else 0
+    metrics.finish(exit_code)
+    for name in failed:
+        metrics.count(registry[name].key, "source_failed")
+    if options.report_path:
+        metrics.write_json(options.report_path)
+        print(f"실행 보고서: {options.report_path}")
+    if options.prometheus_path:
+        metrics.write_prometheus(options.prometheus_path)
+        print(f"Prometheus 지표: {options.prometheus_path}")
+    return exit_code
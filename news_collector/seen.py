@@ -0,0 +1,189 @@
+"""이미 수집한 링크를 기억하는 로컬 SQLite 인덱스.
+
+정규화한 링크마다 마지막 처리 상태(저장 완료, 본문 없음, 복구할 컬럼이 빈 행, 실패)를 기록해
+두고, 저장이 끝난 링크는 Supabase 조회나 다운로드 전에 걸러냅니다.
+CI 러너에서는 캐시로 복원하고, 캐시가 없으면 ``seen rebuild`` 로
+Supabase에서 다시 만들 수 있습니다.
+"""
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_SEEN_INDEX_PATH = os.path.join('.cache', 'seen.sqlite3')
+
+STATUS_INSERTED = 'inserted'
+STATUS_CONTENT_MISSING = 'content_missing'
+# 본문은 있지만 소스의 repair_columns 중 빈 컬럼이 있는 행 (예: source가 빈 MIT 기사)
+STATUS_INCOMPLETE = 'incomplete'
+STATUS_FAILED = 'failed'
+
+# 같은 기사를 가리키지만 링크마다 달라지는 추적용 쿼리 파라미터
+_TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid', 'mc_cid', 'mc_eid')
+
+# rebuild 때 비어 있으면 incomplete로 기록할 컬럼 (소스마다 다른 repair_columns를 모두 포함)
+REBUILD_REPAIR_COLUMNS = ('full_content', 'source')
+
+# SQLite의 바인딩 변수 제한보다 충분히 작게
+_QUERY_CHUNK_SIZE = 500
+
+
+def normalize_link(link):
+    """스킴/호스트 대소문자, 기본 포트, 프래그먼트, 추적 파라미터 차이를 없앤 링크."""
+    parts = urlsplit(link.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and not ((scheme == 'http' and parts.port == 80) or (scheme == 'https' and parts.port == 443)):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip('/') or '/'
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(_TRACKING_PARAMS)
+    ))
+    return urlunsplit((scheme, host, path, query, ''))
+
+
+class SeenIndex:
+    """링크별 처리 상태를 저장하는 스레드 안전한 SQLite 인덱스."""
+
+    def __init__(self, path=DEFAULT_SEEN_INDEX_PATH, enabled=True):
+        self.path = path
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._conn = None
+        if enabled:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS seen ('
+                ' key TEXT PRIMARY KEY,'
+                ' link TEXT NOT NULL,'
+                ' status TEXT NOT NULL,'
+                ' updated_at TEXT NOT NULL)'
+            )
+            self._conn.commit()
+
+    def statuses(self, links):
+        """``{link: status}`` — 인덱스에 없는 링크는 포함되지 않습니다."""
+        if not self.enabled:
+            return {}
+        by_key = {}
+        for link in links:
+            by_key.setdefault(normalize_link(link), []).append(link)
+        keys = list(by_key)
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), _QUERY_CHUNK_SIZE):
+                chunk = keys[start:start + _QUERY_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f'SELECT key, status FROM seen WHERE key IN ({placeholders})', chunk).fetchall()
+                for key, status in rows:
+                    for link in by_key[key]:
+                        found[link] = status
+        return found
+
+    def drop_complete(self, items, key=lambda item: item):
+        """이미 저장이 끝난 항목을 빼고 나머지를 순서대로 반환합니다."""
+        items = list(items)
+        statuses = self.statuses([key(item) for item in items])
+        remaining = [item for item in items if statuses.get(key(item)) != STATUS_INSERTED]
+        skipped = len(items) - len(remaining)
+        if skipped:
+            print(f"Skipping {skipped} already-ingested link(s) from the local seen index")
+        return remaining
+
+    def mark(self, link, status):
+        self.mark_many([(link, status)])
+
+    def mark_many(self, items):
+        """``(link, status)`` 목록을 기록합니다."""
+        if not self.enabled:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        rows = [(normalize_link(link), link, status, now) for link, status in items]
+        with self._lock:
+            self._conn.executemany(
+                'INSERT INTO seen (key, link, status, updated_at) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET link = excluded.link, status = excluded.status, '
+                'updated_at = excluded.updated_at',
+                rows)
+            self._conn.commit()
+
+    def mark_rows(self, rows, repair_columns=()):
+        """Supabase의 articles 행에서 상태를 판단해 기록합니다. (``status_for_row``)"""
+        self.mark_many([(row['link'], status_for_row(row, repair_columns)) for row in rows])
+
+    def record_write(self, row, result):
+        """``ArticleWriter`` 의 on_result 콜백으로 쓰입니다."""
+        if not result.ok:
+            self.mark(row['link'], STATUS_FAILED)
+        elif 'full_content' in row:
+            self.mark(row['link'], status_for_row(row))
+
+    def rebuild(self, supabase, page_size=1000):
+        """articles 테이블 전체를 link 기준 키셋 페이지네이션으로 읽어 인덱스를 다시 만듭니다."""
+        if not self.enabled:
+            return 0
+        with self._lock:
+            self._conn.execute('DELETE FROM seen')
+            self._conn.commit()
+        total = 0
+        last_link = None
+        while True:
+            query = supabase.table('articles').select('link, full_content, source').order('link').limit(page_size)
+            if last_link is not None:
+                query = query.gt('link', last_link)
+            rows = query.execute().data
+            if not rows:
+                break
+            # 행이 어느 소스의 것인지 모르므로 source가 빈 행은 모두 다시 확인하도록 둡니다.
+            self.mark_rows(rows, REBUILD_REPAIR_COLUMNS)
+            total += len(rows)
+            last_link = rows[-1]['link']
+            print(f"Rebuilt seen index: {total} links")
+        return total
+
+    def compact(self, max_age_days=30):
+        """오래된 항목을 지우고 파일을 압축합니다. 삭제한 행 수를 반환합니다.
+
+        피드에는 최근 기사만 나오므로 오래된 링크는 다시 나올 일이 거의 없고,
+        다시 나오더라도 Supabase 일괄 조회에서 걸러집니다.
+        """
+        if not self.enabled:
+            return 0
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=max_age_days)).isoformat()
+        with self._lock:
+            deleted = self._conn.execute('DELETE FROM seen WHERE updated_at < ?', (cutoff,)).rowcount
+            self._conn.commit()
+            self._conn.execute('VACUUM')
+        return deleted
+
+    def counts(self):
+        if not self.enabled:
+            return {}
+        with self._lock:
+            return dict(self._conn.execute('SELECT status, COUNT(*) FROM seen GROUP BY status').fetchall())
+
+    def close(self):
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+            self.enabled = False
+
+
+def status_for_row(row, repair_columns=()):
+    """본문이 없으면 content_missing, ``repair_columns`` 중 빈 컬럼이 있으면 incomplete, 아니면 inserted.
+
+    행에 없는 컬럼(조회하지 않았거나 update로 보내지 않은 컬럼)은 보지 않습니다.
+    """
+    if not row.get('full_content'):
+        return STATUS_CONTENT_MISSING
+    if any(column in row and not row[column] for column in repair_columns):
+        return STATUS_INCOMPLETE
+    return STATUS_INSERTED
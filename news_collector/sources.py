@@ -0,0 +1,145 @@
+"""뉴스 소스 정의.
+
+소스마다 다른 것은 피드 URL, 본문 선택자 순서, 제외 키워드, 문단 길이
+기준, 날짜 형식과 시간대뿐이므로 ``SourceDefinition`` 으로 선언하고
+``news_collector.engine`` 이 공통으로 실행합니다. 새 소스를 추가하려면
+``SOURCES`` 에 정의 하나를 넣으면 됩니다.
+"""
+from dataclasses import dataclass
+from datetime import timedelta, timezone
+
+# date_formats 에 strptime 형식 대신 넣을 수 있는 특수 값
+FEED_PARSED = 'feedparser:published_parsed'  # feedparser가 파싱한 UTC struct_time 사용
+                                             # (스트리밍 피드 파서의 항목에는 없어 다음 형식을 시도)
+DATEUTIL = 'dateutil'                        # dateutil.parser.parse 사용
+ISO8601 = 'iso8601'                          # datetime.fromisoformat 사용
+
+# news_collector.dates 는 이 형식을 email.utils 파서로 처리합니다. ('GMT' 등 시간대 이름도 허용)
+RFC822 = '%a, %d %b %Y %H:%M:%S %z'
+
+KST = timezone(timedelta(hours=9), 'KST')
+
+
+@dataclass(frozen=True)
+class SourceDefinition:
+    # 실행 시 지정하는 이름 (--sources)
+    key: str
+    # articles.source 컬럼에 저장되는 이름
+    name: str
+    feed_urls: tuple
+    # 본문 컨테이너 CSS 선택자. 앞에서부터 처음 찾은 요소를 사용합니다.
+    selectors: tuple
+    # 이 문구가 들어간 문단은 버립니다.
+    exclude_keywords: tuple = ()
+    # 이보다 짧은 문단은 버립니다. (keep_prefixes 로 시작하는 문단은 예외)
+    min_length: int = 0
+    keep_prefixes: tuple = ()
+    # True면 p.get_text(strip=True), False면 p.get_text().strip()
+    strip_text_nodes: bool = False
+    paragraph_separator: str = '\n'
+    # 앞에서부터 시도할 게시 시간 형식 (news_collector.dates 가 성공한 형식을 기억해 먼저 시도)
+    date_formats: tuple = (RFC822,)
+    # 시간대 표기가 없는 게시 시간을 해석할 시간대 (None이면 실행 환경의 로컬 시간)
+    naive_timezone: timezone = None
+    # 본문을 가져오지 못했을 때 요약을 대신 저장할지 여부
+    summary_fallback: bool = True
+    # 이미 저장된 기사라도 이 컬럼이 비어 있으면 다시 채웁니다.
+    repair_columns: tuple = ()
+    # 피드가 최신 항목부터 나열되면 True. 처리 범위보다 오래된 항목이 이어지면 피드 읽기를 멈춥니다.
+    newest_first: bool = False
+
+
+SOURCES = {
+    "irobotnews": SourceDefinition(
+        key="irobotnews",
+        name="iRobot News",
+        feed_urls=("https://www.irobotnews.com/rss/allArticle.xml",),
+        selectors=(
+            'div#article-view-content-div',  # iRobot News의 본문 ID
+            'div.article-view',
+            'div.entry-content',
+            'article',
+            'div.xe_content',  # XE 기반 사이트에서 자주 사용
+        ),
+        exclude_keywords=(
+            "남상엽 synam58@gmail.com", "다른기사 보기", "저작권자 © 로봇신문", "무단전재 및 재배포 금지",
+            "댓글", "회원로그인", "등록", "BEST댓글", "더보기", "많이 본 뉴스", "포토뉴스", "분야별 주요뉴스",
+            "개인정보처리방침", "이용약관", "PC버전", "서울시", "대표전화", "팩스", "All rights reserved",
+            "ND소프트", "이 기사를 공유합니다", "댓글삭제", "댓글수정", "비밀번호", "내 댓글 모음", "닫기",
+            "인쇄", "URL주소", "본문글씨", "줄이기", "키우기", "이메일", "다른 공유", "기사스크랩",
+        ),
+        # 너무 짧은 단락 (예: 이미지 캡션 등) 필터링, '▲'로 시작하는 사진 설명은 유지
+        min_length=50,
+        keep_prefixes=('▲',),
+        date_formats=('%Y-%m-%d %H:%M:%S', RFC822),
+        # 피드의 게시 시간은 시간대 없는 한국 시간입니다.
+        naive_timezone=KST,
+        # 전체 기사 피드 (최신순)
+        newest_first=True,
+    ),
+    "aitimes": SourceDefinition(
+        key="aitimes",
+        name="AITimes",
+        feed_urls=("https://www.aitimes.com/rss/allArticle.xml",),
+        selectors=('div.article-body', 'div.content', 'article', 'div.entry-content'),
+        exclude_keywords=("댓글", "무단전재", "이 기사를", "저작권", "All rights reserved", "광고"),
+        min_length=40,
+        date_formats=(DATEUTIL,),
+        # 전체 기사 피드 (최신순)
+        newest_first=True,
+    ),
+    "mit": SourceDefinition(
+        key="mit",
+        name="MIT Technology Review",
+        feed_urls=("https://www.technologyreview.com/topic/artificial-intelligence/feed/",),
+        selectors=('div#content--body',),
+        strip_text_nodes=True,
+        paragraph_separator='\n\n',
+        summary_fallback=False,
+        repair_columns=('full_content', 'source'),
+    ),
+    "theverge": SourceDefinition(
+        key="theverge",
+        name="The Verge",
+        feed_urls=(
+            "https://www.theverge.com/rss/ai-artificial-intelligence/index.xml",
+            "https://www.theverge.com/rss/tech/index.xml",
+        ),
+        selectors=(
+            'div[data-component="PostContent"]',
+            'div.c-entry-content',
+            'div.duet--article--body-component',
+            'article',
+        ),
+        exclude_keywords=(
+            "Posts from this topic", "Follow topics and authors", "MOST POPULAR", "THE VERGE DAILY",
+            "MORE IN NEWS", "TOP STORIES", "Email (required)", "Sign Up", "By submitting your email",
+            "Advertiser Content From", "THIS IS THE TITLE FOR THE NATIVE AD", "Comments Drawer", "Close",
+            "PlusFollow", "See All", "by Jay Peters", "News Editor", "Image: The Verge",
+            "Jay Peters is a news editor covering technology, gaming, and more.",
+        ),
+        date_formats=(ISO8601, RFC822),
+    ),
+    "venturebeat": SourceDefinition(
+        key="venturebeat",
+        name="VentureBeat",
+        # 카테고리별 피드가 작동하지 않아 전체 피드 사용
+        feed_urls=("https://venturebeat.com/feed/",),
+        # 2025년 1월 기준 새로운 구조: article-body 클래스 사용, 백업으로 article 태그
+        selectors=('div.article-body', 'article'),
+        # 20자 이하의 짧은 텍스트(광고 등) 제외
+        min_length=21,
+        strip_text_nodes=True,
+        paragraph_separator='\n\n',
+        date_formats=(DATEUTIL,),
+        summary_fallback=False,
+        repair_columns=('full_content',),
+    ),
+    "techcrunch": SourceDefinition(
+        key="techcrunch",
+        name="TechCrunch",
+        feed_urls=("https://techcrunch.com/feed/",),
+        selectors=('div.article-content',),
+        date_formats=(FEED_PARSED, RFC822),
+    ),
+}
@@ -0,0 +1,173 @@
+"""Supabase 장애에 대비한 로컬 write-ahead 스풀.
+
+``ArticleWriter`` 는 행을 버퍼에 넣을 때 이 스풀(SQLite)에도 기록하고
+commit(fsync)으로 확정하므로, flush 전에 프로세스가 죽어도 행이 남습니다. 저장에 성공한 행은
+스풀에서 지우고, 실패한 행은 남겨 두었다가 다음 실행을 시작할 때(또는
+``spool replay``) 일괄 upsert로 다시 보냅니다. 모든 쓰기는 ``link`` 기준
+upsert 또는 update이므로 같은 행을 여러 번 보내도 결과는 같습니다.
+
+같은 링크의 행이 여러 번 기록되면 컬럼을 합쳐(나중 값 우선) 하나로 유지합니다.
+행마다 쓰기 종류(upsert 또는 기존 행만 고치는 update)를 함께 기록해 같은 방식으로 다시
+보냅니다. 전체 행이 한 번이라도 기록된 링크는 upsert로 보냅니다.
+데이터 오류(4xx, 제약 위반, 없는 행)로 ``max_attempts`` 번 실패한 행은 'dead'로 표시하고
+더 이상 다시 보내지 않습니다. 연결 실패나 5xx 같은 장애로 실패한 행은 시도 횟수에 넣지 않으므로
+장애가 여러 실행에 걸쳐 이어져도 'pending' 으로 남습니다. CI에서는 ``.cache`` 와 함께 캐시됩니다.
+"""
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+from news_collector.writer import MODE_UPDATE, MODE_UPSERT
+
+DEFAULT_SPOOL_PATH = os.path.join('.cache', 'spool.sqlite3')
+DEFAULT_MAX_ATTEMPTS = 5
+
+STATUS_PENDING = 'pending'
+STATUS_DEAD = 'dead'
+
+# SQLite의 바인딩 변수 제한보다 충분히 작게
+_QUERY_CHUNK_SIZE = 500
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+class WriteSpool:
+    """저장 전 행을 기록하고 저장 결과에 따라 지우는 스레드 안전한 스풀."""
+
+    def __init__(self, path=DEFAULT_SPOOL_PATH, enabled=True, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        self.path = path
+        self.enabled = enabled
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = None
+        if enabled and path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            # WAL 모드에서도 commit마다 fsync 하도록 합니다. (버퍼에 넣는 행마다 한 번)
+            self._conn.execute('PRAGMA synchronous=FULL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS spool ('
+                ' link TEXT PRIMARY KEY,'
+                ' row TEXT NOT NULL,'
+                ' label TEXT,'
+                ' status TEXT NOT NULL,'
+                ' attempts INTEGER NOT NULL DEFAULT 0,'
+                ' last_error TEXT,'
+                ' created_at TEXT NOT NULL,'
+                ' updated_at TEXT NOT NULL)'
+            )
+            columns = {row[1] for row in self._conn.execute('PRAGMA table_info(spool)')}
+            if 'mode' not in columns:
+                # 쓰기 종류를 기록하기 전에 만든 스풀 파일
+                self._conn.execute(f"ALTER TABLE spool ADD COLUMN mode TEXT NOT NULL DEFAULT '{MODE_UPSERT}'")
+                # 제목이 없는 행은 기존 행의 빈 컬럼만 채우던 쓰기입니다.
+                self._conn.execute("UPDATE spool SET mode = ? WHERE json_extract(row, '$.title') IS NULL",
+                                   (MODE_UPDATE,))
+            self._conn.commit()
+
+    def append(self, items):
+        """``(row, label, mode)`` 목록을 기록하고 한 번에 확정합니다."""
+        if self._conn is None or not items:
+            return
+        now = _now()
+        with self._lock:
+            existing = self._load([row['link'] for row, _, _ in items])
+            for row, label, mode in items:
+                merged_row, merged_mode = existing.get(row['link'], ({}, MODE_UPDATE))
+                merged_row = dict(merged_row)
+                merged_row.update(row)
+                if merged_mode == MODE_UPSERT:
+                    mode = MODE_UPSERT
+                existing[row['link']] = (merged_row, mode)
+                self._conn.execute(
+                    'INSERT INTO spool (link, row, label, mode, status, created_at, updated_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?) '
+                    'ON CONFLICT(link) DO UPDATE SET row = excluded.row, label = excluded.label, '
+                    'mode = excluded.mode, status = excluded.status, updated_at = excluded.updated_at',
+                    (row['link'], json.dumps(merged_row, ensure_ascii=False), label, mode, STATUS_PENDING,
+                     now, now))
+            self._conn.commit()
+
+    def _load(self, links):
+        rows = {}
+        links = list(set(links))
+        for start in range(0, len(links), _QUERY_CHUNK_SIZE):
+            chunk = links[start:start + _QUERY_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            for link, row, mode in self._conn.execute(
+                    f'SELECT link, row, mode FROM spool WHERE link IN ({placeholders})', chunk):
+                rows[link] = (json.loads(row), mode)
+        return rows
+
+    def record(self, results):
+        """저장 결과를 반영합니다. 성공한 링크는 지우고, 데이터 오류로 실패한 링크만 시도 횟수를 늘립니다."""
+        if self._conn is None or not results:
+            return
+        now = _now()
+        with self._lock:
+            self._conn.executemany('DELETE FROM spool WHERE link = ?',
+                                   [(result.link,) for result in results if result.ok])
+            self._conn.executemany(
+                'UPDATE spool SET attempts = attempts + 1, last_error = ?, updated_at = ?, '
+                'status = CASE WHEN attempts + 1 >= ? THEN ? ELSE status END WHERE link = ?',
+                [(result.error, now, self.max_attempts, STATUS_DEAD, result.link)
+                 for result in results if not result.ok and result.data_error])
+            self._conn.executemany(
+                'UPDATE spool SET last_error = ?, updated_at = ? WHERE link = ?',
+                [(result.error, now, result.link) for result in results if not result.ok and not result.data_error])
+            self._conn.commit()
+
+    def pending(self):
+        """다시 보낼 ``(row, label, mode)`` 목록 (먼저 기록된 순서)."""
+        if self._conn is None:
+            return []
+        with self._lock:
+            return [(json.loads(row), label, mode) for row, label, mode in self._conn.execute(
+                'SELECT row, label, mode FROM spool WHERE status = ? ORDER BY created_at', (STATUS_PENDING,))]
+
+    def replay(self, writer, before_add=None):
+        """남아 있는 행을 ``writer`` 로 다시 저장합니다. ``(보낸 행 수, 실패한 행 수)`` 를 반환합니다."""
+        items = self.pending()
+        if not items:
+            return 0, 0
+        print(f"스풀에 남은 {len(items)}건을 다시 저장합니다")
+        written = len(writer.results)
+        for row, label, mode in items:
+            if before_add is not None:
+                before_add(row)
+            if mode == MODE_UPDATE:
+                writer.update(row, label=label, spooled=True)
+            else:
+                writer.add(row, label=label, spooled=True)
+        writer.flush()
+        failed = sum(1 for result in writer.results[written:] if not result.ok)
+        return len(items), failed
+
+    def revive(self):
+        """'dead' 로 표시된 행을 다시 보낼 대상으로 되돌립니다. 되돌린 행 수를 반환합니다."""
+        if self._conn is None:
+            return 0
+        with self._lock:
+            revived = self._conn.execute('UPDATE spool SET status = ?, attempts = 0 WHERE status = ?',
+                                         (STATUS_PENDING, STATUS_DEAD)).rowcount
+            self._conn.commit()
+        return revived
+
+    def counts(self):
+        if self._conn is None:
+            return {}
+        with self._lock:
+            return dict(self._conn.execute('SELECT status, COUNT(*) FROM spool GROUP BY status'))
+
+    def close(self):
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,47 @@
+"""문단 필터: 제외 키워드와 길이 규칙을 한 번에 적용합니다.
+
+제외 키워드는 소스마다 하나의 정규식으로 미리 합쳐 두어, 문단마다 키워드
+수만큼 부분 문자열 검색을 반복하지 않고 C로 구현된 검색 한 번으로 끝냅니다.
+"""
+import re
+
+
+def compile_keywords(keywords):
+    """키워드 목록을 하나의 정규식으로 합칩니다. 키워드가 없으면 None."""
+    unique = sorted(set(keyword for keyword in keywords if keyword), key=len, reverse=True)
+    if not unique:
+        return None
+    # 긴 키워드를 먼저 두어도 결과(포함 여부)는 같지만, 공통 접두어가 있을 때 되돌아가는 일이 줄어듭니다.
+    return re.compile('|'.join(re.escape(keyword) for keyword in unique))
+
+
+class ParagraphFilter:
+    """소스 정의의 제외 키워드, 최소 길이, 예외 접두어 규칙을 적용합니다.
+
+    예: iRobot News는 50자 미만 문단을 버리되 '▲'로 시작하는 문단은 남기고,
+    AITimes는 40자 미만 문단을 모두 버립니다.
+    """
+
+    def __init__(self, exclude_keywords=(), min_length=0, keep_prefixes=()):
+        self.pattern = compile_keywords(exclude_keywords)
+        self.min_length = min_length
+        self.keep_prefixes = tuple(keep_prefixes)
+
+    @classmethod
+    def for_source(cls, source):
+        return cls(source.exclude_keywords, source.min_length, source.keep_prefixes)
+
+    def excluded(self, text):
+        """제외 키워드가 하나라도 들어 있으면 True."""
+        return self.pattern is not None and self.pattern.search(text) is not None
+
+    def keep(self, text):
+        if not text:
+            return False
+        if len(text) < self.min_length and not text.startswith(self.keep_prefixes):
+            return False
+        return not self.excluded(text)
+
+    def filter(self, paragraphs):
+        """남길 문단만 순서대로 반환합니다."""
+        return [text for text in paragraphs if self.keep(text)]
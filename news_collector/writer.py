@@ -0,0 +1,257 @@
+"""'articles' 테이블에 대한 일괄 upsert 작성기.
+
+행을 버퍼에 모았다가 ``batch_size`` 개가 차거나 ``flush_interval`` 초가
+지나면 ``on_conflict='link'`` upsert 한 번으로 저장합니다. 배치가 실패하면
+행 단위로 다시 시도해 어떤 행이 실패했는지 보고합니다. ``spool`` 을 주면
+버퍼에 넣을 때 행을 로컬 스풀에도 기록해 두어 저장 전에 프로세스가 죽어도 잃지 않고,
+저장에 성공한 행은 스풀에서 지웁니다. 실패한 행은 다음 실행에서 다시 보냅니다.
+
+기존 행의 일부 컬럼만 채우는 쓰기는 ``update`` 로 넣습니다. 이런 행은 upsert에 섞지
+않습니다. 일부 컬럼만 담은 upsert는 INSERT 쪽에서 빠진 컬럼이 NULL이 되어 NOT NULL 제약에
+걸리거나, 그사이 지워진 링크를 빈 행으로 되살립니다. update 행은 ``batch_size`` 개씩
+``update_articles`` 함수(``SUPABASE_SCHEMA``) 한 번으로 보내고, 함수가 없거나
+``BULK_UPDATE_COLUMNS`` 밖의 컬럼이 있으면 ``update().eq('link', ...)`` 로 한 행씩 보냅니다.
+"""
+import threading
+import time
+from collections import namedtuple
+
+BULK_UPDATE_FUNCTION = 'update_articles'
+# update_articles 함수가 갱신하는 컬럼 (행에 있는 컬럼만 바꿉니다)
+BULK_UPDATE_COLUMNS = ('full_content', 'source')
+
+SUPABASE_SCHEMA = f"""\
+-- rows의 링크와 같은 기존 행에서 각 행에 있는 컬럼만 바꾸고, 바꾼 링크를 돌려줍니다. 행을 만들지 않습니다.
+create or replace function {BULK_UPDATE_FUNCTION}(rows jsonb)
+returns table (link text) language sql as $$
+  update articles as a
+    set full_content = case when r.value ? 'full_content' then r.value->>'full_content' else a.full_content end,
+        source = case when r.value ? 'source' then r.value->>'source' else a.source end
+  from jsonb_array_elements(rows) as r
+  where a.link = r.value->>'link'
+  returning a.link;
+$$;
+"""
+
+# data_error: 다시 보내도 같은 결과가 나올 실패(4xx, 제약 위반, 없는 행)인지 여부
+WriteResult = namedtuple('WriteResult', ['link', 'label', 'ok', 'error', 'data_error'], defaults=(False,))
+
+# 버퍼와 스풀에 기록되는 쓰기 종류
+MODE_UPSERT = 'upsert'
+MODE_UPDATE = 'update'
+
+# 데이터 자체의 문제로 보는 PostgreSQL SQLSTATE 클래스 (22 데이터 예외, 23 제약 위반, 42 없는 컬럼 등)
+_DATA_ERROR_CLASSES = ('22', '23', '42')
+
+
+def is_data_error(error):
+    """다시 보내도 성공하지 않을 오류면 True, 연결 실패나 5xx처럼 장애로 볼 오류면 False.
+
+    PostgREST 오류의 ``code`` 는 SQLSTATE, ``PGRST...`` 코드, 또는 본문이 JSON이 아닐 때의
+    HTTP 상태 코드입니다. 알 수 없는 오류는 장애로 봅니다.
+    """
+    code = getattr(error, 'code', None)
+    if isinstance(code, int) or (isinstance(code, str) and len(code) == 3 and code.isdigit()):
+        status = int(code)
+        return 400 <= status < 500 and status not in (408, 429)
+    if not isinstance(code, str):
+        return False
+    if code.startswith('PGRST'):
+        # PGRST1xx 요청 오류, PGRST2xx 스키마(없는 컬럼/테이블). 0xx 연결, 3xx 인증은 장애로 봅니다.
+        return code[5:6] in ('1', '2')
+    return code[:2] in _DATA_ERROR_CLASSES
+
+
+class ArticleWriter:
+    """여러 소스가 공유하는 스레드 안전한 upsert 버퍼."""
+
+    def __init__(self, supabase, batch_size=50, flush_interval=5.0, table='articles', on_result=None,
+                 observer=None, spool=None):
+        self.supabase = supabase
+        # 행마다 저장 결과를 받을 콜백: on_result(row, result)
+        self.on_result = on_result
+        # upsert 요청마다 걸린 시간을 받을 콜백: observer('db_write', seconds)
+        self.observer = observer
+        # 설정되면 버퍼에 넣는 행을 함께 기록하는 ``WriteSpool``
+        self.spool = spool
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.table = table
+        self.results = []
+        self.round_trips = 0
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._timer = None
+        # update_articles 함수가 없으면(PGRST202) False로 바꾸고 한 행씩 update 합니다.
+        self._bulk_update = True
+        if flush_interval:
+            self._timer = threading.Thread(target=self._flush_periodically, name="article-writer", daemon=True)
+            self._timer.start()
+
+    def add(self, row, label=None, spooled=False):
+        """새 기사의 전체 행을 버퍼에 넣고, 배치가 가득 차면 바로 저장합니다.
+
+        ``spooled`` 는 이미 스풀에 있는 행을 다시 보낼 때(``WriteSpool.replay``) True로 줍니다.
+        """
+        self._buffer_row(row, label, MODE_UPSERT, spooled)
+
+    def update(self, row, label=None, spooled=False):
+        """``row['link']`` 인 기존 행의 나머지 컬럼만 갱신합니다. 그 링크의 행이 없으면 실패로 보고합니다.
+
+        버퍼의 update 행은 flush 때 ``batch_size`` 개씩 한 요청으로 보냅니다.
+        """
+        self._buffer_row(row, label, MODE_UPDATE, spooled)
+
+    def _buffer_row(self, row, label, mode, spooled):
+        item = (row, label or row['link'], mode)
+        with self._lock:
+            if self.spool is not None and not spooled:
+                self.spool.append([item])
+            self._buffer.append(item)
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self.flush()
+
+    def flush(self):
+        """버퍼에 쌓인 행을 모두 저장하고 이번에 처리한 결과를 반환합니다."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._buffer = self._buffer, []
+            if not pending:
+                return []
+            # PostgREST upsert는 한 요청의 모든 행이 같은 컬럼을 가져야 하므로 컬럼 구성별로 나눠 보냅니다.
+            groups = {}
+            updates = []
+            for row, label, mode in pending:
+                if mode == MODE_UPDATE:
+                    updates.append((row, label))
+                else:
+                    groups.setdefault(frozenset(row), []).append((row, label))
+            results = []
+            for group in groups.values():
+                for start in range(0, len(group), self.batch_size):
+                    batch = group[start:start + self.batch_size]
+                    results.extend(self._report(batch, self._upsert(batch)))
+            for batch in self._update_batches(updates):
+                results.extend(self._report(batch, self._update_many(batch)))
+            with self._lock:
+                if self.spool is not None:
+                    # 저장하는 동안 같은 링크가 다시 버퍼에 들어왔으면 스풀의 그 행은 아직 지우지 않습니다.
+                    buffered = {row['link'] for row, _, _ in self._buffer}
+                    self.spool.record([result for result in results
+                                       if not (result.ok and result.link in buffered)])
+                self.results.extend(results)
+            return results
+
+    def _report(self, batch, batch_results):
+        if self.on_result is not None:
+            for (row, _), result in zip(batch, batch_results):
+                self.on_result(row, result)
+        return batch_results
+
+    def close(self):
+        """주기적 저장을 멈추고 남은 행을 저장합니다."""
+        self._closed.set()
+        if self._timer is not None:
+            self._timer.join()
+        self.flush()
+
+    def failed(self):
+        return [result for result in self.results if not result.ok]
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+
+    def _upsert(self, batch):
+        rows = [row for row, _ in batch]
+        started = time.perf_counter()
+        try:
+            self.round_trips += 1
+            self.supabase.table(self.table).upsert(rows, on_conflict='link').execute()
+        except Exception as e:
+            self._observe(started)
+            if len(batch) == 1:
+                row, label = batch[0]
+                print(f"Error saving {label} into Supabase: {e}")
+                return [WriteResult(row['link'], label, False, str(e), is_data_error(e))]
+            # 배치 전체가 실패하면 어떤 행이 문제인지 알 수 있도록 한 행씩 다시 시도
+            print(f"Batch upsert of {len(batch)} rows failed, retrying row by row: {e}")
+            results = []
+            for item in batch:
+                results.extend(self._upsert([item]))
+            return results
+        self._observe(started)
+        for _, label in batch:
+            print(f"Saved: {label}")
+        return [WriteResult(row['link'], label, True, None) for row, label in batch]
+
+    def _update_batches(self, updates):
+        """update 행을 ``batch_size`` 개씩 나눕니다. 같은 링크는 한 요청에 두 번 넣지 않습니다."""
+        batch, links = [], set()
+        for item in updates:
+            link = item[0]['link']
+            if len(batch) >= self.batch_size or link in links:
+                yield batch
+                batch, links = [], set()
+            batch.append(item)
+            links.add(link)
+        if batch:
+            yield batch
+
+    def _update_many(self, batch):
+        bulk = self._bulk_update and all(
+            column == 'link' or column in BULK_UPDATE_COLUMNS for row, _ in batch for column in row)
+        if not bulk:
+            return [result for item in batch for result in self._update(item)]
+        started = time.perf_counter()
+        try:
+            self.round_trips += 1
+            response = self.supabase.rpc(BULK_UPDATE_FUNCTION, {'rows': [row for row, _ in batch]}).execute()
+        except Exception as e:
+            self._observe(started)
+            if getattr(e, 'code', None) == 'PGRST202':
+                print(f"{BULK_UPDATE_FUNCTION} 함수가 없어 한 행씩 update 합니다 "
+                      f"(python -m news_collector schema 의 SQL로 만들 수 있습니다): {e}")
+                self._bulk_update = False
+            elif len(batch) > 1:
+                print(f"Batch update of {len(batch)} rows failed, retrying row by row: {e}")
+            # 어떤 행이 문제인지 알 수 있도록 한 행씩 다시 시도합니다.
+            return [result for item in batch for result in self._update(item)]
+        self._observe(started)
+        updated = {row['link'] for row in response.data or []}
+        results = []
+        for row, label in batch:
+            if row['link'] in updated:
+                print(f"Updated: {label}")
+                results.append(WriteResult(row['link'], label, True, None))
+            else:
+                # update는 행을 만들지 않으므로 그사이 지워진 링크는 그대로 둡니다.
+                print(f"Not updated, no article with this link: {label}")
+                results.append(WriteResult(row['link'], label, False, 'no article with this link', True))
+        return results
+
+    def _update(self, item):
+        row, label = item
+        values = {column: value for column, value in row.items() if column != 'link'}
+        started = time.perf_counter()
+        try:
+            self.round_trips += 1
+            response = self.supabase.table(self.table).update(values).eq('link', row['link']).execute()
+        except Exception as e:
+            self._observe(started)
+            print(f"Error updating {label} in Supabase: {e}")
+            return [WriteResult(row['link'], label, False, str(e), is_data_error(e))]
+        self._observe(started)
+        if not response.data:
+            # update는 행을 만들지 않으므로 그사이 지워진 링크는 그대로 둡니다.
+            print(f"Not updated, no article with this link: {label}")
+            return [WriteResult(row['link'], label, False, 'no article with this link', True)]
+        print(f"Updated: {label}")
+        return [WriteResult(row['link'], label, True, None)]
+
+    def _observe(self, started):
+        if self.observer is not None:
+            self.observer('db_write', time.perf_counter() - started)
@@ -0,0 +1,8 @@
+import pytest
+
+from benchmarks.fake_supabase import FakeSupabase
+
+
+@pytest.fixture
+def supabase():
+    return FakeSupabase()
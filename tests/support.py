@@ -0,0 +1,49 @@
+"""테스트 공용 도구: 특정 링크를 거부하는 가짜 Supabase, 가짜 피드 응답, 기사 행."""
+from types import SimpleNamespace
+
+from benchmarks.fake_supabase import FakeAPIError, FakeQuery, FakeSupabase
+
+
+class _RejectingQuery(FakeQuery):
+    def execute(self):
+        payload = self.payload if isinstance(self.payload, list) else [self.payload]
+        if self.op == 'upsert' and any(row.get('link') in self.db.reject for row in payload):
+            self.db.record(self.op)
+            raise FakeAPIError('null value in column "title" violates not-null constraint', code='23502')
+        return super().execute()
+
+
+class RejectingSupabase(FakeSupabase):
+    """``reject`` 에 든 링크가 섞인 upsert 요청을 제약 위반(23502)으로 실패시킵니다."""
+
+    def __init__(self, reject=(), **kwargs):
+        super().__init__(**kwargs)
+        self.reject = set(reject)
+
+    def table(self, name):
+        return _RejectingQuery(self, name)
+
+
+class FakeFeedSession:
+    """URL별로 정해 둔 피드 응답을 돌려주고 받은 조건부 요청 헤더를 기록합니다."""
+
+    def __init__(self, feeds):
+        # url -> (내용 bytes, ETag)
+        self.feeds = feeds
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None, hooks=None):
+        self.requests.append((url, dict(headers or {})))
+        content, etag = self.feeds[url]
+        if headers and headers.get('If-None-Match') == etag:
+            return SimpleNamespace(status_code=304, content=b'', headers={}, raise_for_status=lambda: None)
+        return SimpleNamespace(status_code=200, content=content, headers={'ETag': etag},
+                               raise_for_status=lambda: None)
+
+
+def article(link, **columns):
+    """저장할 새 기사 행."""
+    row = {'link': link, 'title': f"title {link}", 'summary': 'summary', 'full_content': 'content',
+           'source': 'Test'}
+    row.update(columns)
+    return row
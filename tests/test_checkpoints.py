@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from news_collector.checkpoints import CheckpointStore
+from news_collector.writer import WriteResult
+
+NOW = datetime(2025, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+
+def at(hours):
+    return NOW - timedelta(hours=hours)
+
+
+def ok(link):
+    return WriteResult(link, link, True, None)
+
+
+def failed(link):
+    return WriteResult(link, link, False, 'error', False)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'checkpoints.json')
+
+
+def run(path, items, written=(), confirmed=(), errors=(), finish=True):
+    """``items`` (링크, 몇 시간 전)를 처리한 한 번의 실행을 흉내 내고 저장한 뒤 다음 실행의 창을 반환합니다."""
+    store = CheckpointStore(path)
+    store.begin('src', NOW)
+    for link, hours in items:
+        store.admit('src', link, at(hours))
+    store.confirm('src', confirmed)
+    for link in written:
+        store.record_write({'link': link}, ok(link))
+    for link in errors:
+        store.record_write({'link': link}, failed(link))
+    if finish:
+        store.finish('src')
+    store.save()
+    return CheckpointStore(path).begin('src', NOW)
+
+
+def test_first_run_uses_the_default_window(path):
+    window = CheckpointStore(path).begin('src', NOW)
+    assert window.mark is None
+    assert window.cutoff == NOW - timedelta(days=1)
+
+
+def test_mark_advances_to_the_newest_written_link(path):
+    window = run(path, [('a', 5), ('b', 2)], written=['a', 'b'])
+    assert window.mark == at(2)
+    assert window.cutoff == at(2) - timedelta(hours=6)
+    assert window.is_known('a', at(5)) and window.is_known('b', at(2))
+
+
+def test_links_confirmed_in_the_db_count_as_done(path):
+    window = run(path, [('a', 5), ('b', 2)], written=['a'], confirmed=['b'])
+    assert window.mark == at(2)
+
+
+def test_mark_stops_below_the_oldest_unconfirmed_link(path):
+    # c는 lease를 다른 작업자가 잡았거나 유사 중복으로 건너뛰어 저장하지 않았습니다.
+    window = run(path, [('a', 5), ('c', 3), ('b', 2)], written=['a', 'b'])
+    assert window.mark == at(3) - timedelta(microseconds=1)
+    assert not window.is_known('c', at(3))
+    # 다음 실행에서 c는 mark 이후 항목이라 다시 처리됩니다.
+    assert not window.is_old(at(3))
+
+
+def test_failed_write_holds_the_mark(path):
+    window = run(path, [('a', 5), ('b', 2)], written=['a'], errors=['b'])
+    # a까지만 저장되었으므로 b 이후로 넘어가지 않습니다.
+    assert window.mark == at(5)
+    assert not window.is_known('b', at(2))
+
+
+def test_mark_never_moves_back_past_the_previous_mark_for_done_links(path):
+    run(path, [('a', 2)], written=['a'])
+    window = run(path, [('old', 4)], written=['old'])
+    assert window.mark == at(2)
+
+
+def test_unfinished_source_is_not_saved(path):
+    window = run(path, [('a', 2)], written=['a'], finish=False)
+    assert window.mark is None
+
+
+def test_catch_up_reaches_further_back(path):
+    run(path, [('a', 2)], written=['a'])
+    window = CheckpointStore(path, catch_up=timedelta(days=3)).begin('src', NOW)
+    assert window.cutoff == NOW - timedelta(days=3)
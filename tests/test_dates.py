@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from news_collector.dates import DateNormalizer, to_iso
+from news_collector.sources import DATEUTIL, FEED_PARSED, ISO8601, KST, RFC822, SOURCES
+
+EXPECTED = datetime(2025, 1, 15, 1, 20, tzinfo=timezone.utc)
+
+
+def test_declared_formats_come_first_in_declared_order():
+    assert DateNormalizer((FEED_PARSED, RFC822)).formats == (FEED_PARSED, RFC822, ISO8601, DATEUTIL)
+    assert DateNormalizer((DATEUTIL,)).formats == (DATEUTIL, RFC822, ISO8601, FEED_PARSED)
+    assert DateNormalizer(('%Y-%m-%d %H:%M:%S', RFC822)).formats == (
+        '%Y-%m-%d %H:%M:%S', RFC822, ISO8601, FEED_PARSED, DATEUTIL)
+
+
+def test_every_source_keeps_its_declared_order():
+    for source in SOURCES.values():
+        formats = DateNormalizer(source.date_formats).formats
+        assert formats[:len(source.date_formats)] == source.date_formats
+        assert set(formats) >= {RFC822, ISO8601, FEED_PARSED, DATEUTIL}
+
+
+def test_feed_parsed_is_used_first_when_declared_first():
+    normalizer = DateNormalizer((FEED_PARSED, RFC822))
+    # published 문자열과 다른 값을 주어 어느 형식이 쓰였는지 확인합니다.
+    entry = SimpleNamespace(published='Wed, 15 Jan 2025 12:00:00 +0000',
+                            published_parsed=(2025, 1, 15, 1, 20, 0, 2, 15, 0))
+    assert normalizer.parse(entry) == EXPECTED
+    assert normalizer.preferred == FEED_PARSED
+
+
+def test_falls_through_to_the_next_format_and_remembers_it():
+    normalizer = DateNormalizer((FEED_PARSED, RFC822))
+    # 스트리밍 피드 파서의 항목에는 published_parsed가 없습니다.
+    entry = SimpleNamespace(published='Wed, 15 Jan 2025 10:20:00 +0900')
+    assert normalizer.parse(entry) == EXPECTED
+    assert normalizer.preferred == RFC822
+    assert normalizer.parse(SimpleNamespace(published='2025-01-15T01:20:00Z')) == EXPECTED
+    assert normalizer.preferred == ISO8601
+
+
+def test_naive_times_use_the_source_timezone():
+    normalizer = DateNormalizer(('%Y-%m-%d %H:%M:%S',), naive_timezone=KST)
+    assert normalizer.parse(SimpleNamespace(published='2025-01-15 10:20:00')) == EXPECTED
+
+
+def test_unparseable_date_returns_none():
+    normalizer = DateNormalizer((RFC822,))
+    assert normalizer.parse(SimpleNamespace(published='not a date at all')) is None
+    assert normalizer.parse(SimpleNamespace()) is None
+
+
+def test_to_iso_is_utc_with_seconds():
+    assert to_iso(EXPECTED.astimezone(timezone(timedelta(hours=9)))) == '2025-01-15T01:20:00+00:00'
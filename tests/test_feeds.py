@@ -0,0 +1,75 @@
+import pytest
+
+from news_collector.feeds import FeedCache
+from news_collector.writer import WriteResult
+
+from support import FakeFeedSession
+
+FEED_A = 'https://a.example/feed'
+FEED_B = 'https://b.example/feed'
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'feed_state.json')
+
+
+@pytest.fixture
+def session():
+    return FakeFeedSession({FEED_A: (b'<rss>a</rss>', '"a1"'), FEED_B: (b'<rss>b</rss>', '"b1"')})
+
+
+def process(cache, session, url, source_key, links, failed=()):
+    """피드를 받아 ``links`` 를 처리하고 ``failed`` 링크의 저장에 실패한 것처럼 결과를 알립니다."""
+    content = cache.fetch(session, url)
+    if content is None:
+        return None
+    for link in links:
+        cache.admit(source_key, link)
+        cache.record_write({'link': link}, WriteResult(link, link, link not in failed, None))
+    cache.commit(url, source_key)
+    return content
+
+
+def test_processed_feed_is_not_modified_next_run(path, session):
+    cache = FeedCache(path)
+    assert process(cache, session, FEED_A, 'a', ['a1']) == b'<rss>a</rss>'
+    cache.save()
+    assert process(FeedCache(path), session, FEED_A, 'a', ['a1']) is None
+    assert session.requests[-1][1] == {'If-None-Match': '"a1"'}
+
+
+def test_validators_are_not_promoted_for_a_source_with_a_failed_write(path, session):
+    cache = FeedCache(path)
+    process(cache, session, FEED_A, 'a', ['a1', 'a2'], failed=['a2'])
+    process(cache, session, FEED_B, 'b', ['b1'])
+    cache.save()
+
+    reloaded = FeedCache(path)
+    assert reloaded.validators(FEED_A) == {}
+    assert reloaded.validators(FEED_B)['etag'] == '"b1"'
+    # 실패한 소스의 피드는 다음 실행에서 조건부 요청 없이 다시 처리됩니다.
+    assert process(reloaded, session, FEED_A, 'a', ['a1', 'a2']) == b'<rss>a</rss>'
+    assert session.requests[-1][1] == {}
+
+
+def test_feed_that_was_not_committed_is_not_promoted(path, session):
+    cache = FeedCache(path)
+    cache.fetch(session, FEED_A)
+    cache.save()
+    assert FeedCache(path).validators(FEED_A) == {}
+
+
+def test_unchanged_content_without_validators_is_skipped(path):
+    session = FakeFeedSession({FEED_A: (b'<rss>a</rss>', None)})
+    cache = FeedCache(path)
+    process(cache, session, FEED_A, 'a', ['a1'])
+    cache.save()
+    assert process(FeedCache(path), session, FEED_A, 'a', ['a1']) is None
+
+
+def test_disabled_cache_always_fetches(path, session):
+    cache = FeedCache(path, enabled=False)
+    process(cache, session, FEED_A, 'a', ['a1'])
+    cache.save()
+    assert process(FeedCache(path, enabled=False), session, FEED_A, 'a', ['a1']) is not None
@@ -0,0 +1,101 @@
+import time
+
+import pytest
+
+from news_collector.leases import (KIND_LINK, KIND_SOURCE, STATUS_DONE, STATUS_HELD, LeaseCoordinator,
+                                   SqliteLeaseStore)
+from news_collector.writer import WriteResult
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SqliteLeaseStore(str(tmp_path / 'leases.sqlite3'))
+    yield store
+    store.close()
+
+
+def test_claim_is_exclusive_until_the_lease_expires(store):
+    assert store.claim(['k1', 'k2'], 'w1', ttl=60) == ['k1', 'k2']
+    assert store.claim(['k1', 'k3'], 'w2', ttl=60) == ['k3']
+    # 같은 작업자는 다시 잡을 수 있습니다. (연장)
+    assert store.claim(['k1'], 'w1', ttl=60) == ['k1']
+
+
+def test_expired_lease_can_be_taken_over(store):
+    store.claim(['k'], 'w1', ttl=0.05)
+    time.sleep(0.1)
+    assert store.claim(['k'], 'w2', ttl=60) == ['k']
+    assert store.statuses('k')['k'][0] == 'w2'
+    # 만료된 작업자는 연장할 수 없습니다.
+    assert store.renew('w1', 60) == set()
+    assert store.renew('w2', 60) == {'k'}
+
+
+def test_finished_lease_is_never_claimed_again(store):
+    store.claim(['k'], 'w1', ttl=0.05)
+    store.finish(['k'], 'w1', STATUS_DONE)
+    time.sleep(0.1)
+    assert store.claim(['k'], 'w2', ttl=60) == []
+
+
+def test_released_lease_is_claimable_at_once(store):
+    store.claim(['k'], 'w1', ttl=60)
+    store.release(['k'], 'w1')
+    assert store.claim(['k'], 'w2', ttl=60) == ['k']
+
+
+def test_coordinator_finishes_written_links_and_releases_the_rest(tmp_path):
+    path = str(tmp_path / 'leases.sqlite3')
+    first = LeaseCoordinator(SqliteLeaseStore(path), 'run1', worker_id='w1', ttl=60)
+    assert first.claim_links(['a', 'b']) == {'a', 'b'}
+    first.record_write({'link': 'a'}, WriteResult('a', 'a', True, None))
+    first.record_write({'link': 'b'}, WriteResult('b', 'b', False, 'error', False))
+    first.stop()
+
+    store = SqliteLeaseStore(path)
+    statuses = store.statuses('run1:link:')
+    assert statuses['run1:link:a'][1] == STATUS_DONE
+    assert statuses['run1:link:b'][1] == STATUS_HELD
+    second = LeaseCoordinator(store, 'run1', worker_id='w2', ttl=60)
+    # 저장에 실패한 링크는 다른 작업자가 바로 이어받습니다.
+    assert second.claim_links(['a', 'b']) == {'b'}
+    second.stop()
+
+
+def test_run_claimed_processes_each_name_once_across_workers(tmp_path):
+    path = str(tmp_path / 'leases.sqlite3')
+    done = []
+    first = LeaseCoordinator(SqliteLeaseStore(path), 'run1', worker_id='w1', ttl=3)
+    second = LeaseCoordinator(SqliteLeaseStore(path), 'run1', worker_id='w2', ttl=3)
+    names = ['s1', 's2', 's3']
+    results = list(first.run_claimed(KIND_SOURCE, names[:2], lambda name: done.append(('w1', name)), workers=1))
+    results += list(second.run_claimed(KIND_SOURCE, names, lambda name: done.append(('w2', name)), workers=1))
+    assert second.unfinished(KIND_SOURCE, names) == []
+    first.stop()
+    second.stop()
+    assert sorted(name for _, name in done) == names
+    assert ('w2', 's3') in done
+    assert all(error is None for _, error in results)
+
+
+def test_run_claimed_takes_over_a_source_whose_worker_died(tmp_path):
+    path = str(tmp_path / 'leases.sqlite3')
+    dead = SqliteLeaseStore(path)
+    dead.claim(['run1:source:s1'], 'dead', ttl=0.2)
+    worker = LeaseCoordinator(SqliteLeaseStore(path), 'run1', worker_id='w1', ttl=0.3)
+    started = time.monotonic()
+    results = list(worker.run_claimed(KIND_SOURCE, ['s1'], lambda name: None))
+    worker.stop()
+    dead.close()
+    assert results == [('s1', None)]
+    assert time.monotonic() - started >= 0.15
+
+
+def test_links_claimed_by_another_run_are_separate(tmp_path):
+    path = str(tmp_path / 'leases.sqlite3')
+    first = LeaseCoordinator(SqliteLeaseStore(path), 'run1', worker_id='w1', ttl=60)
+    second = LeaseCoordinator(SqliteLeaseStore(path), 'run2', worker_id='w2', ttl=60)
+    assert first.claim(KIND_LINK, ['a']) == ['a']
+    assert second.claim(KIND_LINK, ['a']) == ['a']
+    first.stop()
+    second.stop()
@@ -0,0 +1,90 @@
+import pytest
+
+from news_collector.neardup import NearDuplicateIndex, signature
+from news_collector.writer import WriteResult
+
+TEXT = ('The robotics startup said on Tuesday that it raised new funding to expand production of its '
+        'warehouse robots across Europe and North America, according to a statement.')
+SIG = signature(TEXT)
+
+
+def ok(link):
+    return WriteResult(link, link, True, None)
+
+
+def failed(link):
+    return WriteResult(link, link, False, 'error', False)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'neardup.sqlite3')
+
+
+def test_similar_article_from_another_source_matches(path):
+    index = NearDuplicateIndex(path)
+    cluster_id, match = index.assign('a', SIG, 'Source A')
+    assert match is None
+    other_cluster, match = index.assign('b', signature(TEXT + ' Shares rose.'), 'Source B')
+    assert other_cluster == cluster_id
+    assert match.link == 'a' and match.similarity >= index.threshold
+    index.close()
+
+
+def test_same_source_articles_do_not_match(path):
+    index = NearDuplicateIndex(path)
+    first, _ = index.assign('a', SIG, 'Source A')
+    second, match = index.assign('b', SIG, 'Source A')
+    assert match is None and second != first
+    index.close()
+
+
+def test_only_written_signatures_are_saved(path):
+    index = NearDuplicateIndex(path)
+    index.assign('a', SIG, 'Source A')
+    index.assign('b', SIG, 'Source B')
+    index.record_write({'link': 'a'}, ok('a'))
+    index.record_write({'link': 'b'}, failed('b'))
+    # 저장에 실패한 기사는 이번 실행의 후보에서도 빠집니다.
+    _, match = index.assign('c', SIG, 'Source C')
+    assert match.link == 'a'
+    index.close()
+
+    reloaded = NearDuplicateIndex(path)
+    assert len(reloaded) == 1
+    reloaded.close()
+
+
+def test_unconfirmed_signatures_are_not_saved(path):
+    index = NearDuplicateIndex(path)
+    index.assign('a', SIG, 'Source A')
+    index.close()
+    assert len(NearDuplicateIndex(path)) == 0
+
+
+def test_skipped_article_keeps_its_decision_on_a_later_sighting(path):
+    index = NearDuplicateIndex(path)
+    index.assign('a', SIG, 'Source A')
+    index.record_write({'link': 'a'}, ok('a'))
+    cluster_id, match = index.assign('b', SIG, 'Source B')
+    index.skip('b')
+    index.close()
+
+    reloaded = NearDuplicateIndex(path)
+    assert reloaded.assign('b', SIG, 'Source B') == (cluster_id, match)
+    # 건너뛴 기사는 다른 기사의 후보가 되지 않습니다.
+    _, other = reloaded.assign('c', SIG, 'Source C')
+    assert other.link == 'a'
+    reloaded.close()
+
+
+def test_known_link_returns_its_original_match(path):
+    index = NearDuplicateIndex(path)
+    index.assign('a', SIG, 'Source A')
+    index.record_write({'link': 'a'}, ok('a'))
+    first = index.assign('b', SIG, 'Source B')
+    index.record_write({'link': 'b'}, ok('b'))
+    index.close()
+    reloaded = NearDuplicateIndex(path)
+    assert reloaded.assign('b', SIG, 'Source B') == first
+    reloaded.close()
@@ -0,0 +1,112 @@
+import pytest
+
+from benchmarks.fake_supabase import FakeAPIError, FakeSupabase
+from news_collector.spool import STATUS_DEAD, STATUS_PENDING, WriteSpool
+from news_collector.writer import MODE_UPDATE, MODE_UPSERT, ArticleWriter, WriteResult
+
+from support import RejectingSupabase, article
+
+
+@pytest.fixture
+def spool(tmp_path):
+    spool = WriteSpool(str(tmp_path / 'spool.sqlite3'), max_attempts=2)
+    yield spool
+    spool.close()
+
+
+class DownSupabase(FakeSupabase):
+    """모든 요청이 연결 실패로 끝나는 Supabase."""
+
+    def record(self, op):
+        super().record(op)
+        raise ConnectionError('connection refused')
+
+
+def test_rows_are_spooled_before_flush(spool):
+    writer = ArticleWriter(FakeSupabase(), batch_size=10, flush_interval=0, spool=spool)
+    writer.add(article('a'))
+    writer.update({'link': 'b', 'full_content': 'body'})
+    # flush 전에 프로세스가 죽어도 행이 남아 있습니다.
+    assert [(row['link'], mode) for row, _, mode in spool.pending()] == [('a', MODE_UPSERT), ('b', MODE_UPDATE)]
+
+
+def test_successful_flush_removes_rows(spool, supabase):
+    writer = ArticleWriter(supabase, flush_interval=0, spool=spool)
+    writer.add(article('a'))
+    writer.flush()
+    assert spool.counts() == {}
+
+
+def test_same_link_is_merged_into_one_upsert(spool):
+    spool.append([(article('a', full_content=None), 'A', MODE_UPSERT)])
+    spool.append([({'link': 'a', 'full_content': 'body'}, 'A', MODE_UPDATE)])
+    [(row, label, mode)] = spool.pending()
+    assert mode == MODE_UPSERT
+    assert row['title'] == 'title a' and row['full_content'] == 'body'
+
+
+def test_update_only_rows_stay_updates(spool):
+    spool.append([({'link': 'a', 'full_content': 'one'}, 'A', MODE_UPDATE)])
+    spool.append([({'link': 'a', 'source': 'Test'}, 'A', MODE_UPDATE)])
+    [(row, _, mode)] = spool.pending()
+    assert mode == MODE_UPDATE
+    assert row == {'link': 'a', 'full_content': 'one', 'source': 'Test'}
+
+
+def test_replay_sends_rows_left_by_an_outage(spool):
+    writer = ArticleWriter(DownSupabase(), flush_interval=0, spool=spool)
+    writer.add(article('a'))
+    writer.close()
+    assert spool.counts() == {STATUS_PENDING: 1}
+
+    supabase = FakeSupabase()
+    supabase.seed('articles', [article('b', full_content=None)])
+    spool.append([({'link': 'b', 'full_content': 'body'}, 'B', MODE_UPDATE)])
+    replayed = ArticleWriter(supabase, flush_interval=0, spool=spool)
+    assert spool.replay(replayed) == (2, 0)
+    assert {row['link']: row['full_content'] for row in supabase.rows()} == {'a': 'content', 'b': 'body'}
+    assert spool.counts() == {}
+    # replay가 보낸 행은 스풀에 다시 기록되지 않고 한 번의 upsert와 한 번의 update로 끝납니다.
+    assert supabase.round_trips['upsert'] == 1 and supabase.round_trips['rpc'] == 1
+
+
+def test_outage_failures_do_not_count_as_attempts(spool):
+    spool.append([(article('a'), 'A', MODE_UPSERT)])
+    for _ in range(5):
+        spool.replay(ArticleWriter(DownSupabase(), flush_interval=0, spool=spool))
+    assert spool.counts() == {STATUS_PENDING: 1}
+
+
+def test_data_errors_mark_the_row_dead(spool):
+    spool.append([(article('bad'), 'bad', MODE_UPSERT)])
+    for _ in range(2):
+        spool.replay(ArticleWriter(RejectingSupabase(reject={"bad"}), flush_interval=0, spool=spool))
+    assert spool.counts() == {STATUS_DEAD: 1}
+    assert spool.pending() == []
+    assert spool.revive() == 1
+    assert spool.counts() == {STATUS_PENDING: 1}
+
+
+def test_record_keeps_failed_rows(spool):
+    spool.append([(article('a'), 'A', MODE_UPSERT), (article('b'), 'B', MODE_UPSERT)])
+    spool.record([WriteResult('a', 'A', True, None),
+                  WriteResult('b', 'B', False, str(FakeAPIError('timeout')), False)])
+    assert [row['link'] for row, _, _ in spool.pending()] == ['b']
+
+
+def test_row_buffered_again_during_flush_stays_spooled(spool):
+    class Racy(FakeSupabase):
+        def table(self, name):
+            if writer is not None and not self.round_trips:
+                # 첫 upsert가 끝나기 전에 같은 링크의 update가 들어옵니다.
+                writer.update({'link': 'a', 'full_content': 'later'})
+            return super().table(name)
+
+    writer = None
+    writer = ArticleWriter(Racy(), batch_size=10, flush_interval=0, spool=spool)
+    writer.add(article('a'))
+    writer.flush()
+    [(row, _, _)] = spool.pending()
+    assert row['full_content'] == 'later'
+    writer.flush()
+    assert spool.counts() == {}
@@ -0,0 +1,100 @@
+"""ParagraphFilter가 예전 소스별 수집 스크립트(collect_*.py)의 문단 필터와 같은 문단을 남기는지 확인합니다."""
+import pytest
+
+from news_collector.sources import SOURCES
+from news_collector.textfilter import ParagraphFilter, compile_keywords
+
+AITIMES_KEYWORDS = ["댓글", "무단전재", "이 기사를", "저작권", "All rights reserved", "광고"]
+IROBOTNEWS_KEYWORDS = [
+    "남상엽 synam58@gmail.com", "다른기사 보기", "저작권자 © 로봇신문", "무단전재 및 재배포 금지", "댓글",
+    "회원로그인", "등록", "BEST댓글", "더보기", "많이 본 뉴스", "포토뉴스", "분야별 주요뉴스", "개인정보처리방침",
+    "이용약관", "PC버전", "서울시", "대표전화", "팩스", "All rights reserved", "ND소프트", "이 기사를 공유합니다",
+    "댓글삭제", "댓글수정", "비밀번호", "내 댓글 모음", "닫기", "인쇄", "URL주소", "본문글씨", "줄이기", "키우기",
+    "이메일", "다른 공유", "기사스크랩"]
+THEVERGE_KEYWORDS = [
+    "Posts from this topic", "Follow topics and authors", "MOST POPULAR", "THE VERGE DAILY", "MORE IN NEWS",
+    "TOP STORIES", "Email (required)", "Sign Up", "By submitting your email", "Advertiser Content From",
+    "THIS IS THE TITLE FOR THE NATIVE AD", "MORE IN NEWS", "TOP STORIES", "Comments Drawer", "Close",
+    "PlusFollow", "See All", "by Jay Peters", "News Editor", "Image: The Verge",
+    "Jay Peters is a news editor covering technology, gaming, and more."]
+
+
+def legacy_aitimes(texts):
+    return [text for text in texts
+            if text and not any(keyword in text for keyword in AITIMES_KEYWORDS) and len(text) >= 40]
+
+
+def legacy_irobotnews(texts):
+    return [text for text in texts
+            if text and not any(keyword in text for keyword in IROBOTNEWS_KEYWORDS)
+            and not (len(text) < 50 and not text.startswith('▲'))]
+
+
+def legacy_theverge(texts):
+    return [text for text in texts if text and not any(keyword in text for keyword in THEVERGE_KEYWORDS)]
+
+
+def legacy_venturebeat(texts):
+    return [text for text in texts if text and len(text) > 20]
+
+
+def legacy_mit(texts):
+    return [text for text in texts if text]
+
+
+PARAGRAPHS = [
+    '',
+    '짧은 문단',
+    '▲ 사진 설명',
+    '▲ 로봇신문 제공 사진, 무단전재 및 재배포 금지',
+    '로봇 산업이 빠르게 성장하면서 국내 기업들이 새로운 협동 로봇 제품을 잇달아 선보이고 있다. 전문가들은 이 흐름이 계속될 것으로 본다.',
+    '이 기사를 공유합니다. 로봇 산업이 빠르게 성장하면서 국내 기업들이 새로운 제품을 선보이고 있다는 소식입니다.',
+    '저작권자 © 로봇신문 무단전재 및 재배포 금지 — 기사에 대한 문의는 대표전화로 연락 바랍니다.',
+    '인공지능 반도체 시장의 경쟁이 치열해지고 있으며 주요 업체들이 차세대 제품을 공개했다.',
+    '광고 문의는 아래 연락처로 보내 주세요. 광고 문의는 아래 연락처로 보내 주세요.',
+    '사십 자에 딱 맞는 문단을 만들기 위해 글자 수를 맞춘 문장입니다. 확인.',
+    'x' * 39,
+    'x' * 40,
+    'x' * 49,
+    'x' * 50,
+    'The company announced a new model that it says outperforms rivals on several benchmarks.',
+    'Posts from this topic will be added to your daily email digest and your homepage feed.',
+    'Close',
+    'Closely watched results from the trial were published on Tuesday.',
+    'Image: The Verge',
+    'Sign Up for the newsletter',
+    'Short line.',
+    'Exactly twenty chars',
+    'Exactly twenty-one ch',
+    'by Jay Peters, News Editor',
+]
+
+LEGACY_FILTERS = {
+    'aitimes': legacy_aitimes,
+    'irobotnews': legacy_irobotnews,
+    'theverge': legacy_theverge,
+    'venturebeat': legacy_venturebeat,
+    'mit': legacy_mit,
+}
+
+
+@pytest.mark.parametrize('key', sorted(LEGACY_FILTERS))
+def test_matches_the_legacy_filter(key):
+    assert ParagraphFilter.for_source(SOURCES[key]).filter(PARAGRAPHS) == LEGACY_FILTERS[key](PARAGRAPHS)
+
+
+def test_min_length_boundary_is_inclusive():
+    paragraph_filter = ParagraphFilter(min_length=40)
+    assert paragraph_filter.filter(['x' * 39, 'x' * 40]) == ['x' * 40]
+
+
+def test_keep_prefixes_bypass_only_the_length_rule():
+    paragraph_filter = ParagraphFilter(exclude_keywords=['금지'], min_length=50, keep_prefixes=['▲'])
+    assert paragraph_filter.filter(['▲ 짧은 캡션', '▲ 무단 전재 금지', '짧은 문단']) == ['▲ 짧은 캡션']
+
+
+def test_keywords_are_matched_literally():
+    pattern = compile_keywords(['Email (required)', 'a.b', ''])
+    assert pattern.search('Your Email (required) here')
+    assert pattern.search('axb') is None
+    assert compile_keywords([]) is None
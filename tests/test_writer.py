@@ -0,0 +1,106 @@
+from benchmarks.fake_supabase import FakeSupabase
+from news_collector.writer import ArticleWriter
+
+from support import RejectingSupabase, article
+
+
+def make_writer(supabase, **kwargs):
+    kwargs.setdefault('flush_interval', 0)
+    return ArticleWriter(supabase, **kwargs)
+
+
+def test_add_sends_one_upsert_per_full_batch(supabase):
+    writer = make_writer(supabase, batch_size=50)
+    for i in range(120):
+        writer.add(article(f"https://example.com/{i}"))
+    # 50개가 찰 때마다 바로 저장하고 남은 20개는 close에서 저장합니다.
+    assert supabase.round_trips['upsert'] == 2
+    writer.close()
+    assert supabase.round_trips['upsert'] == 3
+    assert len(supabase.rows()) == 120
+    assert all(result.ok for result in writer.results)
+
+
+def test_rows_with_different_columns_go_in_separate_upserts(supabase):
+    writer = make_writer(supabase, batch_size=10)
+    writer.add(article('a'))
+    writer.add(article('b', cluster_id='c1'))
+    writer.add(article('c'))
+    writer.flush()
+    assert supabase.round_trips['upsert'] == 2
+    assert {row['link'] for row in supabase.rows()} == {'a', 'b', 'c'}
+
+
+def test_failed_batch_is_retried_row_by_row():
+    supabase = RejectingSupabase(reject={'bad'})
+    reported = []
+    writer = make_writer(supabase, batch_size=10, on_result=lambda row, result: reported.append(result))
+    for link in ('a', 'bad', 'c'):
+        writer.add(article(link))
+    results = writer.flush()
+
+    # 배치 1번 + 행마다 1번
+    assert supabase.round_trips['upsert'] == 4
+    assert {row['link'] for row in supabase.rows()} == {'a', 'c'}
+    assert [(result.link, result.ok) for result in results] == [('a', True), ('bad', False), ('c', True)]
+    failed = writer.failed()
+    assert [result.link for result in failed] == ['bad']
+    assert failed[0].data_error
+    assert reported == results
+
+
+def test_updates_are_sent_in_batches_through_the_function(supabase):
+    supabase.seed('articles', [article(f"l{i}", full_content=None) for i in range(7)])
+    writer = make_writer(supabase, batch_size=3)
+    for i in range(7):
+        writer.update({'link': f"l{i}", 'full_content': f"body {i}"})
+    writer.close()
+    assert supabase.round_trips['rpc'] == 3
+    assert supabase.round_trips['update'] == 0
+    assert sorted(row['full_content'] for row in supabase.rows()) == [f"body {i}" for i in range(7)]
+
+
+def test_update_of_missing_link_fails_without_creating_a_row(supabase):
+    supabase.seed('articles', [article('kept', full_content=None)])
+    writer = make_writer(supabase)
+    writer.update({'link': 'kept', 'full_content': 'body'})
+    writer.update({'link': 'deleted', 'full_content': 'body'})
+    results = {result.link: result for result in writer.flush()}
+    assert results['kept'].ok
+    assert not results['deleted'].ok and results['deleted'].data_error
+    assert [row['link'] for row in supabase.rows()] == ['kept']
+
+
+def test_update_falls_back_to_one_row_at_a_time_without_the_function():
+    supabase = FakeSupabase(functions=())
+    supabase.seed('articles', [article(f"l{i}", full_content=None) for i in range(4)])
+    writer = make_writer(supabase, batch_size=10)
+    for i in range(4):
+        writer.update({'link': f"l{i}", 'full_content': 'body'})
+    writer.flush()
+    assert supabase.round_trips['update'] == 4
+    # 함수가 없다는 것을 배운 뒤에는 다시 부르지 않습니다.
+    writer.update({'link': 'l0', 'full_content': 'again'})
+    writer.flush()
+    assert supabase.round_trips['update'] == 5
+    assert all(result.ok for result in writer.results)
+
+
+def test_update_with_other_columns_is_sent_row_by_row(supabase):
+    supabase.seed('articles', [article('a', cluster_id=None)])
+    writer = make_writer(supabase)
+    writer.update({'link': 'a', 'cluster_id': 'c1'})
+    writer.flush()
+    assert supabase.round_trips['rpc'] == 0
+    assert supabase.rows()[0]['cluster_id'] == 'c1'
+
+
+def test_same_link_is_not_updated_twice_in_one_request(supabase):
+    supabase.seed('articles', [article('a', full_content=None)])
+    writer = make_writer(supabase, batch_size=10)
+    writer.update({'link': 'a', 'full_content': 'first'})
+    writer.update({'link': 'a', 'full_content': 'second'})
+    writer.flush()
+    assert supabase.round_trips['rpc'] == 2
+    assert supabase.rows()[0]['full_content'] == 'second'
+